@@ -2,6 +2,12 @@ from flask import Flask
 from flask_cors import CORS
 from .config import Config
 from .extensions import init_extensions
+from .admission import init_admission
+from .json_provider import init_json
+from .compression import init_compression
+from .metrics import init_metrics
+from .query_tracking import init_query_tracking
+from .profiling import init_profiling
 from .logging_config import configure_logging
 from .errors import register_error_handlers
 from .blueprints import register_blueprints
@@ -13,7 +19,13 @@ def create_app(config_class: type[Config] | None = None) -> Flask:
     app.config.from_object(config_class or Config)
 
     configure_logging(app)
+    init_metrics(app)
+    init_query_tracking(app)
+    init_profiling(app)
     init_extensions(app)
+    init_admission(app)
+    init_json(app)
+    init_compression(app)
     register_blueprints(app)
     register_error_handlers(app)
 
@@ -0,0 +1,342 @@
+import logging
+import math
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Protocol, Tuple
+
+from flask import Flask, g, request
+
+from .cache import LRUCache
+from .exceptions import ServiceUnavailableError, TooManyRequestsError
+from .request_identity import get_client_key
+
+logger = logging.getLogger(__name__)
+
+# Endpoints that never go through admission control (probes, monitoring).
+EXEMPT_ENDPOINTS = {
+    "health.liveness",
+    "health.readiness",
+    "health.healthcheck",
+    "metrics.metrics",
+    "static",
+}
+
+
+def parse_limit(value: str) -> Tuple[float, float]:
+    """Parse a "rate:burst" limit (tokens per second and bucket capacity)."""
+    rate, _, burst = value.partition(":")
+    return float(rate), float(burst or rate)
+
+
+class BucketStore(Protocol):
+    def take(self, key: str, rate: float, capacity: float, now: float) -> float:
+        """Take one token; return 0 when admitted, else seconds until a token is available."""
+
+    def refund(self, key: str, capacity: float) -> None:
+        """Give back a token taken for a request that was refused further on."""
+
+
+def _refill_seconds(tokens: float, rate: float, capacity: float) -> float:
+    """Time until a bucket is full again; from then on it equals a missing one."""
+    return max(capacity - tokens, 0.0) / rate
+
+
+class InProcessBucketStore:
+    """
+    Token buckets held in this worker's memory.
+
+    A bucket is dropped once it has refilled (a missing bucket is a full one),
+    and at most ``max_buckets`` are kept, least recently used going first.
+    """
+
+    def __init__(self, max_buckets: int = 100_000) -> None:
+        self._buckets = LRUCache(max_entries=max_buckets)
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, capacity: float, now: float) -> float:
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets.set(key, (tokens, now), ttl_seconds=_refill_seconds(tokens, rate, capacity))
+            return wait
+
+    def refund(self, key: str, capacity: float) -> None:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                tokens, updated_at = bucket
+                self._buckets.set(key, (min(capacity, tokens + 1), updated_at))
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class SQLiteBucketStore:
+    """
+    Token buckets shared by all workers on a host through a SQLite file.
+
+    A local stand-in for the Redis store: same semantics, no extra service.
+    Each row records when its bucket is full again; rows past that are
+    deleted every ``purge_every`` takes, like the EXPIRE on the Redis keys.
+    """
+
+    def __init__(self, path: str, purge_every: int = 1000) -> None:
+        self.path = path
+        self.purge_every = purge_every
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets"
+                " (key TEXT PRIMARY KEY, tokens REAL, updated_at REAL, expires_at REAL)"
+            )
+            try:
+                conn.execute("ALTER TABLE buckets ADD COLUMN expires_at REAL")
+            except sqlite3.OperationalError:
+                pass  # already there
+            conn.execute("CREATE INDEX IF NOT EXISTS buckets_expires_at ON buckets (expires_at)")
+            self._local.conn = conn
+            self._local.takes = 0
+        return conn
+
+    def take(self, key: str, rate: float, capacity: float, now: float) -> float:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated_at FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens, updated_at = row if row else (capacity, now)
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (key, tokens, updated_at, expires_at) VALUES (?, ?, ?, ?)",
+                (key, tokens, now, now + _refill_seconds(tokens, rate, capacity)),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        self._local.takes += 1
+        if self._local.takes % self.purge_every == 0:
+            self.purge(now)
+        return wait
+
+    def purge(self, now: float) -> int:
+        """Delete buckets that have refilled; returns how many were removed."""
+        return self._connection().execute("DELETE FROM buckets WHERE expires_at < ? OR expires_at IS NULL", (now,)).rowcount
+
+    def refund(self, key: str, capacity: float) -> None:
+        self._connection().execute("UPDATE buckets SET tokens = MIN(?, tokens + 1) WHERE key = ?", (capacity, key))
+
+
+class RedisBucketStore:
+    """Token buckets shared by all workers and hosts through Redis."""
+
+    _SCRIPT = """
+        local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+        local rate = tonumber(ARGV[1])
+        local capacity = tonumber(ARGV[2])
+        local now = tonumber(ARGV[3])
+        local tokens = tonumber(bucket[1]) or capacity
+        local updated_at = tonumber(bucket[2]) or now
+        tokens = math.min(capacity, tokens + (now - updated_at) * rate)
+        local wait = 0
+        if tokens >= 1 then
+            tokens = tokens - 1
+        else
+            wait = (1 - tokens) / rate
+        end
+        redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+        redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+        return tostring(wait)
+    """
+
+    _REFUND_SCRIPT = """
+        local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens'))
+        if tokens then
+            redis.call('HSET', KEYS[1], 'tokens', math.min(tonumber(ARGV[1]), tokens + 1))
+        end
+        return 0
+    """
+
+    def __init__(self, url: str) -> None:
+        import redis  # optional dependency, only needed for this backend
+
+        self._client = redis.Redis.from_url(url)
+        self._take = self._client.register_script(self._SCRIPT)
+        self._refund = self._client.register_script(self._REFUND_SCRIPT)
+
+    def take(self, key: str, rate: float, capacity: float, now: float) -> float:
+        return float(self._take(keys=[f"ratelimit:{key}"], args=[rate, capacity, now]))
+
+    def refund(self, key: str, capacity: float) -> None:
+        self._refund(keys=[f"ratelimit:{key}"], args=[capacity])
+
+
+class AdmissionController:
+    """
+    Decide early whether a request may run, before it reaches the database.
+
+    Requests are grouped into endpoint classes (e.g. "list", "expensive").
+    Each request must pass, in order:
+
+    1. latency-based load shedding: while the smoothed latency of all
+       requests exceeds the target, sheddable classes are refused with 503.
+       The average decays with wall-clock time between samples, so a
+       worker whose traffic is all shed recovers instead of refusing forever;
+    2. token buckets per client and class, then per class overall (429).
+       The client bucket goes first so a flooding client can't drain the
+       class budget, and tokens are refunded when a later check refuses;
+    3. a per-worker concurrency limit for the class (503).
+    """
+
+    def __init__(self) -> None:
+        self.enabled = True
+        self.endpoint_classes: Dict[str, str] = {}
+        self.client_limits: Dict[str, Tuple[float, float]] = {}
+        self.class_limits: Dict[str, Tuple[float, float]] = {}
+        self.shed_classes: set[str] = set()
+        self.long_poll_classes: set[str] = set()
+        self.shed_latency_seconds = 1.0
+        self.shed_decay_seconds = 10.0
+        self.store: BucketStore = InProcessBucketStore()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._limits: Dict[str, int] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._latency_ewma = 0.0
+        self._latency_updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def configure(self, app: Flask) -> None:
+        cfg = app.config
+        self.enabled = cfg["ADMISSION_ENABLED"]
+        self.endpoint_classes = dict(cfg["ADMISSION_ENDPOINT_CLASSES"])
+        self.client_limits = {k: parse_limit(v) for k, v in cfg["RATE_LIMITS_PER_CLIENT"].items()}
+        self.class_limits = {k: parse_limit(v) for k, v in cfg["RATE_LIMITS_PER_CLASS"].items()}
+        self.shed_classes = set(cfg["LOAD_SHED_CLASSES"])
+        self.long_poll_classes = set(cfg["LONG_POLL_CLASSES"])
+        self.shed_latency_seconds = cfg["LOAD_SHED_LATENCY_MS"] / 1000.0
+        self.shed_decay_seconds = cfg["LOAD_SHED_DECAY_SECONDS"]
+        self._limits = dict(cfg["CONCURRENCY_LIMITS"])
+        self._semaphores = {k: threading.BoundedSemaphore(v) for k, v in self._limits.items()}
+        self._in_flight = {}
+        self._latency_ewma = 0.0
+        self._latency_updated_at = time.monotonic()
+
+        backend = cfg["RATE_LIMIT_BACKEND"]
+        if backend == "redis":
+            self.store = RedisBucketStore(cfg["RATE_LIMIT_REDIS_URL"])
+        elif backend == "sqlite":
+            self.store = SQLiteBucketStore(cfg["RATE_LIMIT_SQLITE_PATH"])
+        else:
+            self.store = InProcessBucketStore()
+
+    def classify(self, endpoint: str | None) -> str:
+        return self.endpoint_classes.get(endpoint or "", "default")
+
+    def admit(self, endpoint_class: str, client_key: str | None) -> None:
+        """Raise when the request must be refused; otherwise reserve a concurrency slot."""
+        if endpoint_class in self.shed_classes and self.latency() > self.shed_latency_seconds:
+            raise ServiceUnavailableError("Server is shedding load, retry shortly", retry_after=1)
+
+        now = time.time()
+        taken: List[Tuple[str, float]] = []
+        if client_key and endpoint_class in self.client_limits:
+            rate, capacity = self.client_limits[endpoint_class]
+            key = f"{endpoint_class}:{client_key}"
+            wait = self.store.take(key, rate, capacity, now)
+            if wait:
+                raise TooManyRequestsError("Rate limit exceeded", retry_after=_ceil(wait))
+            taken.append((key, capacity))
+        if endpoint_class in self.class_limits:
+            rate, capacity = self.class_limits[endpoint_class]
+            key = f"class:{endpoint_class}"
+            wait = self.store.take(key, rate, capacity, now)
+            if wait:
+                self._refund(taken)
+                raise TooManyRequestsError("Too many requests for this endpoint", retry_after=_ceil(wait))
+            taken.append((key, capacity))
+
+        semaphore = self._semaphores.get(endpoint_class)
+        if semaphore is not None and not semaphore.acquire(blocking=False):
+            self._refund(taken)
+            raise ServiceUnavailableError("Too many concurrent requests, retry shortly", retry_after=1)
+        with self._lock:
+            self._in_flight[endpoint_class] = self._in_flight.get(endpoint_class, 0) + 1
+
+    def release(self, endpoint_class: str, elapsed_seconds: float) -> None:
+        semaphore = self._semaphores.get(endpoint_class)
+        if semaphore is not None:
+            semaphore.release()
+        with self._lock:
+            self._in_flight[endpoint_class] = self._in_flight.get(endpoint_class, 1) - 1
+            if endpoint_class not in self.long_poll_classes:
+                now = time.monotonic()
+                self._latency_ewma = 0.9 * self._decayed_latency(now) + 0.1 * elapsed_seconds
+                self._latency_updated_at = now
+
+    def latency(self) -> float:
+        """Smoothed request latency in seconds, decayed to the current time."""
+        with self._lock:
+            return self._decayed_latency(time.monotonic())
+
+    def _decayed_latency(self, now: float) -> float:
+        idle = max(now - self._latency_updated_at, 0.0)
+        return self._latency_ewma * math.exp(-idle / self.shed_decay_seconds)
+
+    def _refund(self, taken: List[Tuple[str, float]]) -> None:
+        for key, capacity in taken:
+            try:
+                self.store.refund(key, capacity)
+            except Exception:
+                logger.warning("Could not refund rate limit token for %s", key, exc_info=True)
+
+    def status(self) -> Dict[str, Dict[str, int | None]]:
+        with self._lock:
+            classes = set(self._in_flight) | set(self._limits)
+            return {
+                name: {"in_flight": self._in_flight.get(name, 0), "limit": self._limits.get(name)}
+                for name in sorted(classes)
+            }
+
+
+def _ceil(seconds: float) -> int:
+    return max(int(seconds + 0.999), 1)
+
+
+admission = AdmissionController()
+
+
+def init_admission(app: Flask) -> None:
+    """Install admission control hooks on the app."""
+    admission.configure(app)
+
+    @app.before_request
+    def admit_request():
+        if not admission.enabled or request.endpoint in EXEMPT_ENDPOINTS or request.endpoint is None:
+            return None
+        endpoint_class = admission.classify(request.endpoint)
+        admission.admit(endpoint_class, get_client_key())
+        g.admission = (endpoint_class, time.perf_counter())
+        return None
+
+    @app.teardown_request
+    def release_request(exc):
+        admitted = g.pop("admission", None)
+        if admitted is not None:
+            endpoint_class, started = admitted
+            admission.release(endpoint_class, time.perf_counter() - started)
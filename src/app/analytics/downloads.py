@@ -0,0 +1,157 @@
+# src/app/analytics/downloads.py
+
+"""
+Columnar downloads of the analytics datasets.
+
+Rows are sliced straight out of the Parquet files the pipeline publishes:
+PyArrow pushes the project/date filter down to row-group statistics and
+yields Arrow record batches, which are written to the client one batch at a
+time as an Arrow IPC stream or as Parquet. Nothing is converted to Python
+objects or JSON, and memory stays bounded by ANALYTICS_DOWNLOAD_BATCH_ROWS
+whatever the dataset size. An unfiltered Parquet download is the published
+file itself, sent with sendfile.
+"""
+
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Any, Iterator, List, Tuple
+
+from app.exceptions import NotFoundError, ValidationError
+
+# PyArrow is imported inside the functions that use it; see pipeline.py.
+
+
+class DownloadableDataset:
+    """A published Parquet file and the column its date range filters on."""
+
+    def __init__(self, name: str, filename: str, date_column: str) -> None:
+        self.name = name
+        self.filename = filename
+        self.date_column = date_column
+
+
+DOWNLOADABLE_DATASETS = {
+    dataset.name: dataset
+    for dataset in (
+        DownloadableDataset("analytics_summary", "analytics_summary.parquet", "done_date"),
+        DownloadableDataset("tasks", "tasks.parquet", "created_at"),
+        DownloadableDataset("project_flow", "project_flow_daily.parquet", "day"),
+    )
+}
+
+FORMATS = {
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def get_downloadable(name: str) -> DownloadableDataset:
+    dataset = DOWNLOADABLE_DATASETS.get(name)
+    if dataset is None:
+        raise NotFoundError(f"Unknown dataset: {name}")
+    return dataset
+
+
+def dataset_path(base_dir: Path, dataset: DownloadableDataset) -> Path:
+    path = base_dir / dataset.filename
+    if not path.is_file():
+        raise NotFoundError(f"Dataset {dataset.name} has not been published yet; run the analytics pipeline")
+    return path
+
+
+def scan_batches(
+    path: Path,
+    dataset: DownloadableDataset,
+    project_id: int | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    columns: List[str] | None = None,
+    batch_rows: int = 65536,
+) -> Tuple[Any, Iterator[Any]]:
+    """
+    Schema and record batches of ``path`` for one project and an inclusive
+    date range, optionally projected to ``columns``.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    source = ds.dataset(str(path), format="parquet")
+    if columns is not None:
+        unknown = sorted(set(columns) - set(source.schema.names))
+        if unknown:
+            raise ValidationError(f"Unknown columns for {dataset.name}: {', '.join(unknown)}")
+
+    expression = None
+    conditions = []
+    if project_id is not None:
+        conditions.append(ds.field("project_id") == project_id)
+    date_is_timestamp = pa.types.is_timestamp(source.schema.field(dataset.date_column).type)
+    if start is not None:
+        lower = datetime.combine(start, time.min) if date_is_timestamp else start
+        conditions.append(ds.field(dataset.date_column) >= lower)
+    if end is not None:
+        upper = datetime.combine(end + timedelta(days=1), time.min) if date_is_timestamp else end + timedelta(days=1)
+        conditions.append(ds.field(dataset.date_column) < upper)
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    scanner = source.scanner(columns=columns, filter=expression, batch_size=batch_rows)
+    return scanner.projected_schema, scanner.to_batches()
+
+
+class _ChunkSink:
+    """File-like sink the Arrow writers append to; drained after every write."""
+
+    closed = False
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+
+    def write(self, data: Any) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def arrow_stream(schema: Any, batches: Iterator[Any]) -> Iterator[bytes]:
+    """Arrow IPC stream bytes, one chunk per record batch."""
+    import pyarrow as pa
+
+    sink = _ChunkSink()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        yield sink.drain()
+        for batch in batches:
+            if batch.num_rows:
+                writer.write_batch(batch)
+                yield sink.drain()
+    yield sink.drain()
+
+
+def parquet_stream(schema: Any, batches: Iterator[Any], row_group_rows: int) -> Iterator[bytes]:
+    """Parquet file bytes, flushed one row group of about ``row_group_rows`` at a time."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _ChunkSink()
+    pending: List[Any] = []
+    pending_rows = 0
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for batch in batches:
+            if not batch.num_rows:
+                continue
+            pending.append(batch)
+            pending_rows += batch.num_rows
+            if pending_rows >= row_group_rows:
+                writer.write_table(pa.Table.from_batches(pending, schema=schema))
+                pending, pending_rows = [], 0
+                yield sink.drain()
+        if pending:
+            writer.write_table(pa.Table.from_batches(pending, schema=schema))
+    yield sink.drain()
@@ -0,0 +1,250 @@
+# src/app/analytics/event_archive.py
+
+"""
+Tiered storage for task_events: recent months live in the database, older
+months in Parquet files under EVENT_ARCHIVE_DIR::
+
+    <EVENT_ARCHIVE_DIR>/month=2025-01/<source>.parquet
+
+Files are sorted by (task_id, created_at) so per-task reads can skip row
+groups. A month is written before its rows leave the database, and readers
+de-duplicate by id, so there is never a window where events are missing.
+"""
+
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from flask import current_app
+from pony.orm import db_session, select
+
+from app.models import TaskEvent, db
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_COLUMNS = ("id", "task_id", "type", "payload", "created_at")
+
+_BOUND_RE = re.compile(r"FROM \((?P<lower>.+?)\) TO \((?P<upper>.+?)\)")
+
+# (archive files with their mtimes, highest archived id) from the last lookup.
+_archived_until: Tuple[Tuple[Tuple[str, int], ...], int] | None = None
+
+
+def archive_dir() -> Path:
+    return Path(current_app.config["EVENT_ARCHIVE_DIR"]).expanduser()
+
+
+def _month_start(value: datetime, add_months: int = 0) -> datetime:
+    month_index = value.year * 12 + value.month - 1 + add_months
+    return datetime(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _months_between(first: datetime, end: datetime) -> Iterator[datetime]:
+    month = _month_start(first)
+    while month < end:
+        yield month
+        month = _month_start(month, 1)
+
+
+def _write_month(month: datetime, source: str, rows: List[Tuple[Any, ...]]) -> Path:
+    """Atomically write one month of events from ``source``; reruns overwrite."""
+    import polars as pl
+
+    frame = pl.DataFrame(
+        rows,
+        schema={
+            "id": pl.Int64,
+            "task_id": pl.Int64,
+            "type": pl.Utf8,
+            "payload": pl.Utf8,
+            "created_at": pl.Datetime("us"),
+        },
+        orient="row",
+    ).sort(["task_id", "created_at"])
+
+    target_dir = archive_dir() / f"month={month:%Y-%m}"
+    target_dir.mkdir(parents=True, exist_ok=True)
+    path = target_dir / f"{source}.parquet"
+    tmp_path = path.with_name(path.name + ".tmp")
+    frame.write_parquet(tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _archive_files(since: datetime | None = None) -> List[Path]:
+    """Archived month files, skipping months before ``since`` by directory name alone."""
+    first_month = f"month={_month_start(since):%Y-%m}" if since is not None else ""
+    return sorted(
+        path
+        for month_dir in archive_dir().glob("month=*")
+        if month_dir.name >= first_month
+        for path in month_dir.glob("*.parquet")
+    )
+
+
+def scan_archive(since: datetime | None = None):
+    """
+    Polars LazyFrame over archived events (from the month of ``since`` on),
+    or None when nothing is archived.
+    """
+    import polars as pl
+
+    files = _archive_files(since)
+    if not files:
+        return None
+    return pl.scan_parquet(files)
+
+
+def archived_until() -> int | None:
+    """
+    Highest archived event id, or None when nothing is archived.
+
+    Cached against the archive's file listing, so repeated calls only list
+    the directory until archival adds or rewrites a file.
+    """
+    global _archived_until
+    files = _archive_files()
+    if not files:
+        return None
+    import polars as pl
+
+    key = tuple((str(path), path.stat().st_mtime_ns) for path in files)
+    cached = _archived_until
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    max_id = pl.scan_parquet(files).select(pl.col("id").max()).collect().item()
+    _archived_until = (key, int(max_id))
+    return _archived_until[1]
+
+
+def archived_events_for_task(task_id: int, created_at: datetime | None = None) -> List[Dict[str, Any]]:
+    """
+    Archived events of one task, oldest first, shaped like TaskEvent.to_dict().
+
+    A task has no events before it was created, so months before ``created_at``
+    are not even opened; within a month, row groups are pruned by task_id.
+    """
+    import polars as pl
+
+    archived = scan_archive(since=created_at)
+    if archived is None:
+        return []
+    frame = archived.filter(pl.col("task_id") == task_id).sort(["created_at", "id"]).collect()
+    return [
+        {
+            "id": row["id"],
+            "task": row["task_id"],
+            "type": row["type"],
+            "payload": json.loads(row["payload"]) if row["payload"] is not None else None,
+            "created_at": row["created_at"],
+        }
+        for row in frame.iter_rows(named=True)
+    ]
+
+
+def archive_old_events(now: datetime | None = None) -> Dict[str, Any]:
+    """
+    Move events older than EVENT_RETENTION_MONTHS whole months to Parquet.
+
+    On PostgreSQL, whole monthly partitions are exported, verified by row
+    count, then detached and dropped; upcoming partitions are created first,
+    along with any month whose rows fell into the default partition.
+    Other providers (SQLite in dev/tests) export and delete rows by month.
+    """
+    cfg = current_app.config
+    cutoff = _month_start(now or datetime.utcnow(), -cfg["EVENT_RETENTION_MONTHS"])
+    if db.provider_name == "postgres":
+        result = _archive_partitions(cutoff, cfg["EVENT_PARTITIONS_AHEAD"])
+    else:
+        result = _archive_rows(cutoff)
+    result["cutoff"] = cutoff.isoformat()
+    logger.info("Task event archival finished", extra={"event_archive": result})
+    return result
+
+
+def _parse_bound(bound: str) -> Tuple[datetime | None, datetime]:
+    match = _BOUND_RE.search(bound)
+    if match is None:
+        raise ValueError(f"Unexpected partition bound: {bound}")
+
+    def parse(value: str) -> datetime | None:
+        value = value.strip().strip("'")
+        return None if value.upper() == "MINVALUE" else datetime.fromisoformat(value)
+
+    return parse(match.group("lower")), parse(match.group("upper"))
+
+
+def _archive_partitions(cutoff: datetime, partitions_ahead: int) -> Dict[str, Any]:
+    with db_session:
+        created = db.get("SELECT ensure_task_event_partitions($partitions_ahead)")
+    with db_session:
+        # Pony prefixes "select" unless the text itself starts with it, so no leading newline.
+        partitions = db.select(
+            """SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+            FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'task_events'::regclass
+            ORDER BY c.relname
+            """
+        )
+
+    archived: Dict[str, int] = {}
+    for name, bound in partitions:
+        if bound == "DEFAULT":
+            # Emptied into monthly partitions by ensure_task_event_partitions() above.
+            continue
+        lower, upper = _parse_bound(bound)
+        if upper > cutoff:
+            continue
+
+        with db_session:
+            first = lower or db.get(f'SELECT MIN(created_at) FROM "{name}"')
+            exported = 0
+            if first is not None:
+                for month in _months_between(first, upper):
+                    rows = db.select(
+                        f"""SELECT id, task, type, payload::text, created_at FROM "{name}"
+                        WHERE created_at >= $month AND created_at < $next_month
+                        """,
+                        {"month": month, "next_month": _month_start(month, 1)},
+                    )
+                    if rows:
+                        _write_month(month, name, rows)
+                        exported += len(rows)
+            total = db.get(f'SELECT COUNT(*) FROM "{name}"')
+        if exported != total:
+            raise RuntimeError(f"Exported {exported} of {total} rows from {name}; not detaching it")
+
+        with db_session:
+            db.execute("SET LOCAL lock_timeout = '5s'")
+            db.execute(f'ALTER TABLE task_events DETACH PARTITION "{name}"')
+            db.execute(f'DROP TABLE "{name}"')
+        archived[name] = exported
+        logger.info("Archived and detached partition %s (%d events)", name, exported)
+
+    return {"partitions_created": created, "archived": archived}
+
+
+def _archive_rows(cutoff: datetime) -> Dict[str, Any]:
+    archived: Dict[str, int] = {}
+    with db_session:
+        events = select(e for e in TaskEvent if e.created_at < cutoff).order_by(lambda e: e.id)[:]
+        if not events:
+            return {"archived": archived}
+
+        by_month: Dict[datetime, List[Tuple[Any, ...]]] = {}
+        for e in events:
+            payload = json.dumps(e.payload) if e.payload is not None else None
+            by_month.setdefault(_month_start(e.created_at), []).append((e.id, e.task.id, e.type, payload, e.created_at))
+
+        for month, rows in by_month.items():
+            # Named by id range so a rerun after a failed delete overwrites the same file.
+            _write_month(month, f"events_{rows[0][0]}_{rows[-1][0]}", rows)
+            archived[f"{month:%Y-%m}"] = len(rows)
+
+        max_id = events[-1].id
+        db.execute("DELETE FROM task_events WHERE created_at < $cutoff AND id <= $max_id")
+    return {"archived": archived}
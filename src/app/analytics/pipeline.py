@@ -1,20 +1,27 @@
 # src/app/analytics/pipeline.py
 
+import json
 import logging
 import os
-from datetime import datetime
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Callable, Dict, Iterator, Tuple
 
-import duckdb
-import polars as pl
 from flask import current_app
 from pony.orm import db_session, select
 
-from app.models import Task, TaskEvent
+from app.analytics.event_archive import scan_archive
+from app.db_routing import current_db, db_router
+from app.metrics import ANALYTICS_STAGE_DURATION, ANALYTICS_STAGE_ROWS
 
 logger = logging.getLogger(__name__)
 
+# Polars and DuckDB are imported inside the stages that use them: they add
+# hundreds of milliseconds and tens of MB to any process importing this
+# module, and only analytics runs need them.
+
 
 def _ensure_dir(path: str) -> Path:
     """
@@ -25,14 +32,78 @@ def _ensure_dir(path: str) -> Path:
     return base_path
 
 
+def _write_atomically(path: Path, write: Callable[[Path], Any]) -> None:
+    """
+    Write ``path`` through a temporary sibling renamed over it, so readers
+    (e.g. GET /analytics downloads) see the old file or the new one, never a
+    partial write.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+@contextmanager
+def _stage(name: str, stages: Dict[str, Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Time a pipeline stage and publish its duration and row count as metrics.
+
+    The block fills in ``rows`` on the yielded dict.
+    """
+    stats: Dict[str, Any] = {"rows": None}
+    started = time.perf_counter()
+    yield stats
+    stats["duration_seconds"] = time.perf_counter() - started
+    stages[name] = stats
+
+    ANALYTICS_STAGE_DURATION.labels(stage=name).observe(stats["duration_seconds"])
+    if stats["rows"] is not None:
+        ANALYTICS_STAGE_ROWS.labels(stage=name).set(stats["rows"])
+    logger.info("Analytics stage %s finished in %.2f seconds (%s rows)", name, stats["duration_seconds"], stats["rows"])
+
+
+def _export_backend() -> str:
+    """
+    Pick how tables are read for export: ``copy`` streams PostgreSQL COPY
+    output into Arrow columns, ``orm`` walks Pony entities (any provider).
+
+    ANALYTICS_EXPORT_BACKEND=auto uses COPY whenever the database is PostgreSQL.
+    """
+    backend = current_app.config.get("ANALYTICS_EXPORT_BACKEND", "auto")
+    if backend not in ("auto", "copy", "orm"):
+        raise RuntimeError(f"Unknown ANALYTICS_EXPORT_BACKEND: {backend}")
+    is_postgres = current_db().provider_name == "postgres"
+    if backend == "copy" and not is_postgres:
+        raise RuntimeError("ANALYTICS_EXPORT_BACKEND=copy requires PostgreSQL")
+    return "copy" if backend == "copy" or (backend == "auto" and is_postgres) else "orm"
+
+
 @db_session
-def _export_tasks_to_parquet(base_dir: Path) -> Path:
+def _export_tasks_to_parquet(base_dir: Path) -> Tuple[Path, int]:
     """
     Export all tasks from the database into a Parquet file using Polars.
 
     The exported columns are intentionally simple and analytics-friendly.
     """
-    tasks = select(t for t in Task)[:]  # materialize now to avoid lazy evaluation issues
+    if _export_backend() == "copy":
+        from app.analytics.pg_copy import TASK_COLUMNS, TASKS_QUERY, copy_query_to_frame
+
+        df = copy_query_to_frame(current_db().get_connection(), TASKS_QUERY, TASK_COLUMNS, base_dir)
+    else:
+        df = _tasks_frame_from_orm()
+
+    tasks_path = base_dir / "tasks.parquet"
+    _write_atomically(tasks_path, df.write_parquet)
+    logger.info("Exported %d tasks to %s", len(df), tasks_path)
+    return tasks_path, len(df)
+
+
+def _tasks_frame_from_orm():
+    """Build the tasks frame from Pony entities (fallback for SQLite)."""
+    import polars as pl
+
+    task_entity = current_db().Task
+    tasks = select(t for t in task_entity)[:]  # materialize now to avoid lazy evaluation issues
 
     rows = []
     for t in tasks:
@@ -63,21 +134,56 @@ def _export_tasks_to_parquet(base_dir: Path) -> Path:
         )
     else:
         df = pl.DataFrame(rows)
-
-    tasks_path = base_dir / "tasks.parquet"
-    df.write_parquet(tasks_path)
-    logger.info("Exported %d tasks to %s", len(df), tasks_path)
-    return tasks_path
+    return df
 
 
 @db_session
-def _export_task_events_to_parquet(base_dir: Path) -> Path:
+def _export_task_events_to_parquet(base_dir: Path) -> Tuple[Path, int]:
     """
-    Export task events into a Parquet file.
+    Export task events, including archived months, into a Parquet file.
+    The archive is streamed into the file, so memory does not grow with the
+    length of the event history.
 
     This is optional for the first analytics, but prepared for future event-based metrics.
     """
-    events = select(e for e in TaskEvent)[:]
+    import polars as pl
+
+    if _export_backend() == "copy":
+        from app.analytics.pg_copy import TASK_EVENT_COLUMNS, TASK_EVENTS_QUERY, copy_query_to_frame
+
+        df = copy_query_to_frame(current_db().get_connection(), TASK_EVENTS_QUERY, TASK_EVENT_COLUMNS, base_dir)
+    else:
+        df = _task_events_frame_from_orm()
+
+    events_path = base_dir / "task_events.parquet"
+    # Months moved out of the database by the retention job
+    archived = scan_archive()
+    if archived is None:
+        _write_atomically(events_path, df.write_parquet)
+        rows = len(df)
+    else:
+        live = df.with_columns(pl.col("created_at").cast(pl.Datetime("us")), pl.col("payload").cast(pl.Utf8))
+        # A month is archived before its rows leave the database, so only archived
+        # rows at least as new as the oldest live row can be duplicates; normally
+        # that's none, and the archive itself is streamed, never collected.
+        oldest_live = live["created_at"].min()
+        duplicates = archived.filter(pl.col("created_at") >= oldest_live).select("id") if oldest_live else None
+        if duplicates is not None:
+            live = live.lazy().join(duplicates, on="id", how="anti")
+        merged = pl.concat([archived, live.lazy()], how="vertical_relaxed")
+        _write_atomically(events_path, merged.sink_parquet)
+        rows = pl.scan_parquet(events_path).select(pl.len()).collect().item()
+
+    logger.info("Exported %d task events to %s", rows, events_path)
+    return events_path, rows
+
+
+def _task_events_frame_from_orm():
+    """Build the task events frame from Pony entities (fallback for SQLite)."""
+    import polars as pl
+
+    event_entity = current_db().TaskEvent
+    events = select(e for e in event_entity)[:]
 
     rows = []
     for e in events:
@@ -86,7 +192,8 @@ def _export_task_events_to_parquet(base_dir: Path) -> Path:
                 "id": e.id,
                 "task_id": e.task.id if e.task is not None else None,
                 "type": e.type,
-                "payload": getattr(e, "payload", None),
+                # Serialized so heterogeneous (or empty) payloads share one Utf8 column
+                "payload": json.dumps(e.payload) if getattr(e, "payload", None) is not None else None,
                 "created_at": e.created_at,
             }
         )
@@ -104,11 +211,7 @@ def _export_task_events_to_parquet(base_dir: Path) -> Path:
         )
     else:
         df = pl.DataFrame(rows)
-
-    events_path = base_dir / "task_events.parquet"
-    df.write_parquet(events_path)
-    logger.info("Exported %d task events to %s", len(df), events_path)
-    return events_path
+    return df
 
 
 def _compute_analytics_with_duckdb(base_dir: Path, tasks_path: Path) -> Tuple[Path, int]:
@@ -121,6 +224,8 @@ def _compute_analytics_with_duckdb(base_dir: Path, tasks_path: Path) -> Tuple[Pa
       - tasks_done
       - avg_lead_time_days (difference between created_at and done_at in days)
     """
+    import duckdb
+
     summary_path = base_dir / "analytics_summary.parquet"
 
     con = duckdb.connect(database=":memory:", read_only=False)
@@ -165,9 +270,9 @@ def _compute_analytics_with_duckdb(base_dir: Path, tasks_path: Path) -> Tuple[Pa
         )
 
         # Persist the summary as Parquet
-        con.execute(
-            "COPY analytics_summary TO ? (FORMAT PARQUET);",
-            [str(summary_path)],
+        _write_atomically(
+            summary_path,
+            lambda tmp_path: con.execute("COPY analytics_summary TO ? (FORMAT PARQUET);", [str(tmp_path)]),
         )
 
         row_count = con.execute("SELECT COUNT(*) FROM analytics_summary;").fetchone()[0]
@@ -182,14 +287,33 @@ def _compute_analytics_with_duckdb(base_dir: Path, tasks_path: Path) -> Tuple[Pa
     return summary_path, int(row_count)
 
 
+def _compute_flow_series(base_dir: Path, tasks_path: Path, events_path: Path, as_of: date) -> Tuple[Path, int]:
+    """
+    Write project_flow_daily.parquet: per-project daily status counts,
+    throughput and rolling throughput/WIP (see app.analytics.flow).
+
+    The lazy plan is sunk straight to Parquet by the streaming engine.
+    """
+    import polars as pl
+
+    from app.analytics.flow import flow_series
+
+    flow_path = base_dir / "project_flow_daily.parquet"
+    _write_atomically(flow_path, flow_series(tasks_path, events_path, as_of).sink_parquet)
+    row_count = pl.scan_parquet(flow_path).select(pl.len()).collect().item()
+    logger.info("Project flow series written to %s with %d rows", flow_path, row_count)
+    return flow_path, int(row_count)
+
+
 def run_offline_analytics() -> Dict[str, Any]:
     """
     High-level entrypoint for offline analytics.
 
     1. Resolves the analytics data directory from Flask config.
-    2. Exports tasks and task events to Parquet (Polars).
+    2. Exports tasks and task events to Parquet (Polars), preferring a read replica.
     3. Runs DuckDB analytics on tasks.parquet and writes analytics_summary.parquet.
-    4. Returns basic metadata about the run so callers (CLI, Airflow, Celery) can log it.
+    4. Builds per-project daily flow series (Polars lazy) into project_flow_daily.parquet.
+    5. Returns basic metadata about the run so callers (CLI, Airflow, Celery) can log it.
 
     This function assumes it is called inside an application context.
     """
@@ -202,12 +326,23 @@ def run_offline_analytics() -> Dict[str, Any]:
     started_at = datetime.utcnow()
     logger.info("Starting offline analytics run at %s using base_dir=%s", started_at.isoformat(), base_dir)
 
-    # Export raw data to Parquet
-    tasks_path = _export_tasks_to_parquet(base_dir)
-    events_path = _export_task_events_to_parquet(base_dir)
+    stages: Dict[str, Dict[str, Any]] = {}
+
+    # Export raw data to Parquet, reading from a replica when one is usable
+    with db_router.reading():
+        export_backend = _export_backend()
+        with _stage("export_tasks", stages) as stage:
+            tasks_path, stage["rows"] = _export_tasks_to_parquet(base_dir)
+        with _stage("export_task_events", stages) as stage:
+            events_path, stage["rows"] = _export_task_events_to_parquet(base_dir)
 
     # Compute analytics on top of tasks.parquet
-    summary_path, summary_rows = _compute_analytics_with_duckdb(base_dir, tasks_path)
+    with _stage("duckdb_summary", stages) as stage:
+        summary_path, summary_rows = _compute_analytics_with_duckdb(base_dir, tasks_path)
+        stage["rows"] = summary_rows
+
+    with _stage("flow_series", stages) as stage:
+        flow_path, stage["rows"] = _compute_flow_series(base_dir, tasks_path, events_path, started_at.date())
 
     finished_at = datetime.utcnow()
     duration_sec = (finished_at - started_at).total_seconds()
@@ -217,9 +352,12 @@ def run_offline_analytics() -> Dict[str, Any]:
         "task_events_parquet": str(events_path),
         "summary_parquet": str(summary_path),
         "summary_row_count": summary_rows,
+        "flow_parquet": str(flow_path),
+        "export_backend": export_backend,
         "started_at_utc": started_at.isoformat(),
         "finished_at_utc": finished_at.isoformat(),
         "duration_seconds": duration_sec,
+        "stages": stages,
     }
 
     logger.info("Offline analytics run completed in %.2f seconds", duration_sec, extra={"analytics": result})
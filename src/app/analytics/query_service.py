@@ -0,0 +1,367 @@
+# src/app/analytics/query_service.py
+
+"""
+Ad-hoc analytics queries over the published Parquet datasets.
+
+Callers pick a dataset, group-by dimensions, metrics and filters from a
+whitelist; the SQL is assembled only from the fragments below and every
+value is bound as a parameter, so no caller text reaches DuckDB.
+
+Queries run on a small pool of DuckDB connections per web worker, sharing one
+in-memory database whose memory, threads and file access (the analytics
+directory only) are fixed and locked. A query waits at most
+ANALYTICS_QUERY_QUEUE_TIMEOUT_SECONDS for a connection and is interrupted
+after ANALYTICS_QUERY_TIMEOUT_SECONDS. Results are cached per dataset
+version: the Parquet files are replaced atomically on every pipeline run,
+and a changed file drops the cached results.
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from app.cache import LRUCache
+from app.exceptions import NotFoundError, QueryTimeoutError, ServiceUnavailableError, ValidationError
+from app.metrics import ANALYTICS_QUERY_DURATION
+
+logger = logging.getLogger(__name__)
+
+_LEAD_TIME_SECONDS = "DATE_DIFF('second', created_at, done_at)"
+
+
+class QueryableDataset:
+    """A published Parquet file and what may be grouped, aggregated and filtered on it."""
+
+    def __init__(
+        self,
+        name: str,
+        filename: str,
+        dimensions: Dict[str, str],
+        metrics: Dict[str, str],
+        list_filters: Dict[str, type],
+        date_filters: Dict[str, str],
+    ) -> None:
+        self.name = name
+        self.filename = filename
+        self.dimensions = dimensions
+        self.metrics = metrics
+        # column -> Python type of the values: {"status": ["done", "todo"]}
+        self.list_filters = list_filters
+        # filter name -> date/timestamp column: {"created_at": {"from": ..., "to": ...}}
+        self.date_filters = date_filters
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "dimensions": sorted(self.dimensions),
+            "metrics": sorted(self.metrics),
+            "filters": sorted(self.list_filters) + sorted(self.date_filters),
+        }
+
+
+QUERYABLE_DATASETS: Dict[str, QueryableDataset] = {
+    dataset.name: dataset
+    for dataset in (
+        QueryableDataset(
+            "tasks",
+            "tasks.parquet",
+            dimensions={
+                "project_id": "project_id",
+                "assignee_id": "assignee_id",
+                "status": "status",
+                "priority": "priority",
+                "created_date": "CAST(created_at AS DATE)",
+                "created_week": "CAST(DATE_TRUNC('week', created_at) AS DATE)",
+                "created_month": "CAST(DATE_TRUNC('month', created_at) AS DATE)",
+                "done_date": "CAST(done_at AS DATE)",
+                "done_week": "CAST(DATE_TRUNC('week', done_at) AS DATE)",
+                "done_month": "CAST(DATE_TRUNC('month', done_at) AS DATE)",
+            },
+            metrics={
+                "tasks": "COUNT(*)",
+                "done": "COUNT(done_at)",
+                "open": "COUNT(*) FILTER (WHERE done_at IS NULL)",
+                "avg_lead_time_days": f"AVG({_LEAD_TIME_SECONDS}) / 86400.0",
+                "p50_lead_time_days": f"QUANTILE_CONT({_LEAD_TIME_SECONDS}, 0.5) / 86400.0",
+                "p90_lead_time_days": f"QUANTILE_CONT({_LEAD_TIME_SECONDS}, 0.9) / 86400.0",
+            },
+            list_filters={"project_id": int, "assignee_id": int, "status": str, "priority": int},
+            date_filters={"created_at": "created_at", "done_at": "done_at"},
+        ),
+        QueryableDataset(
+            "analytics_summary",
+            "analytics_summary.parquet",
+            dimensions={
+                "project_id": "project_id",
+                "done_date": "done_date",
+                "done_week": "CAST(DATE_TRUNC('week', done_date) AS DATE)",
+                "done_month": "CAST(DATE_TRUNC('month', done_date) AS DATE)",
+            },
+            metrics={
+                "tasks_done": "SUM(tasks_done)",
+                "avg_lead_time_days": "SUM(avg_lead_time_days * tasks_done) / SUM(tasks_done)",
+            },
+            list_filters={"project_id": int},
+            date_filters={"done_date": "done_date"},
+        ),
+    )
+}
+
+
+def _date_value(value: Any, field: str) -> date:
+    try:
+        return date.fromisoformat(str(value))
+    except ValueError:
+        raise ValidationError(f"{field} must be a date (YYYY-MM-DD)")
+
+
+def build_query(spec: Dict[str, Any], max_rows: int) -> Tuple[QueryableDataset, Dict[str, Any], str, List[Any]]:
+    """
+    Validate a query request and turn it into SQL with positional parameters.
+
+    Returns the dataset, the normalized request (the cache key), the SQL and
+    its parameters. The SQL reads ``read_parquet(?)``, so callers bind the
+    dataset path before the returned parameters.
+    """
+    if not isinstance(spec, dict):
+        raise ValidationError("Query must be a JSON object")
+    dataset_name = spec.get("dataset")
+    dataset = QUERYABLE_DATASETS.get(dataset_name) if isinstance(dataset_name, str) else None
+    if dataset is None:
+        raise ValidationError(f"dataset must be one of: {', '.join(QUERYABLE_DATASETS)}")
+
+    group_by = spec.get("group_by") or []
+    metrics = spec.get("metrics") or []
+    if not isinstance(group_by, list) or not isinstance(metrics, list):
+        raise ValidationError("group_by and metrics must be lists")
+    if not all(isinstance(n, str) for n in group_by + metrics):
+        raise ValidationError("group_by and metrics must be lists of names")
+    if not metrics:
+        raise ValidationError("At least one metric is required")
+    unknown = [d for d in group_by if d not in dataset.dimensions] + [m for m in metrics if m not in dataset.metrics]
+    if unknown:
+        raise ValidationError(f"Unknown dimensions or metrics for {dataset.name}: {', '.join(map(str, unknown))}")
+    if len(set(group_by) | set(metrics)) != len(group_by) + len(metrics):
+        raise ValidationError("group_by and metrics must not repeat names")
+
+    filters = spec.get("filters") or {}
+    if not isinstance(filters, dict):
+        raise ValidationError("filters must be an object")
+    conditions: List[str] = []
+    params: List[Any] = []
+    normalized_filters: Dict[str, Any] = {}
+    for name in sorted(filters):
+        value = filters[name]
+        if name in dataset.list_filters:
+            values = value if isinstance(value, list) else [value]
+            if not all(isinstance(v, (str, int, float)) for v in values):
+                raise ValidationError(f"Invalid values for filter {name}")
+            try:
+                values = sorted({dataset.list_filters[name](v) for v in values})
+            except (TypeError, ValueError):
+                raise ValidationError(f"Invalid values for filter {name}")
+            if not values:
+                raise ValidationError(f"Filter {name} needs at least one value")
+            conditions.append(f"{name} IN ({', '.join('?' for _ in values)})")
+            params.extend(values)
+            normalized_filters[name] = values
+        elif name in dataset.date_filters:
+            if not isinstance(value, dict) or not set(value) <= {"from", "to"}:
+                raise ValidationError(f"Filter {name} must be {{\"from\": date, \"to\": date}}")
+            column = dataset.date_filters[name]
+            bounds = {}
+            # Inclusive dates; compared as timestamps so timestamp columns can use row-group stats.
+            if value.get("from"):
+                bounds["from"] = _date_value(value["from"], f"{name}.from")
+                conditions.append(f"{column} >= ?")
+                params.append(datetime.combine(bounds["from"], dt_time.min))
+            if value.get("to"):
+                bounds["to"] = _date_value(value["to"], f"{name}.to")
+                conditions.append(f"{column} < ?")
+                params.append(datetime.combine(bounds["to"] + timedelta(days=1), dt_time.min))
+            normalized_filters[name] = {k: v.isoformat() for k, v in bounds.items()}
+        else:
+            raise ValidationError(f"Unknown filter for {dataset.name}: {name}")
+
+    order_by = spec.get("order_by")
+    if order_by is not None and (not isinstance(order_by, str) or order_by.lstrip("-") not in group_by + metrics):
+        raise ValidationError("order_by must name a selected dimension or metric, optionally prefixed with -")
+    try:
+        limit = int(spec.get("limit", max_rows))
+    except (TypeError, ValueError):
+        raise ValidationError("limit must be an integer")
+    if limit <= 0:
+        raise ValidationError("limit must be positive")
+    limit = min(limit, max_rows)
+
+    select = [f"{dataset.dimensions[d]} AS {d}" for d in group_by] + [f"{dataset.metrics[m]} AS {m}" for m in metrics]
+    sql = f"SELECT {', '.join(select)} FROM read_parquet(?)"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    if group_by:
+        sql += " GROUP BY " + ", ".join(str(i + 1) for i in range(len(group_by)))
+    if order_by is not None:
+        sql += f" ORDER BY {order_by.lstrip('-')} {'DESC' if order_by.startswith('-') else 'ASC'} NULLS LAST"
+    elif group_by:
+        sql += " ORDER BY " + ", ".join(str(i + 1) for i in range(len(group_by)))
+    # One extra row tells whether the result was truncated.
+    sql += f" LIMIT {limit + 1}"
+
+    normalized = {
+        "dataset": dataset.name,
+        "group_by": group_by,
+        "metrics": metrics,
+        "filters": normalized_filters,
+        "order_by": order_by,
+        "limit": limit,
+    }
+    return dataset, normalized, sql, params
+
+
+class AnalyticsQueryService:
+    """Whitelisted DuckDB queries on a bounded, per-process connection pool."""
+
+    def __init__(self) -> None:
+        self.data_dir = Path(".")
+        self.connections = 2
+        self.threads = 2
+        self.memory_limit = "512MB"
+        self.timeout = 10.0
+        self.queue_timeout = 2.0
+        self.max_rows = 10000
+        self.cache = LRUCache(max_entries=256)
+        self._database: Any = None
+        self._pool: "queue.Queue[Any] | None" = None
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        data_dir: str,
+        connections: int,
+        threads: int,
+        memory_limit: str,
+        timeout: float,
+        queue_timeout: float,
+        max_rows: int,
+        cache_entries: int,
+    ) -> None:
+        self.shutdown()
+        self.data_dir = Path(data_dir).expanduser()
+        self.connections = max(connections, 1)
+        self.threads = max(threads, 1)
+        self.memory_limit = memory_limit
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self.max_rows = max_rows
+        self.cache = LRUCache(max_entries=cache_entries)
+        self._versions = {}
+
+    def describe(self) -> Dict[str, Any]:
+        datasets = [dataset.describe() for dataset in QUERYABLE_DATASETS.values()]
+        return {"datasets": datasets, "max_rows": self.max_rows, "timeout_seconds": self.timeout}
+
+    def run(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        dataset, normalized, sql, params = build_query(spec, self.max_rows)
+        path = self.data_dir / dataset.filename
+        version = self._version(dataset, path)
+        key = (version, json.dumps(normalized, sort_keys=True))
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            ANALYTICS_QUERY_DURATION.labels(dataset=dataset.name, outcome="hit").observe(time.perf_counter() - started)
+            return {**cached, "cached": True, "duration_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+        outcome = "error"
+        try:
+            columns, rows = self._execute(sql, [str(path)] + params)
+            outcome = "miss"
+        except QueryTimeoutError:
+            outcome = "timeout"
+            raise
+        finally:
+            ANALYTICS_QUERY_DURATION.labels(dataset=dataset.name, outcome=outcome).observe(time.perf_counter() - started)
+
+        limit = normalized["limit"]
+        result = {
+            "query": normalized,
+            "columns": columns,
+            "rows": [dict(zip(columns, row)) for row in rows[:limit]],
+            "row_count": min(len(rows), limit),
+            "truncated": len(rows) > limit,
+            "dataset_version": version,
+        }
+        self.cache.set(key, result)
+        return {**result, "cached": False, "duration_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._database is not None:
+                self._database.close()
+            self._database = None
+            self._pool = None
+
+    def _version(self, dataset: QueryableDataset, path: Path) -> int:
+        """Modification time of the published file; each pipeline run replaces the file."""
+        try:
+            version = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            raise NotFoundError(f"Dataset {dataset.name} has not been published yet; run the analytics pipeline")
+        if self._versions.get(dataset.name) != version:
+            if dataset.name in self._versions:
+                # Results of the previous run can never be served again.
+                self.cache.clear()
+                logger.info("Analytics dataset %s changed; query cache cleared", dataset.name)
+            self._versions[dataset.name] = version
+        return version
+
+    def _get_pool(self) -> "queue.Queue[Any]":
+        with self._lock:
+            if self._pool is None:
+                import duckdb
+
+                database = duckdb.connect(
+                    database=":memory:",
+                    config={"memory_limit": self.memory_limit, "threads": self.threads},
+                )
+                # Only the analytics directory is readable, and queries cannot change these settings.
+                database.execute("SET allowed_directories = ?", [[str(self.data_dir.resolve()) + "/"]])
+                database.execute("SET enable_external_access = false")
+                database.execute("SET lock_configuration = true")
+                pool: "queue.Queue[Any]" = queue.Queue()
+                for _ in range(self.connections):
+                    pool.put(database.cursor())
+                self._database, self._pool = database, pool
+            return self._pool
+
+    def _execute(self, sql: str, params: List[Any]) -> Tuple[List[str], List[Tuple[Any, ...]]]:
+        import duckdb
+
+        pool = self._get_pool()
+        try:
+            connection = pool.get(timeout=self.queue_timeout)
+        except queue.Empty:
+            raise ServiceUnavailableError("All analytics query connections are busy", retry_after=1)
+
+        timer = threading.Timer(self.timeout, connection.interrupt)
+        timer.start()
+        try:
+            cursor = connection.execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+            return columns, cursor.fetchall()
+        except duckdb.InterruptException:
+            raise QueryTimeoutError(f"Analytics query exceeded {self.timeout:g} seconds")
+        except duckdb.OutOfMemoryException:
+            raise ServiceUnavailableError(f"Analytics query exceeded the {self.memory_limit} memory limit")
+        finally:
+            timer.cancel()
+            pool.put(connection)
+
+
+analytics_queries = AnalyticsQueryService()
@@ -0,0 +1,133 @@
+import logging
+import secrets
+import threading
+import time
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+from flask import Flask, g, request
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from pony.orm import db_session
+
+from .cache import LRUCache
+from .exceptions import AuthenticationError
+from .repositories.token_repo import RevokedTokenRepository
+
+logger = logging.getLogger(__name__)
+
+
+class TokenManager:
+    """
+    Issue and verify HMAC-signed, expiring auth tokens without the database.
+
+    Tokens are signed with ``SECRET_KEY`` (itsdangerous). Verified claims are
+    kept in a per-worker LRU so repeated requests skip the HMAC check. The
+    revocation list is held in memory and re-synced from ``revoked_tokens``
+    at most every ``revocation_sync_seconds``, so a request never pays for a
+    query beyond that periodic refresh.
+    """
+
+    salt = "auth-token"
+
+    def __init__(self, repo: RevokedTokenRepository) -> None:
+        self.repo = repo
+        self.max_age = 3600
+        self.revocation_sync_seconds = 30.0
+        self._serializer: URLSafeTimedSerializer | None = None
+        self._cache = LRUCache(max_entries=1024)
+        self._revoked: set[str] = set()
+        self._revocations_synced_at: float | None = None
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        secret_key: str,
+        max_age: int,
+        cache_size: int,
+        revocation_sync_seconds: float,
+    ) -> None:
+        self._serializer = URLSafeTimedSerializer(secret_key, salt=self.salt)
+        self.max_age = max_age
+        self.revocation_sync_seconds = revocation_sync_seconds
+        self._cache = LRUCache(max_entries=cache_size)
+        self._revocations_synced_at = None
+
+    def issue(self, user_id: int) -> str:
+        return self._serializer.dumps({"uid": user_id, "jti": secrets.token_urlsafe(12)})
+
+    def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return the token's claims, or None when it is invalid, expired or revoked."""
+        self._sync_revocations_if_due()
+
+        claims = self._cache.get(token)
+        if claims is None:
+            try:
+                data, issued_at = self._serializer.loads(token, max_age=self.max_age, return_timestamp=True)
+            except BadSignature:
+                return None
+
+            expires_at = issued_at.timestamp() + self.max_age
+            claims = {"user_id": data["uid"], "jti": data["jti"], "expires_at": expires_at}
+            self._cache.set(token, claims, ttl_seconds=max(expires_at - time.time(), 0))
+
+        if claims["jti"] in self._revoked:
+            return None
+        return claims
+
+    @db_session
+    def revoke(self, claims: Dict[str, Any]) -> None:
+        expires_at = datetime.fromtimestamp(claims["expires_at"], tz=timezone.utc).replace(tzinfo=None)
+        self.repo.add(jti=claims["jti"], expires_at=expires_at)
+        with self._lock:
+            self._revoked.add(claims["jti"])
+
+    def _sync_revocations_if_due(self) -> None:
+        now = time.monotonic()
+        synced_at = self._revocations_synced_at
+        if synced_at is not None and now - synced_at < self.revocation_sync_seconds:
+            return
+
+        # Claim the refresh so concurrent threads don't all hit the database.
+        self._revocations_synced_at = now
+        try:
+            with db_session:
+                revoked = set(self.repo.list_active_ids(now=datetime.utcnow()))
+        except Exception as exc:
+            logger.warning("Failed to sync token revocation list: %s", exc)
+            return
+        with self._lock:
+            self._revoked = revoked
+
+
+token_manager = TokenManager(RevokedTokenRepository())
+
+
+def load_current_auth() -> None:
+    """Verify a bearer token if present and expose its claims as ``g.auth``."""
+    g.auth = None
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        g.auth = token_manager.verify(token.strip())
+
+
+def auth_required(func: Callable) -> Callable:
+    """Reject requests without a valid bearer token with 401."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if g.get("auth") is None:
+            raise AuthenticationError("invalid or missing token")
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def init_auth(app: Flask) -> None:
+    token_manager.configure(
+        secret_key=app.config["SECRET_KEY"],
+        max_age=app.config["AUTH_TOKEN_TTL_SECONDS"],
+        cache_size=app.config["AUTH_TOKEN_CACHE_SIZE"],
+        revocation_sync_seconds=app.config["AUTH_REVOCATION_SYNC_SECONDS"],
+    )
+    app.before_request(load_current_auth)
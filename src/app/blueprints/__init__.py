@@ -1,15 +1,28 @@
+from importlib import import_module
+
 from flask import Flask
-from .auth import auth_bp
-from .projects import projects_bp
-from .tasks import tasks_bp
-from .reports import reports_bp
-from .health import health_bp
+
+# (module, blueprint attribute, url prefix). Modules are imported only when
+# the blueprint is enabled, so disabled ones cost nothing at startup.
+BLUEPRINTS = {
+    "auth": (".auth", "auth_bp", "/auth"),
+    "projects": (".projects", "projects_bp", "/projects"),
+    "tasks": (".tasks", "tasks_bp", "/tasks"),
+    "reports": (".reports", "reports_bp", "/reports"),
+    "workload": (".workload", "workload_bp", "/workload"),
+    "datasets": (".datasets", "datasets_bp", "/datasets"),
+    "events": (".events", "events_bp", "/events"),
+    "analytics": (".analytics", "analytics_bp", "/analytics"),
+    "health": (".health", "health_bp", ""),
+    "metrics": (".metrics", "metrics_bp", ""),
+}
 
 
 def register_blueprints(app: Flask) -> None:
-    """Register all API blueprints on the Flask app."""
-    app.register_blueprint(auth_bp, url_prefix="/auth")
-    app.register_blueprint(projects_bp, url_prefix="/projects")
-    app.register_blueprint(tasks_bp, url_prefix="/tasks")
-    app.register_blueprint(reports_bp, url_prefix="/reports")
-    app.register_blueprint(health_bp, url_prefix="")
+    """Register all enabled API blueprints on the Flask app."""
+    disabled = set(app.config.get("DISABLED_BLUEPRINTS") or ())
+    for name, (module_name, attribute, url_prefix) in BLUEPRINTS.items():
+        if name in disabled:
+            continue
+        blueprint = getattr(import_module(module_name, __name__), attribute)
+        app.register_blueprint(blueprint, url_prefix=url_prefix)
@@ -0,0 +1,88 @@
+from datetime import date
+from pathlib import Path
+
+from flask import Blueprint, Response, current_app, jsonify, request, send_file
+from ..analytics.downloads import (
+    FORMATS,
+    arrow_stream,
+    dataset_path,
+    get_downloadable,
+    parquet_stream,
+    scan_batches,
+)
+from ..analytics.query_service import analytics_queries
+from ..exceptions import ValidationError
+
+analytics_bp = Blueprint("analytics", __name__)
+
+
+def _date_arg(name: str) -> date | None:
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValidationError(f"{name} must be a date (YYYY-MM-DD)")
+
+
+@analytics_bp.route("/query", methods=["GET"])
+def describe_queries():
+    """Datasets, dimensions, metrics and filters accepted by POST /analytics/query."""
+    return jsonify(analytics_queries.describe())
+
+
+@analytics_bp.route("/query", methods=["POST"])
+def run_query():
+    """
+    Run an aggregate query over an analytics dataset, e.g.::
+
+        {"dataset": "tasks", "group_by": ["project_id", "done_month"],
+         "metrics": ["done", "p90_lead_time_days"],
+         "filters": {"status": ["done"], "done_at": {"from": "2025-01-01"}},
+         "order_by": "-done", "limit": 100}
+    """
+    return jsonify(analytics_queries.run(request.get_json(silent=True)))
+
+
+@analytics_bp.route("/<name>", methods=["GET"])
+def download_dataset(name: str):
+    """
+    Download an analytics dataset (``analytics_summary``, ``tasks`` or ``project_flow``) as columnar data.
+
+    Query parameters:
+      - format: ``arrow`` (Arrow IPC stream, default) or ``parquet``
+      - project_id: only this project's rows
+      - from, to: inclusive date range (YYYY-MM-DD) on done_date / created_at / day
+      - columns: comma-separated subset of columns
+    """
+    cfg = current_app.config
+    dataset = get_downloadable(name)
+    fmt = request.args.get("format", "arrow")
+    if fmt not in FORMATS:
+        raise ValidationError(f"format must be one of: {', '.join(FORMATS)}")
+    try:
+        project_id = int(request.args["project_id"]) if request.args.get("project_id") else None
+    except ValueError:
+        raise ValidationError("project_id must be an integer")
+    start, end = _date_arg("from"), _date_arg("to")
+    if start is not None and end is not None and start > end:
+        raise ValidationError("from must not be after to")
+    columns = [c.strip() for c in request.args["columns"].split(",") if c.strip()] if request.args.get("columns") else None
+
+    path = dataset_path(Path(cfg["ANALYTICS_DATA_DIR"]).expanduser(), dataset)
+    mimetype, extension = FORMATS[fmt]
+    suffix = f"-project-{project_id}" if project_id is not None else ""
+    filename = f"{dataset.name}{suffix}.{extension}"
+
+    if fmt == "parquet" and project_id is None and start is None and end is None and columns is None:
+        # The whole published file: no re-encoding, sent by the server with sendfile.
+        return send_file(path, mimetype=mimetype, as_attachment=True, download_name=filename, conditional=True)
+
+    batch_rows = cfg["ANALYTICS_DOWNLOAD_BATCH_ROWS"]
+    schema, batches = scan_batches(path, dataset, project_id, start, end, columns, batch_rows=batch_rows)
+    body = arrow_stream(schema, batches) if fmt == "arrow" else parquet_stream(schema, batches, batch_rows)
+    response = Response(body, mimetype=mimetype)
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response.last_modified = path.stat().st_mtime
+    return response
@@ -1,7 +1,8 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, g
 from ..repositories.user_repo import UserRepository
 from ..services.user_service import UserService
-from ..exceptions import ValidationError
+from ..auth_tokens import auth_required, token_manager
+from ..exceptions import AuthenticationError, ValidationError
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -27,7 +28,7 @@ def register():
 
 @auth_bp.route("/login", methods=["POST"])
 def login():
-    """Simple login endpoint returning a dummy token for demo purposes."""
+    """Login endpoint returning a signed, expiring bearer token."""
     data = request.get_json() or {}
     email = data.get("email")
     password = data.get("password")
@@ -37,14 +38,30 @@ def login():
 
     user = _user_service.authenticate(email=email, password=password)
     if user is None:
-        return jsonify({"error": {"type": "AuthenticationError", "message": "invalid credentials"}}), 401
+        raise AuthenticationError("invalid credentials")
 
     user_id = user["id"]
-    token = f"demo-token-user-{user_id}"
+    token = token_manager.issue(user_id)
 
     return jsonify(
         {
             "user": {"id": user_id, "email": user["email"], "name": user["name"]},
             "token": token,
+            "expires_in": token_manager.max_age,
         }
     )
+
+
+@auth_bp.route("/me", methods=["GET"])
+@auth_required
+def me():
+    """Return the identity carried by the bearer token (no database lookup)."""
+    return jsonify({"user_id": g.auth["user_id"]})
+
+
+@auth_bp.route("/logout", methods=["POST"])
+@auth_required
+def logout():
+    """Revoke the bearer token used for this request."""
+    token_manager.revoke(g.auth)
+    return "", 204
@@ -0,0 +1,18 @@
+from flask import Blueprint, jsonify
+from ..scheduling import dataset_statuses
+
+datasets_bp = Blueprint("datasets", __name__)
+
+
+@datasets_bp.route("", methods=["GET"])
+def list_datasets():
+    """Refresh status of every scheduled derived dataset: last success, duration, lag."""
+    items = dataset_statuses()
+    return jsonify({"items": items, "count": len(items)})
+
+
+@datasets_bp.route("/<name>", methods=["GET"])
+def get_dataset_status(name: str):
+    """Refresh status of one derived dataset."""
+    (status,) = dataset_statuses(name)
+    return jsonify(status)
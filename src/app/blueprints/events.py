@@ -0,0 +1,46 @@
+import math
+
+from flask import Blueprint, current_app, request, jsonify
+from ..repositories.project_repo import ProjectRepository
+from ..repositories.task_repo import TaskRepository
+from ..services.event_feed_service import EventFeedService
+from ..exceptions import ValidationError
+
+events_bp = Blueprint("events", __name__)
+
+_event_feed_service = EventFeedService(task_repo=TaskRepository(), project_repo=ProjectRepository())
+
+
+@events_bp.route("", methods=["GET"])
+def list_events():
+    """
+    Change feed of task events in id order.
+
+    Query parameters:
+      - after: cursor from the previous response's ``next_cursor`` (default 0, from the start)
+      - limit: max events (default 100, capped by EVENT_FEED_MAX_LIMIT)
+      - project_id: only events of this project's tasks
+      - wait: seconds to long-poll when there is nothing new (capped by EVENT_FEED_MAX_WAIT_SECONDS)
+
+    Responds 410 with ``details.archived_until`` when ``after`` points into
+    events that have already been archived to Parquet.
+    """
+    cfg = current_app.config
+    try:
+        after = int(request.args.get("after", 0))
+        limit = int(request.args.get("limit", 100))
+        wait = float(request.args.get("wait", 0))
+    except ValueError:
+        raise ValidationError("after and limit must be integers, wait a number of seconds")
+    if not math.isfinite(wait):
+        raise ValidationError("wait must be a finite number of seconds")
+    if after < 0 or limit <= 0 or wait < 0:
+        raise ValidationError("after, limit and wait must not be negative")
+
+    feed = _event_feed_service.read(
+        after=after,
+        limit=min(limit, cfg["EVENT_FEED_MAX_LIMIT"]),
+        project_id=request.args.get("project_id", type=int),
+        wait_seconds=min(wait, cfg["EVENT_FEED_MAX_WAIT_SECONDS"]),
+    )
+    return jsonify(feed)
@@ -1,27 +1,32 @@
 from flask import Blueprint, jsonify
-from pony.orm import db_session
-from ..models import db
+from ..health_checker import health_checker
 
 health_bp = Blueprint("health", __name__)
 
 
+@health_bp.route("/livez", methods=["GET"])
+def liveness():
+    """Liveness probe: the process is up and serving requests."""
+    return jsonify({"status": "ok"})
+
+
+@health_bp.route("/readyz", methods=["GET"])
+def readiness():
+    """
+    Readiness probe served from the background checker's cached result.
+
+    Never touches the database itself; returns 503 until the first check
+    completes, when a required check fails, or when the result is stale.
+    """
+    snapshot = health_checker.snapshot()
+    if snapshot is None:
+        return jsonify({"status": "starting", "ready": False}), 503
+
+    ready = snapshot["ready"] and not snapshot["stale"]
+    return jsonify(snapshot), 200 if ready else 503
+
+
 @health_bp.route("/healthz", methods=["GET"])
 def healthcheck():
-    """Basic health check endpoint including database connectivity."""
-    db_ok = False
-    try:
-        with db_session:
-            # Simple connectivity check
-            list(db.select("SELECT 1"))
-        db_ok = True
-    except Exception:
-        db_ok = False
-
-    status_code = 200 if db_ok else 500
-    payload = {
-        "status": "ok" if db_ok else "degraded",
-        "checks": {
-            "database": "ok" if db_ok else "failed",
-        },
-    }
-    return jsonify(payload), status_code
+    """Backwards-compatible alias of the readiness probe."""
+    return readiness()
@@ -50,3 +50,9 @@ def create_project():
     project = _project_service.create_project(owner_id=int(owner_id), name=name)
 
     return jsonify(project), 201
+
+
+@projects_bp.route("/<int:project_id>/dashboard", methods=["GET"])
+def project_dashboard(project_id: int):
+    """Status counts, WIP per assignee, throughput, lead time and latest report in one call."""
+    return jsonify(_project_service.get_dashboard(project_id=project_id))
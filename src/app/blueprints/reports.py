@@ -1,4 +1,4 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify
 from ..repositories.report_repo import ReportRepository
 from ..repositories.project_repo import ProjectRepository
 from ..services.report_service import ReportService
@@ -23,8 +23,30 @@ def request_daily_summary(project_id: int):
     return jsonify(report), 202
 
 
+def _ready_report_etag(report_id: int) -> str:
+    return f"report-{report_id}"
+
+
+def _cache_ready_report(response: Response, report_id: int) -> Response:
+    # A ready report is immutable, so it can be cached anywhere for long.
+    response.set_etag(_ready_report_etag(report_id))
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config["REPORT_CACHE_MAX_AGE_SECONDS"]
+    response.cache_control.immutable = True
+    return response
+
+
 @reports_bp.route("/<int:report_id>", methods=["GET"])
 def get_report(report_id: int):
     """Fetch report by id."""
+    # Only ready reports get an ETag, so a match is answered without touching the database.
+    if request.if_none_match.contains_weak(_ready_report_etag(report_id)):
+        return _cache_ready_report(current_app.response_class(status=304), report_id)
+
     report = _report_service.get_report(report_id=report_id)
-    return jsonify(report)
+    response = jsonify(report)
+    if report["status"] != "ready":
+        # Still being computed; a cached copy would hide the result.
+        response.headers["Cache-Control"] = "no-store"
+        return response
+    return _cache_ready_report(response, report_id)
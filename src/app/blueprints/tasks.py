@@ -61,6 +61,13 @@ def create_task_for_project(project_id: int):
     return jsonify(task), 201
 
 
+@tasks_bp.route("/<int:task_id>/events", methods=["GET"])
+def list_task_events(task_id: int):
+    """Event history of a task, including events already archived to Parquet."""
+    events = _task_service.list_events(task_id=task_id)
+    return jsonify({"items": events, "count": len(events)})
+
+
 @tasks_bp.route("/<int:task_id>/status", methods=["PATCH"])
 def update_task_status(task_id: int):
     """Update the status of a task."""
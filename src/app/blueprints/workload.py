@@ -0,0 +1,35 @@
+from flask import Blueprint, request, jsonify
+from ..repositories.project_repo import ProjectRepository
+from ..repositories.user_repo import UserRepository
+from ..repositories.workload_repo import WorkloadRepository
+from ..services.workload_service import WorkloadService
+from ..pagination import get_pagination_params
+
+workload_bp = Blueprint("workload", __name__)
+
+_workload_service = WorkloadService(
+    workload_repo=WorkloadRepository(),
+    user_repo=UserRepository(),
+    project_repo=ProjectRepository(),
+)
+
+
+@workload_bp.route("/assignees", methods=["GET"])
+def list_assignee_workload():
+    """Open work, WIP age and recent throughput per assignee across projects, busiest first."""
+    limit, offset = get_pagination_params(request)
+    return jsonify(_workload_service.list_assignees(limit=limit, offset=offset))
+
+
+@workload_bp.route("/assignees/<int:assignee_id>", methods=["GET"])
+def get_assignee_workload(assignee_id: int):
+    """Workload of one assignee, per project."""
+    limit, offset = get_pagination_params(request)
+    return jsonify(_workload_service.get_assignee(assignee_id=assignee_id, limit=limit, offset=offset))
+
+
+@workload_bp.route("/projects/<int:project_id>", methods=["GET"])
+def get_project_workload(project_id: int):
+    """Workload of everyone with tasks in one project."""
+    limit, offset = get_pagination_params(request)
+    return jsonify(_workload_service.get_project(project_id=project_id, limit=limit, offset=offset))
@@ -1,8 +1,32 @@
-from . import create_app
-from .extensions import celery
+from celery.signals import celeryd_init
+
+from .config import Config
+from .extensions import disconnect_databases, get_celery, get_flask_app
+from .scheduling import beat_schedule
+
+celery = get_celery()
+
+# Task modules are no longer imported as a side effect of building the web
+# app (services import them lazily), so register them explicitly.
+celery.conf.imports = (
+    "app.tasks.report_tasks",
+    "app.tasks.event_tasks",
+    "app.tasks.workload_tasks",
+    "app.tasks.scheduling_tasks",
+)
+
+# Run with "celery -A app.celery_app.celery beat" next to the workers; one
+# entry per derived dataset (app/scheduling.py).
+celery.conf.beat_schedule = beat_schedule({key: getattr(Config, key) for key in dir(Config) if key.isupper()})
+
+
+@celeryd_init.connect
+def _build_flask_app(**kwargs):
+    # Build the Flask app once in the worker's main process so pool children
+    # share it copy-on-write; each child opens its own DB connection.
+    get_flask_app()
+    disconnect_databases()
 
-# Create Flask app and bind Celery to it so that workers can run tasks.
-app = create_app()
 
 # Re-export Celery instance for "celery -A app.celery_app.celery worker"
 __all__ = ["celery"]
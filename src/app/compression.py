@@ -0,0 +1,112 @@
+import gzip
+import threading
+from typing import Callable, Dict, List
+
+from flask import Flask, Response, request
+
+COMPRESSIBLE_MIMETYPES = {"application/json", "text/plain", "text/html", "text/csv"}
+
+
+def _gzip_encoder(level: int) -> Callable[[bytes], bytes]:
+    # mtime=0 keeps the output deterministic for identical bodies
+    return lambda data: gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _zstd_encoder(level: int) -> Callable[[bytes], bytes] | None:
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    # ZstdCompressor instances must not be shared between threads (gthread
+    # workers): each request thread gets its own, reused across its requests.
+    local = threading.local()
+
+    def compress(data: bytes) -> bytes:
+        compressor = getattr(local, "compressor", None)
+        if compressor is None:
+            compressor = local.compressor = zstandard.ZstdCompressor(level=level)
+        return compressor.compress(data)
+
+    return compress
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """{"gzip": 1.0, "zstd": 0.5, ...} from an Accept-Encoding header."""
+    accepted: Dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def choose_encoding(header: str, available: List[str]) -> str | None:
+    """Best coding from ``available`` (in server preference order) the client accepts."""
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for coding in available:
+        quality = accepted.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def init_compression(app: Flask) -> None:
+    """
+    Compress responses above COMPRESSION_MIN_BYTES with the best coding the
+    client accepts: zstd (when the zstandard package is installed), then gzip.
+    Small bodies are sent as-is; below ~1 KB compression costs more CPU than
+    it saves on the wire.
+    """
+    cfg = app.config
+    if not cfg["COMPRESSION_ENABLED"]:
+        return
+
+    encoders: Dict[str, Callable[[bytes], bytes]] = {}
+    zstd = _zstd_encoder(cfg["COMPRESSION_ZSTD_LEVEL"])
+    if zstd is not None:
+        encoders["zstd"] = zstd
+    encoders["gzip"] = _gzip_encoder(cfg["COMPRESSION_GZIP_LEVEL"])
+    available = list(encoders)
+    min_bytes = cfg["COMPRESSION_MIN_BYTES"]
+
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        if (
+            response.direct_passthrough
+            or response.is_streamed
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        if response.content_length is not None and response.content_length < min_bytes:
+            return response
+        coding = choose_encoding(request.headers.get("Accept-Encoding", ""), available)
+        if coding is None:
+            return response
+
+        body = response.get_data()
+        if len(body) < min_bytes:
+            return response
+        response.set_data(encoders[coding](body))
+        response.headers["Content-Encoding"] = coding
+        # The encoded body differs byte-wise, so a strong validator would be wrong.
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
@@ -12,12 +12,59 @@ class Config:
     # Security
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key")
 
+    # Signed auth tokens (verified without a database lookup)
+    AUTH_TOKEN_TTL_SECONDS = int(os.getenv("AUTH_TOKEN_TTL_SECONDS", "3600"))
+    AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "4096"))
+    AUTH_REVOCATION_SYNC_SECONDS = float(os.getenv("AUTH_REVOCATION_SYNC_SECONDS", "30"))
+
+    # Password hashing runs on a bounded process pool (0 workers = inline).
+    # Requests beyond workers + queue size are rejected with 503 + Retry-After.
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "8"))
+    PASSWORD_HASH_TIMEOUT_SECONDS = float(os.getenv("PASSWORD_HASH_TIMEOUT_SECONDS", "5"))
+    # Werkzeug method string; stored hashes with other parameters are upgraded on login.
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+
     # Application host/port
     APP_HOST = os.getenv("APP_HOST", "0.0.0.0")
     APP_PORT = int(os.getenv("APP_PORT", "8000"))
 
     # Nginx integration flag (used for runtime hints, logging, etc.)
     ENABLE_NGINX = os.getenv("ENABLE_NGINX", "false").lower() == "true"
+    # Peers (IPs or CIDRs, comma-separated) whose X-Real-IP header is believed,
+    # e.g. the Nginx container's network. Empty: always key clients by the peer address.
+    TRUSTED_PROXIES = [p.strip() for p in os.getenv("TRUSTED_PROXIES", "").split(",") if p.strip()]
+
+    # Blueprints to leave out (e.g. "reports,metrics"); their modules are never imported.
+    DISABLED_BLUEPRINTS = [b.strip() for b in os.getenv("DISABLED_BLUEPRINTS", "").split(",") if b.strip()]
+
+    # Project dashboard: cached per (project, version) for at most the TTL, so the
+    # rolling throughput/lead-time windows move on even without writes. Slower
+    # builds than the target are logged.
+    DASHBOARD_CACHE_TTL_SECONDS = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "300"))
+    DASHBOARD_LATENCY_TARGET_MS = float(os.getenv("DASHBOARD_LATENCY_TARGET_MS", "50"))
+    DASHBOARD_THROUGHPUT_DAYS = int(os.getenv("DASHBOARD_THROUGHPUT_DAYS", "14"))
+    DASHBOARD_LEAD_TIME_DAYS = int(os.getenv("DASHBOARD_LEAD_TIME_DAYS", "30"))
+
+    # Ready reports never change: GET /reports/<id> lets clients and the nginx cache
+    # keep them this long. Pending reports are sent with no-store.
+    REPORT_CACHE_MAX_AGE_SECONDS = int(os.getenv("REPORT_CACHE_MAX_AGE_SECONDS", "86400"))
+
+    # Assignee workload summary (materialized view on PostgreSQL, summary table on
+    # SQLite): refreshed on the schedule every WORKLOAD_REFRESH_SECONDS, recomputed
+    # in full at least every WORKLOAD_FULL_REFRESH_SECONDS, reported as stale by
+    # the API once older than WORKLOAD_STALE_SECONDS.
+    WORKLOAD_REFRESH_SECONDS = float(os.getenv("WORKLOAD_REFRESH_SECONDS", "60"))
+    WORKLOAD_FULL_REFRESH_SECONDS = float(os.getenv("WORKLOAD_FULL_REFRESH_SECONDS", "3600"))
+    WORKLOAD_STALE_SECONDS = float(os.getenv("WORKLOAD_STALE_SECONDS", "300"))
+
+    # Scheduled derived datasets (app/scheduling.py): cadence per dataset (0 disables
+    # it) and a random delay of up to SCHEDULE_JITTER_FRACTION of the cadence, capped
+    # at SCHEDULE_MAX_JITTER_SECONDS, before each run.
+    ANALYTICS_REFRESH_SECONDS = float(os.getenv("ANALYTICS_REFRESH_SECONDS", "3600"))
+    EVENT_ARCHIVE_INTERVAL_SECONDS = float(os.getenv("EVENT_ARCHIVE_INTERVAL_SECONDS", "86400"))
+    SCHEDULE_JITTER_FRACTION = float(os.getenv("SCHEDULE_JITTER_FRACTION", "0.1"))
+    SCHEDULE_MAX_JITTER_SECONDS = float(os.getenv("SCHEDULE_MAX_JITTER_SECONDS", "300"))
 
     # Logging
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
@@ -30,6 +77,107 @@ class Config:
     DB_USER = os.getenv("DB_USER", "radar")
     DB_PASSWORD = os.getenv("DB_PASSWORD", "radar")
     DB_NAME = os.getenv("DB_NAME", "radar")
+    # libpq connect_timeout (whole seconds, minimum 2): an unreachable server
+    # fails the connection attempt instead of blocking the caller.
+    DB_CONNECT_TIMEOUT_SECONDS = int(os.getenv("DB_CONNECT_TIMEOUT_SECONDS", "5"))
+
+    # Read replicas (comma-separated). For PostgreSQL each entry is "host[:port]"
+    # sharing the primary's credentials and database name; for SQLite each entry
+    # is a database filename. Read-only service methods are routed to replicas.
+    DB_REPLICAS = [r.strip() for r in os.getenv("DB_REPLICAS", "").split(",") if r.strip()]
+    DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "10"))
+    DB_REPLICA_LAG_CHECK_SECONDS = float(os.getenv("DB_REPLICA_LAG_CHECK_SECONDS", "5"))
+    # After a write, the same client reads from the primary for this long
+    # (carried in a short-lived cookie, so it holds across workers).
+    DB_READ_YOUR_WRITES_SECONDS = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))
+
+    # Per-request SQL accounting (response headers, debug logs, N+1 warnings)
+    SQL_TRACKING_ENABLED = os.getenv("SQL_TRACKING_ENABLED", str(DEBUG)).lower() == "true"
+    # Warn when one query shape runs at least this many times in a request/task.
+    SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+
+    # On-demand profiling (cProfile). Requests are profiled when sampled or when
+    # they send "X-Profile: <PROFILE_HEADER_TOKEN>"; listed Celery tasks always.
+    PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    PROFILE_HEADER_TOKEN = os.getenv("PROFILE_HEADER_TOKEN", "")
+    PROFILE_CELERY_TASKS = [t.strip() for t in os.getenv("PROFILE_CELERY_TASKS", "").split(",") if t.strip()]
+    PROFILE_DIR = os.getenv("PROFILE_DIR", "/tmp/workload-radar-profiles")
+
+    # Health probes: readiness is served from a cache refreshed in the background
+    HEALTH_CHECK_INTERVAL_SECONDS = float(os.getenv("HEALTH_CHECK_INTERVAL_SECONDS", "5"))
+    HEALTH_CHECK_TIMEOUT_SECONDS = float(os.getenv("HEALTH_CHECK_TIMEOUT_SECONDS", "2"))
+    READINESS_REQUIRED_CHECKS = [
+        c.strip() for c in os.getenv("READINESS_REQUIRED_CHECKS", "database").split(",") if c.strip()
+    ]
+
+    # Admission control / load shedding
+    # Endpoints are grouped into classes; unlisted endpoints are "default".
+    ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+    ADMISSION_ENDPOINT_CLASSES = {
+        "reports.request_daily_summary": "expensive",
+        "projects.list_projects": "list",
+        "tasks.list_tasks_for_project": "list",
+        "events.list_events": "feed",
+        "analytics.download_dataset": "expensive",
+        "analytics.run_query": "expensive",
+    }
+    # Token buckets as "rate_per_second:burst", per client and per class overall.
+    RATE_LIMITS_PER_CLIENT = {
+        "default": os.getenv("RATE_LIMIT_CLIENT_DEFAULT", "50:100"),
+        "list": os.getenv("RATE_LIMIT_CLIENT_LIST", "20:40"),
+        "expensive": os.getenv("RATE_LIMIT_CLIENT_EXPENSIVE", "0.2:5"),
+    }
+    RATE_LIMITS_PER_CLASS = {
+        "expensive": os.getenv("RATE_LIMIT_CLASS_EXPENSIVE", "5:20"),
+    }
+    # "memory" (per worker), "sqlite" (shared on one host) or "redis" (shared everywhere)
+    RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMIT_SQLITE_PATH = os.getenv("RATE_LIMIT_SQLITE_PATH", "/tmp/workload-radar-ratelimit.sqlite")
+    RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://redis:6379/0")
+    # Max concurrent requests per worker process for each class.
+    CONCURRENCY_LIMITS = {
+        "expensive": int(os.getenv("CONCURRENCY_LIMIT_EXPENSIVE", "2")),
+        "list": int(os.getenv("CONCURRENCY_LIMIT_LIST", "8")),
+        # Parked long polls per worker; size with the worker model (gthread/gevent).
+        "feed": int(os.getenv("CONCURRENCY_LIMIT_FEED", "4")),
+    }
+    # While the smoothed request latency exceeds this, shed these classes with 503.
+    LOAD_SHED_LATENCY_MS = float(os.getenv("LOAD_SHED_LATENCY_MS", "1000"))
+    # Without new samples the smoothed latency decays with this time constant,
+    # so shedding ends even when every request of a class is being refused.
+    LOAD_SHED_DECAY_SECONDS = float(os.getenv("LOAD_SHED_DECAY_SECONDS", "10"))
+    LOAD_SHED_CLASSES = [c.strip() for c in os.getenv("LOAD_SHED_CLASSES", "expensive,list").split(",") if c.strip()]
+    # Classes whose requests wait on purpose (long polling); kept out of that latency.
+    LONG_POLL_CLASSES = ["feed"]
+
+    # Change feed (GET /events): long polls wait up to EVENT_FEED_MAX_WAIT_SECONDS,
+    # re-checking every EVENT_FEED_POLL_INTERVAL_SECONDS. Events younger than
+    # EVENT_FEED_SETTLE_SECONDS are held back, so a transaction that commits a
+    # lower id after a higher one is not skipped by a consumer's cursor.
+    EVENT_FEED_MAX_LIMIT = int(os.getenv("EVENT_FEED_MAX_LIMIT", "1000"))
+    EVENT_FEED_MAX_WAIT_SECONDS = float(os.getenv("EVENT_FEED_MAX_WAIT_SECONDS", "20"))
+    EVENT_FEED_POLL_INTERVAL_SECONDS = float(os.getenv("EVENT_FEED_POLL_INTERVAL_SECONDS", "0.5"))
+    EVENT_FEED_SETTLE_SECONDS = float(os.getenv("EVENT_FEED_SETTLE_SECONDS", "1.0"))
+
+    # Response encoding. JSON_PROVIDER is "orjson" (falls back to "default", Flask's
+    # stdlib provider, when orjson is missing). JSON_ISO_DATETIMES writes datetimes
+    # as ISO 8601 instead of HTTP dates; faster, but a wire-format change for clients.
+    JSON_PROVIDER = os.getenv("JSON_PROVIDER", "orjson")
+    JSON_ISO_DATETIMES = os.getenv("JSON_ISO_DATETIMES", "false").lower() == "true"
+    # JSON and text bodies of at least COMPRESSION_MIN_BYTES are compressed with zstd
+    # or gzip, whichever the client accepts (zstd needs the zstandard package).
+    COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+
+    # Migrations (scripts/apply_migrations.py). Timeouts use Postgres interval syntax;
+    # a migration header such as "-- migrate: statement_timeout=0" overrides them.
+    MIGRATION_LOCK_TIMEOUT = os.getenv("MIGRATION_LOCK_TIMEOUT", "5s")
+    MIGRATION_STATEMENT_TIMEOUT = os.getenv("MIGRATION_STATEMENT_TIMEOUT", "5min")
+    MIGRATION_LOCK_RETRIES = int(os.getenv("MIGRATION_LOCK_RETRIES", "5"))
+    # How long a deploy waits for another deploy's migration run to finish.
+    MIGRATION_ADVISORY_LOCK_WAIT_SECONDS = float(os.getenv("MIGRATION_ADVISORY_LOCK_WAIT_SECONDS", "600"))
 
     # Celery / RabbitMQ configuration
     CELERY_BROKER_URL = os.getenv(
@@ -46,3 +194,25 @@ class Config:
     # by the DuckDB + Polars pipeline (e.g. tasks.parquet, analytics_summary.parquet).
     # In Docker this is typically mapped to a host volume.
     ANALYTICS_DATA_DIR = os.getenv("ANALYTICS_DATA_DIR", "/data/analytics")
+    # How the pipeline reads tables: "copy" (PostgreSQL COPY decoded by PyArrow),
+    # "orm" (Pony entities) or "auto" (COPY on PostgreSQL, ORM elsewhere).
+    ANALYTICS_EXPORT_BACKEND = os.getenv("ANALYTICS_EXPORT_BACKEND", "auto")
+    # GET /analytics/<dataset> streams Arrow/Parquet in batches (and row groups) of this many rows.
+    ANALYTICS_DOWNLOAD_BATCH_ROWS = int(os.getenv("ANALYTICS_DOWNLOAD_BATCH_ROWS", "65536"))
+    # POST /analytics/query: whitelisted DuckDB queries on a per-worker connection pool.
+    # Memory and threads are shared by the pool's connections; a query waits up to
+    # the queue timeout for a connection and is interrupted after the query timeout.
+    ANALYTICS_QUERY_CONNECTIONS = int(os.getenv("ANALYTICS_QUERY_CONNECTIONS", "2"))
+    ANALYTICS_QUERY_THREADS = int(os.getenv("ANALYTICS_QUERY_THREADS", "2"))
+    ANALYTICS_QUERY_MEMORY_LIMIT = os.getenv("ANALYTICS_QUERY_MEMORY_LIMIT", "512MB")
+    ANALYTICS_QUERY_TIMEOUT_SECONDS = float(os.getenv("ANALYTICS_QUERY_TIMEOUT_SECONDS", "10"))
+    ANALYTICS_QUERY_QUEUE_TIMEOUT_SECONDS = float(os.getenv("ANALYTICS_QUERY_QUEUE_TIMEOUT_SECONDS", "2"))
+    ANALYTICS_QUERY_MAX_ROWS = int(os.getenv("ANALYTICS_QUERY_MAX_ROWS", "10000"))
+    ANALYTICS_QUERY_CACHE_ENTRIES = int(os.getenv("ANALYTICS_QUERY_CACHE_ENTRIES", "256"))
+
+    # task_events retention: months kept in the database. Older months are exported
+    # to Parquet under EVENT_ARCHIVE_DIR and then removed (partitions are detached
+    # on PostgreSQL). Event reads and the pipeline merge both sources.
+    EVENT_RETENTION_MONTHS = int(os.getenv("EVENT_RETENTION_MONTHS", "6"))
+    EVENT_PARTITIONS_AHEAD = int(os.getenv("EVENT_PARTITIONS_AHEAD", "3"))
+    EVENT_ARCHIVE_DIR = os.getenv("EVENT_ARCHIVE_DIR", os.path.join(ANALYTICS_DATA_DIR, "task_events_archive"))
@@ -0,0 +1,63 @@
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, List
+
+from pony.orm import Database
+
+# "Repository.method" currently executing, used to attribute SQL statements.
+current_repository_method: ContextVar[str | None] = ContextVar("current_repository_method", default=None)
+
+QueryListener = Callable[[Database, str, float], None]
+
+_listeners: List[QueryListener] = []
+
+
+def add_query_listener(listener: QueryListener) -> None:
+    """Register a callable invoked as ``listener(database, sql, duration_seconds)``."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def install_query_hook(database: Database) -> None:
+    """
+    Report every SQL statement Pony executes on ``database`` to the listeners.
+
+    Pony funnels all statements through ``Database._exec_sql``, which records
+    per-statement stats via ``_update_local_stat(sql, start_time)``; wrapping
+    that on the instance gives us the SQL text and duration at no extra cost.
+    """
+    if getattr(database, "_query_hook_installed", False):
+        return
+
+    original = database._update_local_stat
+
+    def update_local_stat(sql, query_start_time):
+        original(sql, query_start_time)
+        duration = time.time() - query_start_time
+        for listener in _listeners:
+            listener(database, sql, duration)
+
+    database._update_local_stat = update_local_stat
+    database._query_hook_installed = True
+
+
+def instrument_repository(cls: type) -> type:
+    """Class decorator tagging SQL issued by public repository methods with their name."""
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_") or not callable(attr):
+            continue
+        setattr(cls, name, _tag_method(f"{cls.__name__}.{name}", attr))
+    return cls
+
+
+def _tag_method(label: str, func: Callable) -> Callable:
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        token = current_repository_method.set(label)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            current_repository_method.reset(token)
+
+    return wrapper
@@ -0,0 +1,228 @@
+import logging
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List
+
+from flask import Response, has_request_context, request
+from pony.orm import Database, db_session
+
+from .models import db
+
+logger = logging.getLogger(__name__)
+
+# Database selected for the current unit of work; None means "use the primary".
+_read_database: ContextVar[Database | None] = ContextVar("read_database", default=None)
+
+# Set on successful writes; holds the wall-clock time the primary pin expires.
+READ_YOUR_WRITES_COOKIE = "radar_rw"
+
+_PG_REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN pg_is_in_recovery()
+            THEN COALESCE(EXTRACT(EPOCH FROM (now() - pg_last_xact_replay_timestamp())), 0)
+        ELSE 0
+    END
+"""
+
+
+def current_db() -> Database:
+    """Return the database that queries of the current unit of work should use."""
+    return _read_database.get() or db
+
+
+class Replica:
+    """A read replica together with its last observed replication lag."""
+
+    def __init__(self, name: str, database: Database) -> None:
+        self.name = name
+        self.database = database
+        self.lag_seconds: float | None = None
+        self.checked_at = 0.0
+        self.error: str | None = None
+
+
+class ReplicaRouter:
+    """
+    Route read-only units of work to a pool of read replicas.
+
+    A replica is skipped when its replication lag exceeds ``max_lag_seconds``,
+    the lag probe fails, or the last probe is older than three check
+    intervals; when no replica is usable the primary is used. Lag is probed
+    by a background thread, so a hung replica never stalls a request; the
+    thread starts lazily on first use, inside the serving process.
+
+    Clients that wrote recently carry a short-lived cookie and are pinned to
+    the primary while it lasts, whichever worker serves their next read.
+    """
+
+    def __init__(self, primary: Database) -> None:
+        self.primary = primary
+        self.replicas: List[Replica] = []
+        self.max_lag_seconds = 10.0
+        self.lag_check_interval = 5.0
+        self.read_your_writes_seconds = 5.0
+        self._thread: threading.Thread | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        max_lag_seconds: float,
+        lag_check_interval: float,
+        read_your_writes_seconds: float,
+    ) -> None:
+        self.max_lag_seconds = max_lag_seconds
+        self.lag_check_interval = lag_check_interval
+        self.read_your_writes_seconds = read_your_writes_seconds
+
+    def add_replica(self, name: str, database: Database) -> Replica:
+        replica = Replica(name, database)
+        self.replicas.append(replica)
+        return replica
+
+    def remove_replica(self, name: str) -> None:
+        self.replicas = [r for r in self.replicas if r.name != name]
+
+    def mark_write(self, response: Response) -> None:
+        """Pin the client to the primary for the read-your-writes window."""
+        if not self.replicas:
+            return
+        expires_at = time.time() + self.read_your_writes_seconds
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            f"{expires_at:.3f}",
+            max_age=max(int(math.ceil(self.read_your_writes_seconds)), 1),
+            httponly=True,
+            samesite="Lax",
+        )
+
+    @staticmethod
+    def has_recent_write() -> bool:
+        """True when the current request carries an unexpired write marker."""
+        if not has_request_context():
+            return False
+        try:
+            expires_at = float(request.cookies.get(READ_YOUR_WRITES_COOKIE, ""))
+        except ValueError:
+            return False
+        return expires_at > time.time()
+
+    def choose(self, pinned_to_primary: bool = False) -> Database:
+        """Pick the database a read-only unit of work should run against."""
+        if not self.replicas or pinned_to_primary:
+            return self.primary
+
+        self._ensure_started()
+        usable = [r for r in self.replicas if self._is_usable(r)]
+        if not usable:
+            return self.primary
+        return random.choice(usable).database
+
+    @contextmanager
+    def reading(self, pinned_to_primary: bool = False) -> Iterator[Database]:
+        """Make ``current_db()`` return the chosen database inside the block."""
+        database = self.choose(pinned_to_primary)
+        token = _read_database.set(database)
+        try:
+            yield database
+        finally:
+            _read_database.reset(token)
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": r.name,
+                "lag_seconds": r.lag_seconds,
+                "error": r.error,
+                "usable": self._is_usable(r),
+            }
+            for r in self.replicas
+        ]
+
+    def refresh(self) -> None:
+        """Probe every replica once, each with a timeout of one check interval."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="replica-lag")
+        replicas = list(self.replicas)
+        futures = [self._executor.submit(self._measure_lag, replica) for replica in replicas]
+        for replica, future in zip(replicas, futures):
+            try:
+                lag_seconds, error = future.result(timeout=self.lag_check_interval), None
+            except FutureTimeoutError:
+                lag_seconds, error = None, "timeout"
+            except Exception as exc:
+                lag_seconds, error = None, str(exc)
+            self._record_lag(replica, lag_seconds, error)
+
+    def _is_usable(self, replica: Replica) -> bool:
+        if replica.error is not None or replica.lag_seconds is None:
+            return False
+        if time.monotonic() - replica.checked_at > self.lag_check_interval * 3:
+            # The refresher is stuck or gone: the last reading can't be trusted.
+            return False
+        return replica.lag_seconds <= self.max_lag_seconds
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._loop, name="replica-lag-checker", daemon=True)
+            self._thread.start()
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Replica lag refresh failed")
+            time.sleep(self.lag_check_interval)
+
+    def _record_lag(self, replica: Replica, lag_seconds: float | None, error: str | None) -> None:
+        if error is not None:
+            logger.warning("Lag probe failed for replica %s: %s", replica.name, error)
+        replica.lag_seconds = lag_seconds
+        replica.error = error
+        replica.checked_at = time.monotonic()
+
+        if lag_seconds is not None and lag_seconds > self.max_lag_seconds:
+            logger.warning(
+                "Replica %s lag %.1fs exceeds %.1fs; reading from primary",
+                replica.name,
+                lag_seconds,
+                self.max_lag_seconds,
+            )
+
+    def _measure_lag(self, replica: Replica) -> float:
+        if replica.database.provider_name != "postgres":
+            # SQLite replicas are plain files with nothing to replay.
+            return 0.0
+        with db_session:
+            result = replica.database.select(_PG_REPLICA_LAG_SQL)
+        return float(next(iter(result), 0) or 0)
+
+
+db_router = ReplicaRouter(db)
+
+
+def read_only(func: Callable) -> Callable:
+    """
+    Run a read-only service method against a read replica when one is usable.
+
+    Must be applied above ``@db_session`` so the routed database is chosen
+    before the session starts. Repositories pick it via ``current_db()``.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with db_router.reading(db_router.has_recent_write()):
+            return func(*args, **kwargs)
+
+    return wrapper
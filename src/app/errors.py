@@ -16,7 +16,11 @@ def register_error_handlers(app: Flask) -> None:
         }
         if error.extra:
             response["error"]["details"] = error.extra
-        return jsonify(response), error.status_code
+        headers = {}
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            headers["Retry-After"] = str(retry_after)
+        return jsonify(response), error.status_code, headers
 
     @app.errorhandler(HTTPException)
     def handle_http_exception(error: HTTPException):
@@ -28,3 +28,50 @@ class NotFoundError(APIError):
 
     def __init__(self, message: str, extra: Optional[Dict[str, Any]] = None) -> None:
         super().__init__(message=message, status_code=404, extra=extra)
+
+
+class AuthenticationError(APIError):
+    """Error for missing, invalid or expired credentials."""
+
+    def __init__(self, message: str, extra: Optional[Dict[str, Any]] = None) -> None:
+        super().__init__(message=message, status_code=401, extra=extra)
+
+
+class ServiceUnavailableError(APIError):
+    """Error for temporarily overloaded dependencies; clients should retry later."""
+
+    def __init__(
+        self,
+        message: str,
+        retry_after: int | None = None,
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        super().__init__(message=message, status_code=503, extra=extra)
+        self.retry_after = retry_after
+
+
+class GoneError(APIError):
+    """Error for resources that existed but are no longer served here."""
+
+    def __init__(self, message: str, extra: Optional[Dict[str, Any]] = None) -> None:
+        super().__init__(message=message, status_code=410, extra=extra)
+
+
+class TooManyRequestsError(APIError):
+    """Error for clients exceeding their rate limit."""
+
+    def __init__(
+        self,
+        message: str,
+        retry_after: int | None = None,
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        super().__init__(message=message, status_code=429, extra=extra)
+        self.retry_after = retry_after
+
+
+class QueryTimeoutError(APIError):
+    """Error for queries cancelled after running longer than allowed."""
+
+    def __init__(self, message: str, extra: Optional[Dict[str, Any]] = None) -> None:
+        super().__init__(message=message, status_code=504, extra=extra)
@@ -1,9 +1,24 @@
-from flask import Flask
-from celery import Celery
-from .models import db
+import threading
 
+from flask import Flask, request
+from pony.orm import Database
+from .models import db, define_entities
+from .analytics.query_service import analytics_queries
+from .auth_tokens import init_auth
+from .db_instrumentation import install_query_hook
+from .db_routing import db_router
+from .health_checker import health_checker
+from .metrics import connect_celery_signals as connect_metrics_signals
+from .password_hashing import password_hasher
+from .profiling import connect_celery_signals as connect_profiling_signals
+from .query_tracking import connect_celery_signals as connect_query_tracking_signals
 
-celery = Celery("workload_radar")
+# Importing Celery costs about as much as the rest of the app together, and a
+# web worker only needs it when enqueueing a task, so the Celery app is built
+# on first use (get_celery, or ``from app.extensions import celery``).
+_celery = None
+_celery_lock = threading.Lock()
+_celery_flask_app: Flask | None = None
 
 
 def _bind_database(app: Flask) -> None:
@@ -37,27 +52,172 @@ def _bind_database(app: Flask) -> None:
             host=app.config["DB_HOST"],
             port=app.config["DB_PORT"],
             database=app.config["DB_NAME"],
+            connect_timeout=app.config["DB_CONNECT_TIMEOUT_SECONDS"],
         )
         # Tables must be created with migrations beforehand
         db.generate_mapping(create_tables=False)
 
+    install_query_hook(db)
+
+
+def _bind_replicas(app: Flask) -> None:
+    """
+    Bind one Pony database per configured read replica and register it
+    with the replica router. Idempotent, like the primary binding.
+    """
+    db_router.configure(
+        max_lag_seconds=app.config["DB_REPLICA_MAX_LAG_SECONDS"],
+        lag_check_interval=app.config["DB_REPLICA_LAG_CHECK_SECONDS"],
+        read_your_writes_seconds=app.config["DB_READ_YOUR_WRITES_SECONDS"],
+    )
+    if db_router.replicas:
+        return
+
+    provider = app.config["DB_PROVIDER"]
+
+    for index, target in enumerate(app.config.get("DB_REPLICAS") or []):
+        replica = Database()
+        define_entities(replica)
+
+        if provider == "sqlite":
+            replica.bind(provider="sqlite", filename=target, create_db=True)
+            replica.generate_mapping(create_tables=True)
+        else:
+            host, _, port = target.partition(":")
+            replica.bind(
+                provider=provider,
+                user=app.config["DB_USER"],
+                password=app.config["DB_PASSWORD"],
+                host=host,
+                port=int(port) if port else app.config["DB_PORT"],
+                database=app.config["DB_NAME"],
+                connect_timeout=app.config["DB_CONNECT_TIMEOUT_SECONDS"],
+            )
+            replica.generate_mapping(create_tables=False)
+
+        install_query_hook(replica)
+        db_router.add_replica(f"replica-{index}", replica)
+        app.logger.info("Read replica %s bound to %s", f"replica-{index}", target)
+
+
+def _register_write_tracking(app: Flask) -> None:
+    """Pin clients that just wrote to the primary (read-your-writes)."""
+
+    @app.after_request
+    def track_writes(response):
+        if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+            db_router.mark_write(response)
+        return response
+
+
+def get_flask_app() -> Flask:
+    """The Flask app Celery tasks run in, created on demand in worker processes."""
+    if _celery_flask_app is None:
+        from . import create_app
+
+        create_app()
+    return _celery_flask_app
+
+
+def get_celery():
+    """Return the shared Celery app, creating and configuring it on first use."""
+    global _celery
+    if _celery is not None:
+        return _celery
+
+    with _celery_lock:
+        if _celery is None:
+            from celery import Celery
+
+            celery_app = Celery("workload_radar")
+
+            class ContextTask(celery_app.Task):
+                """Task that runs inside Flask application context."""
+
+                def __call__(self, *args, **kwargs):
+                    with get_flask_app().app_context():
+                        return self.run(*args, **kwargs)
+
+            celery_app.Task = ContextTask
+            if _celery_flask_app is not None:
+                _apply_celery_config(celery_app, _celery_flask_app)
+            else:
+                from .config import Config
+
+                celery_app.conf.broker_url = Config.CELERY_BROKER_URL
+                celery_app.conf.result_backend = Config.CELERY_RESULT_BACKEND
+
+            connect_metrics_signals()
+            connect_profiling_signals()
+            connect_query_tracking_signals()
+            _celery = celery_app
+    return _celery
+
+
+def __getattr__(name: str):
+    # Keeps ``from app.extensions import celery`` working without eager creation.
+    if name == "celery":
+        return get_celery()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _apply_celery_config(celery_app, app: Flask) -> None:
+    celery_app.conf.broker_url = app.config["CELERY_BROKER_URL"]
+    celery_app.conf.result_backend = app.config["CELERY_RESULT_BACKEND"]
+
 
 def _configure_celery(app: Flask) -> None:
-    """Configure Celery to work with Flask application context."""
-    celery.conf.broker_url = app.config["CELERY_BROKER_URL"]
-    celery.conf.result_backend = app.config["CELERY_RESULT_BACKEND"]
+    """Make ``app`` the context for Celery tasks; the Celery app itself stays lazy."""
+    global _celery_flask_app
+    _celery_flask_app = app
+    if _celery is not None:
+        _apply_celery_config(_celery, app)
+
+
+def _configure_password_hashing(app: Flask) -> None:
+    """Size the password hashing pool from config."""
+    password_hasher.configure(
+        workers=app.config["PASSWORD_HASH_WORKERS"],
+        max_queue=app.config["PASSWORD_HASH_MAX_QUEUE"],
+        timeout=app.config["PASSWORD_HASH_TIMEOUT_SECONDS"],
+        method=app.config["PASSWORD_HASH_METHOD"],
+    )
 
-    class ContextTask(celery.Task):
-        """Task that runs inside Flask application context."""
 
-        def __call__(self, *args, **kwargs):
-            with app.app_context():
-                return self.run(*args, **kwargs)
+def _configure_analytics_queries(app: Flask) -> None:
+    """Size the DuckDB query pool from config; connections open on the first query."""
+    analytics_queries.configure(
+        data_dir=app.config["ANALYTICS_DATA_DIR"],
+        connections=app.config["ANALYTICS_QUERY_CONNECTIONS"],
+        threads=app.config["ANALYTICS_QUERY_THREADS"],
+        memory_limit=app.config["ANALYTICS_QUERY_MEMORY_LIMIT"],
+        timeout=app.config["ANALYTICS_QUERY_TIMEOUT_SECONDS"],
+        queue_timeout=app.config["ANALYTICS_QUERY_QUEUE_TIMEOUT_SECONDS"],
+        max_rows=app.config["ANALYTICS_QUERY_MAX_ROWS"],
+        cache_entries=app.config["ANALYTICS_QUERY_CACHE_ENTRIES"],
+    )
 
-    celery.Task = ContextTask
+
+def disconnect_databases() -> None:
+    """
+    Close this thread's connections to the primary and every replica.
+
+    The gunicorn master calls this after preloading the app so forked workers
+    never inherit an open socket; each worker connects lazily on its first
+    db_session instead.
+    """
+    db.disconnect()
+    for replica in db_router.replicas:
+        replica.database.disconnect()
 
 
 def init_extensions(app: Flask) -> None:
     """Initialize all integrations for the Flask app."""
     _bind_database(app)
+    _bind_replicas(app)
+    _register_write_tracking(app)
+    _configure_password_hashing(app)
+    _configure_analytics_queries(app)
+    init_auth(app)
+    health_checker.configure(app)
     _configure_celery(app)
@@ -0,0 +1,161 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from flask import Flask
+from pony.orm import db_session
+
+from .admission import admission
+from .db_routing import db_router
+from .models import db
+from .password_hashing import password_hasher
+
+logger = logging.getLogger(__name__)
+
+
+class HealthChecker:
+    """
+    Refresh dependency checks in the background and serve the cached result.
+
+    Probes only read ``snapshot()``, so they are O(1) and never wait on the
+    database or the broker. The checks carry their own timeouts (statement
+    and connect timeouts for the database, a connect timeout for the broker)
+    and additionally run concurrently, each on its own short-lived thread
+    joined with a deadline, so one slow dependency neither stalls the
+    refresh loop nor delays the other check. A check that overran its
+    deadline reports "timeout"; while that call is still stuck it is not
+    started again and reports "hung", and it recovers on the next refresh
+    after the call returns. The loop starts lazily on first use, i.e. inside
+    the serving process rather than a preloading parent.
+    """
+
+    def __init__(self) -> None:
+        self.interval = 5.0
+        self.timeout = 2.0
+        self.required_checks: List[str] = ["database"]
+        self.broker_url: str | None = None
+        self._snapshot: Dict[str, Any] | None = None
+        self._refreshed_at: float | None = None
+        self._thread: threading.Thread | None = None
+        # Check name -> thread of a call that overran its deadline.
+        self._stuck: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, app: Flask) -> None:
+        self.interval = app.config["HEALTH_CHECK_INTERVAL_SECONDS"]
+        self.timeout = app.config["HEALTH_CHECK_TIMEOUT_SECONDS"]
+        self.required_checks = list(app.config["READINESS_REQUIRED_CHECKS"])
+        self.broker_url = app.config["CELERY_BROKER_URL"]
+
+    def snapshot(self) -> Dict[str, Any] | None:
+        """Return the latest check results, or None before the first refresh."""
+        self._ensure_started()
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        age = time.monotonic() - self._refreshed_at
+        return {**snapshot, "age_seconds": round(age, 3), "stale": age > self.interval * 3}
+
+    def refresh(self) -> None:
+        """Run all checks once and publish the result."""
+        checks = self._run_checks({"database": self._check_database, "broker": self._check_broker})
+        ready = all(checks.get(name) == "ok" for name in self.required_checks)
+        self._snapshot = {
+            "status": "ok" if ready else "degraded",
+            "ready": ready,
+            "checks": checks,
+            "pools": self._pool_diagnostics(),
+            "checked_at": datetime.utcnow().isoformat(),
+        }
+        self._refreshed_at = time.monotonic()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._loop, name="health-checker", daemon=True)
+            self._thread.start()
+
+    def _loop(self) -> None:
+        while True:
+            if self._refreshed_at is not None:
+                elapsed = time.monotonic() - self._refreshed_at
+                time.sleep(max(self.interval - elapsed, 0))
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Health check refresh failed")
+                time.sleep(self.interval)
+
+    def _run_checks(self, checks: Dict[str, Callable[[], None]]) -> Dict[str, str]:
+        """Run ``checks`` concurrently; map each name to ok/failed/timeout/hung."""
+        results: Dict[str, str] = {}
+        threads: Dict[str, threading.Thread] = {}
+        for name, check in checks.items():
+            stuck = self._stuck.get(name)
+            if stuck is not None and stuck.is_alive():
+                results[name] = "hung"
+                continue
+            self._stuck.pop(name, None)
+            thread = threading.Thread(
+                target=self._run_check, args=(name, check, results), name=f"health-check-{name}", daemon=True
+            )
+            thread.start()
+            threads[name] = thread
+
+        deadline = time.monotonic() + self.timeout
+        for name, thread in threads.items():
+            thread.join(max(deadline - time.monotonic(), 0))
+            if thread.is_alive():
+                logger.warning("Health check %s did not finish within %.1fs", name, self.timeout)
+                self._stuck[name] = thread
+                results[name] = "timeout"
+        return {name: results[name] for name in checks}
+
+    @staticmethod
+    def _run_check(name: str, check: Callable[[], None], results: Dict[str, str]) -> None:
+        try:
+            check()
+        except Exception as exc:
+            logger.warning("Health check %s failed: %s", name, exc)
+            status = "failed"
+        else:
+            status = "ok"
+        # A call that overran its deadline has already been reported.
+        results.setdefault(name, status)
+
+    def _check_database(self) -> None:
+        with db_session:
+            if db.provider_name == "postgres":
+                db.execute(f"SET LOCAL statement_timeout = {max(int(self.timeout * 1000), 1)}")
+            list(db.select("SELECT 1"))
+
+    def _check_broker(self) -> None:
+        from kombu import Connection
+
+        with Connection(self.broker_url, connect_timeout=self.timeout) as conn:
+            conn.ensure_connection(max_retries=1, timeout=self.timeout)
+
+    @staticmethod
+    def _pool_diagnostics() -> Dict[str, Any]:
+        requests = admission.status()
+        for stats in requests.values():
+            limit = stats["limit"]
+            stats["saturation"] = round(stats["in_flight"] / limit, 3) if limit else None
+        hashing = password_hasher.stats()
+        return {
+            "requests": requests,
+            "password_hashing": {
+                "in_flight": hashing["in_flight"],
+                "queue_depth": hashing["queue_depth"],
+                "rejected_total": hashing["rejected_total"],
+            },
+            "replicas": db_router.status(),
+        }
+
+
+health_checker = HealthChecker()
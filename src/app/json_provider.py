@@ -0,0 +1,67 @@
+import dataclasses
+import decimal
+import uuid
+from datetime import date, datetime
+from typing import Any
+
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+from werkzeug.http import http_date
+
+
+def _default(obj: Any) -> Any:
+    """Types orjson leaves to us, converted the way Flask's default provider does."""
+    if isinstance(obj, date):
+        return http_date(obj)
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    JSON provider backed by orjson: encodes straight to bytes, several times
+    faster than the stdlib for the large lists and reports the API returns.
+
+    Output matches Flask's default provider: sorted keys, non-string keys
+    allowed, datetimes as HTTP dates. With ``iso_datetimes`` datetimes are
+    written natively as ISO 8601 instead, which is faster still but changes
+    the wire format for existing clients.
+    """
+
+    def __init__(self, app: Flask, iso_datetimes: bool = False) -> None:
+        import orjson
+
+        super().__init__(app)
+        self._orjson = orjson
+        self._options = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        if not iso_datetimes:
+            self._options |= orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj, default=_default, option=self._options)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self.dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return self._orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj) + b"\n", mimetype="application/json")
+
+
+def init_json(app: Flask) -> None:
+    """Install the JSON provider selected by JSON_PROVIDER ("orjson" or "default")."""
+    if app.config["JSON_PROVIDER"] == "orjson":
+        try:
+            app.json = OrjsonProvider(app, iso_datetimes=app.config["JSON_ISO_DATETIMES"])
+            return
+        except ImportError:
+            app.logger.warning("orjson is not installed; using Flask's default JSON provider")
+    app.json = DefaultJSONProvider(app)
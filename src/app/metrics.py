@@ -0,0 +1,209 @@
+import os
+import resource
+import time
+from typing import Dict
+
+from flask import Flask, Response, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from pony.orm import Database
+
+from .db_instrumentation import add_query_listener, current_repository_method
+
+# All metrics are process-local objects. When PROMETHEUS_MULTIPROC_DIR is set
+# (gunicorn with several workers), prometheus_client backs them with mmap files
+# in that directory and /metrics aggregates across all worker processes.
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by endpoint and status.",
+    ["method", "endpoint", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement latency by originating repository method.",
+    ["source"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+
+CELERY_TASK_QUEUE_WAIT = Histogram(
+    "celery_task_queue_wait_seconds",
+    "Time between publishing a task and a worker starting it.",
+    ["task"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0),
+)
+
+CELERY_TASK_RUNTIME = Histogram(
+    "celery_task_runtime_seconds",
+    "Celery task run time by final state.",
+    ["task", "state"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0),
+)
+
+ANALYTICS_STAGE_DURATION = Histogram(
+    "analytics_stage_duration_seconds",
+    "Offline analytics pipeline stage duration.",
+    ["stage"],
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0),
+)
+
+ANALYTICS_STAGE_ROWS = Gauge(
+    "analytics_stage_rows",
+    "Rows produced by the last run of each analytics stage.",
+    ["stage"],
+    multiprocess_mode="mostrecent",
+)
+
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "Password hash/verify latency including queueing.",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth",
+    "Password hashing jobs waiting for a pool process.",
+    multiprocess_mode="livesum",
+)
+
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total",
+    "Password hashing jobs rejected because the queue was full.",
+)
+
+DATASET_REFRESH_DURATION = Histogram(
+    "dataset_refresh_duration_seconds",
+    "Scheduled derived dataset refresh duration by outcome.",
+    ["dataset", "status"],
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0),
+)
+
+PROJECT_DASHBOARD_DURATION = Histogram(
+    "project_dashboard_duration_seconds",
+    "Project dashboard latency by cache outcome.",
+    ["cache"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+ANALYTICS_QUERY_DURATION = Histogram(
+    "analytics_query_duration_seconds",
+    "Ad-hoc analytics query latency by dataset and outcome (hit, miss, timeout, error).",
+    ["dataset", "outcome"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+WORKER_STARTUP_SECONDS = Histogram(
+    "gunicorn_worker_startup_seconds",
+    "Time from fork to a gunicorn worker being ready to serve.",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+WORKER_MEMORY_BYTES = Gauge(
+    "gunicorn_worker_memory_bytes",
+    "Worker memory: rss, pss (shared pages split across sharers) and private.",
+    ["kind"],
+    multiprocess_mode="liveall",
+)
+
+
+def read_process_memory() -> Dict[str, int]:
+    """
+    RSS, PSS and private bytes of this process from /proc/self/smaps_rollup.
+
+    With a preloaded app, ``private`` is what a worker really costs; the rest
+    of its RSS is shared copy-on-write with the master. Falls back to peak RSS
+    where /proc is unavailable.
+    """
+    fields = {"Rss": 0, "Pss": 0, "Private_Clean": 0, "Private_Dirty": 0}
+    try:
+        with open("/proc/self/smaps_rollup", encoding="ascii") as fh:
+            for line in fh:
+                key, _, rest = line.partition(":")
+                if key in fields:
+                    fields[key] = int(rest.split()[0]) * 1024
+    except OSError:
+        return {"rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024}
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "private": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def record_process_memory() -> Dict[str, int]:
+    memory = read_process_memory()
+    for kind, value in memory.items():
+        WORKER_MEMORY_BYTES.labels(kind=kind).set(value)
+    return memory
+
+
+def observe_query(database: Database, sql: str, duration: float) -> None:
+    DB_QUERY_DURATION.labels(source=current_repository_method.get() or "unattributed").observe(duration)
+
+
+def render_metrics() -> Response:
+    """Render metrics for this process, or for all processes in multiprocess mode."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        payload = generate_latest(registry)
+    else:
+        payload = generate_latest()
+    return Response(payload, mimetype=CONTENT_TYPE_LATEST)
+
+
+def _stamp_enqueue_time(headers=None, **kwargs):
+    if headers is not None:
+        headers.setdefault("enqueued_at", time.time())
+
+
+def _task_started(task=None, **kwargs):
+    started = time.time()
+    task.request.metrics_started_at = started
+    enqueued_at = getattr(task.request, "enqueued_at", None)
+    if enqueued_at:
+        CELERY_TASK_QUEUE_WAIT.labels(task=task.name).observe(max(started - float(enqueued_at), 0))
+
+
+def _task_finished(task=None, state=None, **kwargs):
+    started = getattr(task.request, "metrics_started_at", None)
+    if started is not None:
+        CELERY_TASK_RUNTIME.labels(task=task.name, state=state or "UNKNOWN").observe(time.time() - started)
+
+
+def connect_celery_signals() -> None:
+    """Hook task timing into Celery; called when the Celery app is created."""
+    from celery.signals import before_task_publish, task_postrun, task_prerun
+
+    before_task_publish.connect(_stamp_enqueue_time)
+    task_prerun.connect(_task_started)
+    task_postrun.connect(_task_finished)
+
+
+def init_metrics(app: Flask) -> None:
+    """Install request timing hooks and the SQL listener."""
+    add_query_listener(observe_query)
+
+    @app.before_request
+    def start_timer():
+        g.metrics_started_at = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop("metrics_started_at", None)
+        if started is not None:
+            HTTP_REQUEST_DURATION.labels(
+                method=request.method,
+                endpoint=request.endpoint or "unmatched",
+                status=str(response.status_code),
+            ).observe(time.perf_counter() - started)
+        return response
@@ -1,74 +1,150 @@
 from datetime import datetime
 from pony.orm import Database, PrimaryKey, Required, Optional, Set, Json
 
-# Single shared database instance
+# Single shared database instance (primary)
 db = Database()
 
 
-class User(db.Entity):
-    """System user."""
-    _table_ = "users"
-
-    id = PrimaryKey(int, auto=True)
-    email = Required(str, unique=True)
-    name = Required(str)
-    password_hash = Required(str)
-    created_at = Required(datetime, default=datetime.utcnow)
-
-    projects = Set("Project")
-    tasks = Set("Task", reverse="assignee")
-
-
-class Project(db.Entity):
-    """Project entity representing a logical work container."""
-    _table_ = "projects"
-
-    id = PrimaryKey(int, auto=True)
-    name = Required(str)
-    owner = Required(User)
-    created_at = Required(datetime, default=datetime.utcnow)
-
-    tasks = Set("Task")
-    reports = Set("Report")
-
-
-class Task(db.Entity):
-    """Work task belonging to a project."""
-    _table_ = "tasks"
-
-    id = PrimaryKey(int, auto=True)
-    project = Required(Project)
-    title = Required(str)
-    description = Optional(str)
-    status = Required(str, default="todo")  # "todo" | "in_progress" | "done"
-    priority = Required(int, default=2)     # 1-high, 2-normal, 3-low
-    assignee = Optional(User)
-    created_at = Required(datetime, default=datetime.utcnow)
-    done_at = Optional(datetime)
-
-    events = Set("TaskEvent")
-
-
-class TaskEvent(db.Entity):
-    """Event generated when a task changes state or receives updates."""
-    _table_ = "task_events"
-
-    id = PrimaryKey(int, auto=True)
-    task = Required(Task)
-    type = Required(str)        # "created" | "status_change" | "comment" | ...
-    payload = Optional(Json)    # Additional event details
-    created_at = Required(datetime, default=datetime.utcnow)
-
-
-class Report(db.Entity):
-    """Analytical report for a project."""
-    _table_ = "reports"
-
-    id = PrimaryKey(int, auto=True)
-    project = Required(Project)
-    type = Required(str)        # "daily_summary" | "custom_range" | ...
-    params = Optional(Json)     # Filter parameters
-    status = Required(str, default="pending")  # "pending" | "ready" | "failed"
-    result = Optional(Json)     # Computed metrics
-    created_at = Required(datetime, default=datetime.utcnow)
-    finished_at = Optional(datetime)
+def define_entities(database: Database) -> None:
+    """
+    Declare all entities on the given Pony database.
+
+    The primary ``db`` gets its entities at import time; read replicas are
+    separate Database objects that need the very same mapping, so the
+    declarations live in a function that can be applied to each of them.
+    """
+
+    class User(database.Entity):
+        """System user."""
+        _table_ = "users"
+
+        id = PrimaryKey(int, auto=True)
+        email = Required(str, unique=True)
+        name = Required(str)
+        password_hash = Required(str)
+        created_at = Required(datetime, default=datetime.utcnow)
+
+        projects = Set("Project")
+        tasks = Set("Task", reverse="assignee")
+
+    class Project(database.Entity):
+        """Project entity representing a logical work container."""
+        _table_ = "projects"
+
+        id = PrimaryKey(int, auto=True)
+        name = Required(str)
+        owner = Required(User)
+        created_at = Required(datetime, default=datetime.utcnow)
+        # Bumped whenever the project's tasks or reports change; keys cached dashboards.
+        version = Required(int, default=0)
+
+        tasks = Set("Task")
+        reports = Set("Report")
+
+    class Task(database.Entity):
+        """Work task belonging to a project."""
+        _table_ = "tasks"
+
+        id = PrimaryKey(int, auto=True)
+        project = Required(Project)
+        title = Required(str)
+        description = Optional(str)
+        status = Required(str, default="todo")  # "todo" | "in_progress" | "done"
+        priority = Required(int, default=2)     # 1-high, 2-normal, 3-low
+        assignee = Optional(User)
+        created_at = Required(datetime, default=datetime.utcnow)
+        done_at = Optional(datetime)
+
+        events = Set("TaskEvent")
+
+    class TaskEvent(database.Entity):
+        """Event generated when a task changes state or receives updates."""
+        _table_ = "task_events"
+
+        id = PrimaryKey(int, auto=True)
+        task = Required(Task)
+        type = Required(str)        # "created" | "status_change" | "comment" | ...
+        payload = Optional(Json)    # Additional event details
+        created_at = Required(datetime, default=datetime.utcnow)
+
+    class Report(database.Entity):
+        """Analytical report for a project."""
+        _table_ = "reports"
+
+        id = PrimaryKey(int, auto=True)
+        project = Required(Project)
+        type = Required(str)        # "daily_summary" | "custom_range" | ...
+        params = Optional(Json)     # Filter parameters
+        status = Required(str, default="pending")  # "pending" | "ready" | "failed"
+        result = Optional(Json)     # Computed metrics
+        created_at = Required(datetime, default=datetime.utcnow)
+        finished_at = Optional(datetime)
+
+    class RevokedToken(database.Entity):
+        """Auth token revoked before its natural expiry."""
+        _table_ = "revoked_tokens"
+
+        jti = PrimaryKey(str)
+        expires_at = Required(datetime)
+        created_at = Required(datetime, default=datetime.utcnow)
+
+    class AssigneeWorkload(database.Entity):
+        """
+        Open work and recent throughput of one assignee in one project.
+
+        A materialized view on PostgreSQL, a summary table elsewhere; both
+        are maintained by the workload refresh job, never written through Pony.
+        """
+        _table_ = "assignee_workload"
+
+        assignee = Required(int)
+        project = Required(int)
+        PrimaryKey(assignee, project)
+        todo = Required(int)
+        in_progress = Required(int)
+        open_p1 = Required(int)
+        open_p2 = Required(int)
+        open_p3 = Required(int)
+        oldest_wip_started_at = Optional(datetime)
+        done_recent = Required(int)  # done within WORKLOAD_THROUGHPUT_DAYS
+
+    class WorkloadRefresh(database.Entity):
+        """Bookkeeping of the last workload refresh (a single row)."""
+        _table_ = "workload_refresh"
+
+        name = PrimaryKey(str)
+        refreshed_at = Required(datetime)
+        full_refreshed_at = Required(datetime)
+        last_event_id = Required(int)
+        mode = Required(str)  # "full" | "incremental" | "skipped"
+        duration_ms = Required(float)
+
+    class DatasetRefresh(database.Entity):
+        """Status and lease lock of one scheduled derived dataset (see app.scheduling)."""
+        _table_ = "dataset_refresh"
+
+        name = PrimaryKey(str)
+        status = Required(str, default="never")  # "never" | "running" | "success" | "skipped" | "failed"
+        last_started_at = Optional(datetime)
+        last_finished_at = Optional(datetime)
+        last_success_at = Optional(datetime)  # start of the last successful run: data is as of then
+        last_duration_ms = Optional(float)
+        last_error = Optional(str, nullable=True)
+        source_watermark = Optional(int, size=64)
+        runs = Required(int, default=0)
+        consecutive_failures = Required(int, default=0)
+        locked_by = Optional(str, nullable=True)
+        locked_until = Optional(datetime)
+
+
+define_entities(db)
+
+User = db.User
+Project = db.Project
+Task = db.Task
+TaskEvent = db.TaskEvent
+Report = db.Report
+RevokedToken = db.RevokedToken
+AssigneeWorkload = db.AssigneeWorkload
+WorkloadRefresh = db.WorkloadRefresh
+DatasetRefresh = db.DatasetRefresh
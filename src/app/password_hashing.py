@@ -0,0 +1,151 @@
+import atexit
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from .exceptions import ServiceUnavailableError
+from .metrics import PASSWORD_HASH_DURATION, PASSWORD_HASH_QUEUE_DEPTH, PASSWORD_HASH_REJECTED
+
+logger = logging.getLogger(__name__)
+
+
+def stored_method(method: str) -> str:
+    """
+    The method prefix werkzeug stores in hashes made with ``method``, with
+    its defaults spelled out (``scrypt`` becomes ``scrypt:32768:8:1``).
+
+    Found by hashing a fixed probe rather than by parsing, so it matches
+    whatever werkzeug writes for any accepted form; an invalid method raises
+    ValueError here instead of on the first registration.
+    """
+    return generate_password_hash("probe", method).split("$", 1)[0]
+
+
+class PasswordHasher:
+    """
+    Run password hashing on a bounded process pool.
+
+    Hashing is deliberately CPU-expensive; doing it inline blocks a web worker
+    for the whole computation. Work is handed to a small process pool instead,
+    and at most ``workers + max_queue`` jobs may be in flight per web worker.
+    Further calls are rejected with a 503 so a login burst cannot starve the
+    other endpoints. With ``workers=0`` hashing runs inline (dev server, tests).
+    """
+
+    def __init__(self) -> None:
+        self.workers = 0
+        self.max_queue = 0
+        self.timeout = 5.0
+        self.method = "scrypt:32768:8:1"
+        self._executor: ProcessPoolExecutor | None = None
+        self._slots: threading.BoundedSemaphore | None = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._rejected = 0
+        self._latency_count = 0
+        self._latency_sum = 0.0
+        self._latency_max = 0.0
+
+    def configure(self, workers: int, max_queue: int, timeout: float, method: str) -> None:
+        self.shutdown()
+        self.workers = max(workers, 0)
+        self.max_queue = max(max_queue, 0)
+        self.timeout = timeout
+        self.method = stored_method(method)
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue) if self.workers else None
+
+    def hash(self, password: str) -> str:
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """True when the hash was produced with other parameters than the configured ones."""
+        return password_hash.split("$", 1)[0] != self.method
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "in_flight": self._in_flight,
+                "queue_depth": max(self._in_flight - self.workers, 0),
+                "rejected_total": self._rejected,
+                "hash_count": self._latency_count,
+                "hash_seconds_sum": self._latency_sum,
+                "hash_seconds_max": self._latency_max,
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        started = time.perf_counter()
+        if not self.workers:
+            try:
+                return func(*args)
+            finally:
+                self._observe(time.perf_counter() - started)
+
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            PASSWORD_HASH_REJECTED.inc()
+            logger.warning("Password hashing queue full; rejecting request")
+            raise ServiceUnavailableError("Authentication is busy, retry shortly", retry_after=1)
+
+        with self._lock:
+            self._in_flight += 1
+            PASSWORD_HASH_QUEUE_DEPTH.set(max(self._in_flight - self.workers, 0))
+        try:
+            future: Future = self._get_executor().submit(func, *args)
+        except BaseException:
+            self._release_slot(slots)
+            raise
+        # A job that already started can't be cancelled on timeout, so the
+        # slot is held until the pool has actually finished with it.
+        future.add_done_callback(lambda _: self._release_slot(slots))
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise ServiceUnavailableError("Authentication timed out, retry shortly", retry_after=1)
+        finally:
+            self._observe(time.perf_counter() - started)
+
+    def _release_slot(self, slots: threading.BoundedSemaphore) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            PASSWORD_HASH_QUEUE_DEPTH.set(max(self._in_flight - self.workers, 0))
+        slots.release()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created lazily so the pool is started in the serving process
+        # (after any gunicorn fork), never in a preloading master.
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+        return self._executor
+
+    def _observe(self, seconds: float) -> None:
+        PASSWORD_HASH_DURATION.observe(seconds)
+        with self._lock:
+            self._latency_count += 1
+            self._latency_sum += seconds
+            self._latency_max = max(self._latency_max, seconds)
+
+
+password_hasher = PasswordHasher()
+atexit.register(password_hasher.shutdown)
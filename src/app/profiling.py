@@ -0,0 +1,124 @@
+import cProfile
+import hmac
+import logging
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict
+
+from flask import Flask, current_app, g, request
+
+logger = logging.getLogger(__name__)
+
+# Celery tasks have no app config at signal time; init_profiling fills this in.
+_celery_settings: Dict[str, Any] = {"tasks": set(), "dir": None}
+
+_UNSAFE_CHARS_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+# Only one cProfile profiler can be active per process (on Python 3.12 it
+# uses the process-wide sys.monitoring); overlapping requests skip profiling.
+_profiler_slot = threading.Lock()
+
+
+def _start_profiler() -> cProfile.Profile | None:
+    """Enable a profiler, or return None when another one is already running."""
+    if not _profiler_slot.acquire(blocking=False):
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Some other tool (a debugger, coverage, ...) holds the profiling hook.
+        _profiler_slot.release()
+        return None
+    return profiler
+
+
+def _stop_profiler(profiler: cProfile.Profile) -> None:
+    try:
+        profiler.disable()
+    finally:
+        _profiler_slot.release()
+
+
+def _should_profile_request() -> bool:
+    cfg = current_app.config
+    token = cfg["PROFILE_HEADER_TOKEN"]
+    header = request.headers.get("X-Profile")
+    if token and header and hmac.compare_digest(header, token):
+        return True
+    rate = cfg["PROFILE_SAMPLE_RATE"]
+    return rate > 0 and random.random() < rate
+
+
+def write_profile(profiler: cProfile.Profile, directory: str, label: str, duration: float) -> Path:
+    """Dump pstats output as <timestamp>_<label>_<ms>ms_<pid>.prof."""
+    base_dir = Path(directory)
+    base_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+    safe_label = _UNSAFE_CHARS_RE.sub("_", label).strip("_") or "root"
+    path = base_dir / f"{timestamp}_{safe_label}_{int(duration * 1000)}ms_{os.getpid()}.prof"
+    profiler.dump_stats(str(path))
+    logger.info("Wrote profile %s", path)
+    return path
+
+
+def _task_started(task=None, **kwargs):
+    if task.name in _celery_settings["tasks"]:
+        profiler = _start_profiler()
+        if profiler is not None:
+            task.request.profiler = (profiler, time.perf_counter())
+
+
+def _task_finished(task=None, **kwargs):
+    started = getattr(task.request, "profiler", None)
+    if started is None:
+        return
+    task.request.profiler = None
+    profiler, started_at = started
+    _stop_profiler(profiler)
+    write_profile(profiler, _celery_settings["dir"], task.name, time.perf_counter() - started_at)
+
+
+def connect_celery_signals() -> None:
+    """Hook into Celery task start/finish; called when the Celery app is created."""
+    from celery.signals import task_postrun, task_prerun
+
+    task_prerun.connect(_task_started)
+    task_postrun.connect(_task_finished)
+
+
+def init_profiling(app: Flask) -> None:
+    """
+    Profile a sampled fraction of requests, or any request carrying
+    ``X-Profile: <PROFILE_HEADER_TOKEN>``, and every run of the Celery tasks
+    in PROFILE_CELERY_TASKS. When disabled the cost is one config lookup
+    per request. Only one profile runs at a time per process; a request
+    sampled while another is being profiled simply runs unprofiled.
+    """
+    _celery_settings["tasks"] = set(app.config["PROFILE_CELERY_TASKS"])
+    _celery_settings["dir"] = app.config["PROFILE_DIR"]
+
+    @app.before_request
+    def start_profile():
+        if _should_profile_request():
+            profiler = _start_profiler()
+            if profiler is not None:
+                g.profiler = (profiler, time.perf_counter())
+
+    @app.teardown_request
+    def finish_profile(exc):
+        started = g.pop("profiler", None)
+        if started is None:
+            return
+        profiler, started_at = started
+        _stop_profiler(profiler)
+        label = f"{request.method}_{request.endpoint or request.path}"
+        try:
+            write_profile(profiler, current_app.config["PROFILE_DIR"], label, time.perf_counter() - started_at)
+        except OSError:
+            logger.exception("Failed to write request profile")
@@ -0,0 +1,193 @@
+import logging
+import os
+import re
+import sys
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Tuple
+
+from flask import Flask, current_app, g, request
+from pony.orm import Database
+
+from .db_instrumentation import add_query_listener
+
+logger = logging.getLogger(__name__)
+
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+_SKIP_FILES = {
+    os.path.join(_APP_DIR, "query_tracking.py"),
+    os.path.join(_APP_DIR, "db_instrumentation.py"),
+}
+
+# Logs currently collecting statements; nested scopes (a test helper around a
+# request, a request inside a Celery task) each get every statement.
+_active_logs: ContextVar[Tuple["QueryLog", ...]] = ContextVar("active_query_logs", default=())
+
+# Celery tasks have no app config at signal time; init_query_tracking fills this in.
+_celery_settings: Dict[str, Any] = {"enabled": False, "n_plus_one_threshold": 5}
+
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def query_shape(sql: str) -> str:
+    """Normalize a statement so queries differing only in literals compare equal."""
+    return _WHITESPACE_RE.sub(" ", _LITERAL_RE.sub("?", sql)).strip()
+
+
+class QueryLog:
+    """SQL statements executed within one request, Celery task or test block."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.queries: List[Dict[str, Any]] = []
+        # Bumped by mark_poll(): repeats are only counted within one poll.
+        self.poll = 0
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(q["duration"] for q in self.queries)
+
+    def record(self, sql: str, duration: float, call_site: str) -> None:
+        self.queries.append({"sql": sql, "duration": duration, "call_site": call_site, "poll": self.poll})
+
+    def repeated_shapes(self, threshold: int) -> List[Tuple[str, int]]:
+        """
+        Query shapes executed at least ``threshold`` times (likely N+1 patterns)
+        within a single poll of a long-polling loop.
+        """
+        per_poll = Counter((q["poll"], query_shape(q["sql"])) for q in self.queries)
+        counts: Counter = Counter()
+        for (_, shape), n in per_poll.items():
+            counts[shape] = max(counts[shape], n)
+        return [(shape, n) for shape, n in counts.most_common() if n >= threshold]
+
+    def describe(self) -> str:
+        lines = [f"{self.count} queries in {self.total_seconds * 1000:.1f} ms for {self.name}:"]
+        for q in self.queries:
+            lines.append(f"  [{q['duration'] * 1000:.2f} ms] {q['call_site']}: {_WHITESPACE_RE.sub(' ', q['sql'])}")
+        return "\n".join(lines)
+
+
+def _call_site() -> str:
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APP_DIR) and filename not in _SKIP_FILES:
+            relative = os.path.relpath(filename, _APP_DIR)
+            return f"{relative}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "<unknown>"
+
+
+def record_query(database: Database, sql: str, duration: float) -> None:
+    logs = _active_logs.get()
+    if not logs:
+        return
+    call_site = _call_site()
+    for log in logs:
+        log.record(sql, duration, call_site)
+
+
+def mark_poll() -> None:
+    """
+    Start a new poll in every active log. Long-polling loops call this
+    before each re-check, so repeating one read per poll is not taken for N+1.
+    """
+    for log in _active_logs.get():
+        log.poll += 1
+
+
+def start_log(name: str) -> QueryLog:
+    log = QueryLog(name)
+    _active_logs.set(_active_logs.get() + (log,))
+    return log
+
+
+def stop_log(log: QueryLog) -> None:
+    _active_logs.set(tuple(active for active in _active_logs.get() if active is not log))
+
+
+@contextmanager
+def track_queries(name: str = "block") -> Iterator[QueryLog]:
+    """Collect every SQL statement executed inside the block."""
+    log = start_log(name)
+    try:
+        yield log
+    finally:
+        stop_log(log)
+
+
+def report(log: QueryLog, n_plus_one_threshold: int) -> None:
+    """Log totals at debug level and warn about repeated query shapes."""
+    logger.debug(
+        "%s executed %d queries in %.1f ms",
+        log.name,
+        log.count,
+        log.total_seconds * 1000,
+    )
+    for shape, count in log.repeated_shapes(n_plus_one_threshold):
+        sites = sorted({q["call_site"] for q in log.queries if query_shape(q["sql"]) == shape})
+        logger.warning(
+            "Possible N+1 in %s: %d executions of %s (from %s)",
+            log.name,
+            count,
+            shape,
+            ", ".join(sites),
+        )
+
+
+def _task_started(task=None, **kwargs):
+    if _celery_settings["enabled"]:
+        task.request.query_log = start_log(f"task {task.name}")
+
+
+def _task_finished(task=None, **kwargs):
+    log = getattr(task.request, "query_log", None)
+    if log is not None:
+        stop_log(log)
+        report(log, _celery_settings["n_plus_one_threshold"])
+
+
+def connect_celery_signals() -> None:
+    """Hook into Celery task start/finish; called when the Celery app is created."""
+    from celery.signals import task_postrun, task_prerun
+
+    task_prerun.connect(_task_started)
+    task_postrun.connect(_task_finished)
+
+
+def init_query_tracking(app: Flask) -> None:
+    """
+    Track SQL per request (and per Celery task) when SQL_TRACKING_ENABLED.
+
+    Tracked responses carry X-DB-Query-Count and X-DB-Query-Time-Ms headers.
+    """
+    _celery_settings["enabled"] = app.config["SQL_TRACKING_ENABLED"]
+    _celery_settings["n_plus_one_threshold"] = app.config["SQL_N_PLUS_ONE_THRESHOLD"]
+    add_query_listener(record_query)
+
+    @app.before_request
+    def start_request_log():
+        if current_app.config["SQL_TRACKING_ENABLED"]:
+            g.query_log = start_log(f"{request.method} {request.path}")
+
+    @app.after_request
+    def add_query_headers(response):
+        log = g.get("query_log")
+        if log is not None:
+            response.headers["X-DB-Query-Count"] = str(log.count)
+            response.headers["X-DB-Query-Time-Ms"] = f"{log.total_seconds * 1000:.2f}"
+        return response
+
+    @app.teardown_request
+    def finish_request_log(exc):
+        log = g.pop("query_log", None)
+        if log is not None:
+            stop_log(log)
+            report(log, current_app.config["SQL_N_PLUS_ONE_THRESHOLD"])
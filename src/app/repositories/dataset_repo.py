@@ -0,0 +1,83 @@
+from datetime import datetime
+from typing import Dict, Optional
+from pony.orm import TransactionIntegrityError, commit, select
+from ..db_instrumentation import instrument_repository
+from ..models import DatasetRefresh, db
+
+
+@instrument_repository
+class DatasetRefreshRepository:
+    """Status rows and lease locks of scheduled derived datasets."""
+
+    def ensure(self, name: str) -> None:
+        if DatasetRefresh.get(name=name) is not None:
+            return
+        try:
+            DatasetRefresh(name=name)
+            commit()
+        except TransactionIntegrityError:
+            pass  # created by a concurrent run
+
+    def acquire_lease(self, name: str, token: str, now: datetime, until: datetime) -> bool:
+        """Claim the dataset unless another run holds an unexpired lease."""
+        cursor = db.execute(
+            """
+            UPDATE dataset_refresh
+            SET locked_by = $token, locked_until = $until, status = 'running', last_started_at = $now
+            WHERE name = $name AND (locked_until IS NULL OR locked_until < $now)
+            """,
+            {"token": token, "until": until, "now": now, "name": name},
+        )
+        return cursor.rowcount == 1
+
+    def record_success(
+        self,
+        name: str,
+        status: str,
+        started_at: datetime,
+        finished_at: datetime,
+        duration_ms: float,
+        watermark: Optional[int],
+    ) -> None:
+        db.execute(
+            """
+            UPDATE dataset_refresh
+            SET status = $status, last_finished_at = $finished_at, last_success_at = $started_at,
+                last_duration_ms = $duration_ms, last_error = NULL, runs = runs + 1, consecutive_failures = 0,
+                source_watermark = COALESCE($watermark, source_watermark)
+            WHERE name = $name
+            """,
+            {
+                "status": status,
+                "finished_at": finished_at,
+                "started_at": started_at,
+                "duration_ms": duration_ms,
+                "watermark": watermark,
+                "name": name,
+            },
+        )
+
+    def record_failure(self, name: str, finished_at: datetime, duration_ms: float, error: str) -> None:
+        db.execute(
+            """
+            UPDATE dataset_refresh
+            SET status = 'failed', last_finished_at = $finished_at, last_duration_ms = $duration_ms,
+                last_error = $error, runs = runs + 1, consecutive_failures = consecutive_failures + 1
+            WHERE name = $name
+            """,
+            {"finished_at": finished_at, "duration_ms": duration_ms, "error": error, "name": name},
+        )
+
+    def release_lease(self, name: str, token: str) -> None:
+        # Only our own lease: if it expired mid-run, another run may hold it now.
+        db.execute(
+            "UPDATE dataset_refresh SET locked_by = NULL, locked_until = NULL WHERE name = $name AND locked_by = $token",
+            {"name": name, "token": token},
+        )
+
+    def get_watermark(self, name: str) -> Optional[int]:
+        row = DatasetRefresh.get(name=name)
+        return row.source_watermark if row is not None else None
+
+    def all_by_name(self) -> Dict[str, DatasetRefresh]:
+        return {row.name: row for row in select(r for r in DatasetRefresh)}
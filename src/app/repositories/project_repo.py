@@ -1,8 +1,83 @@
-from typing import Iterable, Optional
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
 from pony.orm import select
-from ..models import Project, User
+from ..db_routing import current_db
+from ..db_instrumentation import instrument_repository
+from ..models import Project, User, db
 
+# Lead time in seconds of a done task, per provider.
+_LEAD_TIME_SECONDS = {
+    "postgres": "EXTRACT(EPOCH FROM (done_at - created_at))",
+    "sqlite": "(julianday(done_at) - julianday(created_at)) * 86400.0",
+}
 
+# Every section of the dashboard in one statement. Rows share a generic shape:
+#   section, key, label, detail, n, x, y, z, t1, t2, body
+# status      key=status                 n=tasks
+# wip         key=assignee, label=name   n=in progress, x=open
+# throughput  key=done date              n=tasks done
+# lead_time                              n=tasks, x/y/z=avg/min/max seconds
+# report      key=id, label=type, detail=status, t1/t2=created/finished, body=result
+_DASHBOARD_SQL = """
+    WITH project_tasks AS (
+        SELECT status, assignee, created_at, done_at FROM tasks WHERE project = $project_id
+    ),
+    status_counts AS (
+        SELECT status, COUNT(*) AS n FROM project_tasks GROUP BY status
+    ),
+    wip AS (
+        SELECT t.assignee, u.name,
+               SUM(CASE WHEN t.status = 'in_progress' THEN 1 ELSE 0 END) AS in_progress,
+               COUNT(*) AS open_tasks
+        FROM project_tasks t LEFT JOIN users u ON u.id = t.assignee
+        WHERE t.status <> 'done'
+        GROUP BY t.assignee, u.name
+    ),
+    throughput AS (
+        SELECT date(done_at) AS day, COUNT(*) AS n
+        FROM project_tasks
+        WHERE status = 'done' AND done_at >= $throughput_since
+        GROUP BY date(done_at)
+    ),
+    lead_time AS (
+        SELECT {lead_time} AS seconds
+        FROM project_tasks
+        WHERE status = 'done' AND done_at >= $lead_time_since
+    ),
+    latest_report AS (
+        SELECT id, type, status, created_at, finished_at, result
+        FROM reports WHERE project = $project_id
+        ORDER BY created_at DESC, id DESC
+        LIMIT 1
+    )
+    SELECT 'status', status, CAST(NULL AS TEXT), CAST(NULL AS TEXT), CAST(n AS BIGINT),
+           CAST(NULL AS DOUBLE PRECISION), CAST(NULL AS DOUBLE PRECISION), CAST(NULL AS DOUBLE PRECISION),
+           CAST(NULL AS TEXT), CAST(NULL AS TEXT), CAST(NULL AS TEXT)
+    FROM status_counts
+    UNION ALL
+    SELECT 'wip', CAST(assignee AS TEXT), name, NULL, CAST(in_progress AS BIGINT),
+           CAST(open_tasks AS DOUBLE PRECISION), NULL, NULL, NULL, NULL, NULL
+    FROM wip
+    UNION ALL
+    SELECT 'throughput', CAST(day AS TEXT), NULL, NULL, CAST(n AS BIGINT), NULL, NULL, NULL, NULL, NULL, NULL
+    FROM throughput
+    UNION ALL
+    SELECT 'lead_time', NULL, NULL, NULL, CAST(COUNT(*) AS BIGINT),
+           CAST(AVG(seconds) AS DOUBLE PRECISION), CAST(MIN(seconds) AS DOUBLE PRECISION),
+           CAST(MAX(seconds) AS DOUBLE PRECISION), NULL, NULL, NULL
+    FROM lead_time
+    UNION ALL
+    SELECT 'report', CAST(id AS TEXT), type, status, NULL, NULL, NULL, NULL,
+           CAST(created_at AS TEXT), CAST(finished_at AS TEXT), CAST(result AS TEXT)
+    FROM latest_report
+"""
+
+DashboardRow = Tuple[str, Optional[str], Optional[str], Optional[str], Optional[int],
+                     Optional[float], Optional[float], Optional[float],
+                     Optional[str], Optional[str], Optional[str]]
+
+
+@instrument_repository
 class ProjectRepository:
     """Persistence operations for Project entity."""
 
@@ -11,8 +86,25 @@ class ProjectRepository:
         return project
 
     def get(self, project_id: int) -> Optional[Project]:
-        return Project.get(id=project_id)
+        return current_db().Project.get(id=project_id)
 
     def list_for_owner(self, owner: User, limit: int, offset: int) -> Iterable[Project]:
-        query = select(p for p in Project if p.owner == owner).order_by(lambda p: p.id)
+        projects = current_db().Project
+        query = select(p for p in projects if p.owner == owner).order_by(lambda p: p.id)
         return query.limit(limit, offset=offset)[:]
+
+    def bump_version(self, project_id: int) -> None:
+        """Invalidate cached dashboards of a project (atomic, no optimistic check)."""
+        db.execute("UPDATE projects SET version = version + 1 WHERE id = $project_id", {"project_id": project_id})
+
+    def dashboard_rows(
+        self,
+        project_id: int,
+        throughput_since: datetime,
+        lead_time_since: datetime,
+    ) -> List[DashboardRow]:
+        database = current_db()
+        sql = _DASHBOARD_SQL.format(lead_time=_LEAD_TIME_SECONDS[database.provider_name])
+        params = {"project_id": project_id, "throughput_since": throughput_since, "lead_time_since": lead_time_since}
+        # select() would prefix a statement starting with WITH by "select"
+        return database.execute(sql, params).fetchall()
@@ -1,7 +1,10 @@
 from typing import Optional
+from ..db_routing import current_db
+from ..db_instrumentation import instrument_repository
 from ..models import Report, Project
 
 
+@instrument_repository
 class ReportRepository:
     """Persistence operations for Report entity."""
 
@@ -10,4 +13,4 @@ class ReportRepository:
         return report
 
     def get(self, report_id: int) -> Optional[Report]:
-        return Report.get(id=report_id)
+        return current_db().Report.get(id=report_id)
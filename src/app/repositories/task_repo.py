@@ -1,8 +1,11 @@
-from typing import Iterable, Optional
+from typing import Iterable, List, Optional, Tuple
 from pony.orm import select
+from ..db_routing import current_db
+from ..db_instrumentation import instrument_repository
 from ..models import Task, TaskEvent, Project, User
 
 
+@instrument_repository
 class TaskRepository:
     """Persistence operations for Task entity."""
 
@@ -24,12 +27,32 @@ class TaskRepository:
         return task
 
     def get(self, task_id: int) -> Optional[Task]:
-        return Task.get(id=task_id)
+        return current_db().Task.get(id=task_id)
 
     def list_by_project(self, project: Project, limit: int, offset: int) -> Iterable[Task]:
-        query = select(t for t in Task if t.project == project).order_by(lambda t: t.id)
+        tasks = current_db().Task
+        query = select(t for t in tasks if t.project == project).order_by(lambda t: t.id)
         return query.limit(limit, offset=offset)[:]
 
+    def list_events(self, task: Task) -> Iterable[TaskEvent]:
+        """Events still in the database; older ones are in the Parquet archive."""
+        events = current_db().TaskEvent
+        return select(e for e in events if e.task == task).order_by(lambda e: (e.created_at, e.id))[:]
+
+    def list_events_after(
+        self,
+        after_id: int,
+        limit: int,
+        project_id: int | None = None,
+    ) -> List[Tuple[TaskEvent, int]]:
+        """(event, project id) pairs with id > after_id in id order: a primary key range scan."""
+        events = current_db().TaskEvent
+        if project_id is None:
+            query = select((e, e.task.project.id) for e in events if e.id > after_id)
+        else:
+            query = select((e, e.task.project.id) for e in events if e.id > after_id and e.task.project.id == project_id)
+        return query.order_by(lambda e, p: e.id).limit(limit)[:]
+
     def add_event(self, task: Task, event_type: str, payload: dict) -> TaskEvent:
         event = TaskEvent(task=task, type=event_type, payload=payload)
         return event
@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Iterable
+from pony.orm import select
+from ..db_instrumentation import instrument_repository
+from ..models import RevokedToken
+
+
+@instrument_repository
+class RevokedTokenRepository:
+    """Persistence operations for RevokedToken entity."""
+
+    def add(self, jti: str, expires_at: datetime) -> RevokedToken:
+        existing = RevokedToken.get(jti=jti)
+        if existing is not None:
+            return existing
+        return RevokedToken(jti=jti, expires_at=expires_at)
+
+    def list_active_ids(self, now: datetime) -> Iterable[str]:
+        return select(r.jti for r in RevokedToken if r.expires_at > now)[:]
@@ -1,8 +1,11 @@
 from typing import Optional
+from ..db_routing import current_db
+from ..db_instrumentation import instrument_repository
 from ..models import User
 from ..exceptions import ValidationError
 
 
+@instrument_repository
 class UserRepository:
     """Persistence operations for User entity."""
 
@@ -15,7 +18,7 @@ class UserRepository:
         return user
 
     def get(self, user_id: int) -> Optional[User]:
-        return User.get(id=user_id)
+        return current_db().User.get(id=user_id)
 
     def get_by_email(self, email: str) -> Optional[User]:
-        return User.get(email=email)
+        return current_db().User.get(email=email)
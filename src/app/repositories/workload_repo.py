@@ -0,0 +1,169 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from ..db_routing import current_db
+from ..db_instrumentation import instrument_repository
+from ..models import WorkloadRefresh, db
+
+WORKLOAD_STATE_NAME = "assignee_workload"
+
+# Window of the done_recent column; the PostgreSQL view hard-codes it too
+# (migrations/007_assignee_workload.sql).
+WORKLOAD_THROUGHPUT_DAYS = 28
+
+# SQLite summary rows, same columns as the PostgreSQL materialized view.
+# SQLite wants the WITH clause ahead of INSERT, hence the {insert} slot.
+WORKLOAD_SELECT_SQL = """
+    WITH wip_started AS (
+        SELECT e.task, MAX(e.created_at) AS started_at
+        FROM task_events e
+        JOIN tasks t ON t.id = e.task AND t.status = 'in_progress'
+        WHERE e.type = 'status_change' AND json_extract(e.payload, '$$.to') = 'in_progress'
+        GROUP BY e.task
+    )
+    {insert}
+    SELECT
+        t.assignee,
+        t.project,
+        SUM(CASE WHEN t.status = 'todo' THEN 1 ELSE 0 END),
+        SUM(CASE WHEN t.status = 'in_progress' THEN 1 ELSE 0 END),
+        SUM(CASE WHEN t.status <> 'done' AND t.priority = 1 THEN 1 ELSE 0 END),
+        SUM(CASE WHEN t.status <> 'done' AND t.priority = 2 THEN 1 ELSE 0 END),
+        SUM(CASE WHEN t.status <> 'done' AND t.priority = 3 THEN 1 ELSE 0 END),
+        MIN(CASE WHEN t.status = 'in_progress' THEN COALESCE(s.started_at, t.created_at) END),
+        SUM(CASE WHEN t.status = 'done' THEN 1 ELSE 0 END)
+    FROM tasks t
+    LEFT JOIN wip_started s ON s.task = t.id
+    WHERE t.assignee IS NOT NULL
+      AND (t.status <> 'done' OR t.done_at >= $since)
+      {pairs_filter}
+    GROUP BY t.assignee, t.project
+"""
+
+_INSERT_SQL = (
+    "INSERT INTO assignee_workload "
+    "(assignee, project, todo, in_progress, open_p1, open_p2, open_p3, oldest_wip_started_at, done_recent)"
+)
+
+_DIRTY_PAIRS_FILTER = "AND (t.assignee, t.project) IN (SELECT assignee, project FROM workload_dirty)"
+
+# Starts right at SELECT: Pony's select() prefixes "select" to anything else.
+_WORKLOAD_READ_SQL = """SELECT w.assignee, u.name, {group_key},
+           SUM(w.todo), SUM(w.in_progress), SUM(w.open_p1), SUM(w.open_p2), SUM(w.open_p3),
+           MIN(w.oldest_wip_started_at), SUM(w.done_recent)
+    FROM assignee_workload w
+    LEFT JOIN users u ON u.id = w.assignee
+    WHERE {where}
+    GROUP BY w.assignee, u.name{group_by}
+    ORDER BY SUM(w.todo) + SUM(w.in_progress) DESC, w.assignee{order_by}
+    LIMIT $limit OFFSET $offset
+"""
+
+
+def _timestamp(value: Any) -> Optional[datetime]:
+    # Raw SQLite results come back as text
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+@instrument_repository
+class WorkloadRepository:
+    """Persistence operations for the assignee workload summary and its refresh state."""
+
+    def get_state(self) -> Optional[WorkloadRefresh]:
+        return current_db().WorkloadRefresh.get(name=WORKLOAD_STATE_NAME)
+
+    def save_state(self, refreshed_at: datetime, full: bool, last_event_id: int, mode: str, duration_ms: float) -> None:
+        state = WorkloadRefresh.get(name=WORKLOAD_STATE_NAME)
+        if state is None:
+            WorkloadRefresh(
+                name=WORKLOAD_STATE_NAME,
+                refreshed_at=refreshed_at,
+                full_refreshed_at=refreshed_at,
+                last_event_id=last_event_id,
+                mode=mode,
+                duration_ms=duration_ms,
+            )
+            return
+        state.set(refreshed_at=refreshed_at, last_event_id=last_event_id, mode=mode, duration_ms=duration_ms)
+        if full:
+            state.full_refreshed_at = refreshed_at
+
+    def max_event_id(self) -> int:
+        return db.get("SELECT COALESCE(MAX(id), 0) FROM task_events")
+
+    def refresh_materialized_view(self) -> None:
+        """Recompute the PostgreSQL view without blocking readers."""
+        db.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY assignee_workload")
+
+    def rebuild_summary(self, since: datetime) -> None:
+        """Recompute every row of the SQLite summary table."""
+        db.execute("DELETE FROM assignee_workload")
+        db.execute(WORKLOAD_SELECT_SQL.format(insert=_INSERT_SQL, pairs_filter=""), {"since": since})
+
+    def refresh_summary_pairs(self, after_event_id: int, previous_since: datetime, since: datetime) -> int:
+        """
+        Recompute only the (assignee, project) rows that can have changed: those
+        with task events after ``after_event_id`` and those whose done tasks
+        left the throughput window since the last refresh. Returns the row count.
+        """
+        db.execute("CREATE TEMP TABLE IF NOT EXISTS workload_dirty (assignee INTEGER, project INTEGER)")
+        db.execute("DELETE FROM workload_dirty")
+        db.execute(
+            """
+            INSERT INTO workload_dirty (assignee, project)
+            SELECT t.assignee, t.project
+            FROM task_events e JOIN tasks t ON t.id = e.task
+            WHERE e.id > $after_event_id AND t.assignee IS NOT NULL
+            UNION
+            SELECT assignee, project FROM tasks
+            WHERE assignee IS NOT NULL AND status = 'done' AND done_at >= $previous_since AND done_at < $since
+            """,
+            {"after_event_id": after_event_id, "previous_since": previous_since, "since": since},
+        )
+        dirty = db.get("SELECT COUNT(*) FROM workload_dirty")
+        if dirty:
+            db.execute(
+                "DELETE FROM assignee_workload WHERE (assignee, project) IN (SELECT assignee, project FROM workload_dirty)"
+            )
+            db.execute(
+                WORKLOAD_SELECT_SQL.format(insert=_INSERT_SQL, pairs_filter=_DIRTY_PAIRS_FILTER), {"since": since}
+            )
+        return dirty
+
+    def list_by_assignee(self, limit: int, offset: int) -> List[Dict[str, Any]]:
+        """Workload summed over projects, busiest assignees first."""
+        sql = _WORKLOAD_READ_SQL.format(group_key="COUNT(*)", where="1 = 1", group_by="", order_by="")
+        rows = current_db().select(sql, {"limit": limit, "offset": offset})
+        return [_row_to_dict(row, "projects") for row in rows]
+
+    def list_for_assignee(self, assignee_id: int, limit: int, offset: int) -> List[Dict[str, Any]]:
+        """One row per project the assignee has work in."""
+        sql = _WORKLOAD_READ_SQL.format(
+            group_key="w.project", where="w.assignee = $assignee_id", group_by=", w.project", order_by=", w.project"
+        )
+        rows = current_db().select(sql, {"assignee_id": assignee_id, "limit": limit, "offset": offset})
+        return [_row_to_dict(row, "project_id") for row in rows]
+
+    def list_for_project(self, project_id: int, limit: int, offset: int) -> List[Dict[str, Any]]:
+        """One row per assignee with work in the project."""
+        sql = _WORKLOAD_READ_SQL.format(
+            group_key="w.project", where="w.project = $project_id", group_by=", w.project", order_by=""
+        )
+        rows = current_db().select(sql, {"project_id": project_id, "limit": limit, "offset": offset})
+        return [_row_to_dict(row, "project_id") for row in rows]
+
+
+def _row_to_dict(row, group_key: str) -> Dict[str, Any]:
+    assignee, name, group_value, todo, in_progress, p1, p2, p3, oldest_wip, done_recent = row
+    return {
+        "assignee_id": assignee,
+        "name": name,
+        group_key: group_value,
+        "open": int(todo) + int(in_progress),
+        "todo": int(todo),
+        "in_progress": int(in_progress),
+        "open_by_priority": {"1": int(p1), "2": int(p2), "3": int(p3)},
+        "oldest_wip_started_at": _timestamp(oldest_wip),
+        "done_recent": int(done_recent),
+    }
@@ -0,0 +1,44 @@
+import ipaddress
+from functools import lru_cache
+from typing import Tuple
+
+from flask import current_app, g, has_request_context, request
+
+
+@lru_cache(maxsize=8)
+def _parse_networks(proxies: Tuple[str, ...]) -> Tuple[ipaddress.IPv4Network | ipaddress.IPv6Network, ...]:
+    return tuple(ipaddress.ip_network(proxy, strict=False) for proxy in proxies)
+
+
+def _is_trusted_proxy(address: str | None) -> bool:
+    proxies = tuple(current_app.config.get("TRUSTED_PROXIES") or ())
+    if not address or not proxies:
+        return False
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in _parse_networks(proxies))
+
+
+def get_client_key() -> str | None:
+    """
+    Return a stable key identifying the client behind the current request.
+
+    Authenticated requests are keyed by user id, anonymous ones by the peer
+    address. ``X-Real-IP`` is only believed when the peer is one of
+    TRUSTED_PROXIES (Nginx sets it); anything else in the request is
+    client-controlled and would let a caller pick a fresh rate-limit bucket
+    per request. Returns None outside of a request context.
+    """
+    if not has_request_context():
+        return None
+
+    auth = g.get("auth")
+    if auth is not None:
+        return f"user:{auth['user_id']}"
+
+    remote_addr = request.remote_addr
+    if _is_trusted_proxy(remote_addr):
+        remote_addr = request.headers.get("X-Real-IP", remote_addr)
+    return f"ip:{remote_addr}"
@@ -0,0 +1,216 @@
+"""
+Scheduled refresh of derived datasets.
+
+Each dataset has its own cadence. Celery beat fires ``scheduling.dispatch``,
+which enqueues the actual refresh after a random delay (jitter) so datasets
+sharing a cadence, or many deployments sharing a broker, do not all hit the
+database on the same tick. A run holds a lease on its ``dataset_refresh`` row
+for at most ``lock_ttl_seconds``, so overlapping runs are skipped across
+workers and hosts, and a crashed run does not block the dataset forever.
+Datasets with a watermark (e.g. the newest task event id) are skipped when
+their source has not changed since the last successful run.
+"""
+
+import logging
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Mapping
+
+from flask import current_app
+from pony.orm import db_session
+
+from .exceptions import NotFoundError
+from .metrics import DATASET_REFRESH_DURATION
+from .models import db
+from .repositories.dataset_repo import DatasetRefreshRepository
+
+logger = logging.getLogger(__name__)
+
+_dataset_repo = DatasetRefreshRepository()
+
+
+class Dataset:
+    """A derived dataset: how to refresh it, how often, and how to tell if its source changed."""
+
+    def __init__(
+        self,
+        name: str,
+        refresh: Callable[[], Any],
+        cadence_config_key: str,
+        lock_ttl_seconds: float,
+        watermark: Callable[[], int] | None = None,
+    ) -> None:
+        self.name = name
+        self.refresh = refresh
+        self.cadence_config_key = cadence_config_key
+        self.lock_ttl_seconds = lock_ttl_seconds
+        self.watermark = watermark
+
+
+def _task_events_watermark() -> int:
+    # Every task write adds an event, so the newest event id changes with the data.
+    return db.get("SELECT COALESCE(MAX(id), 0) FROM task_events")
+
+
+def _refresh_workload() -> Dict[str, Any]:
+    from .repositories.project_repo import ProjectRepository
+    from .repositories.user_repo import UserRepository
+    from .repositories.workload_repo import WorkloadRepository
+    from .services.workload_service import WorkloadService
+
+    service = WorkloadService(WorkloadRepository(), UserRepository(), ProjectRepository())
+    return service.refresh()
+
+
+def _refresh_analytics() -> Dict[str, Any]:
+    from .analytics.pipeline import run_offline_analytics
+
+    return run_offline_analytics()
+
+
+def _archive_events() -> Dict[str, Any]:
+    from .analytics.event_archive import archive_old_events
+
+    return archive_old_events()
+
+
+DATASETS: Dict[str, Dataset] = {
+    dataset.name: dataset
+    for dataset in (
+        # Incremental on its own (see WorkloadService.refresh); also ages out the throughput window.
+        Dataset("workload", _refresh_workload, "WORKLOAD_REFRESH_SECONDS", lock_ttl_seconds=600),
+        Dataset(
+            "analytics_summary",
+            _refresh_analytics,
+            "ANALYTICS_REFRESH_SECONDS",
+            lock_ttl_seconds=3 * 3600,
+            watermark=_task_events_watermark,
+        ),
+        Dataset("event_archive", _archive_events, "EVENT_ARCHIVE_INTERVAL_SECONDS", lock_ttl_seconds=3600),
+    )
+}
+
+
+def get_dataset(name: str) -> Dataset:
+    dataset = DATASETS.get(name)
+    if dataset is None:
+        raise NotFoundError(f"Unknown dataset: {name}")
+    return dataset
+
+
+def cadence_seconds(dataset: Dataset, config: Mapping[str, Any]) -> float:
+    return float(config[dataset.cadence_config_key])
+
+
+def jitter_seconds(dataset: Dataset, config: Mapping[str, Any]) -> float:
+    """Upper bound of the random delay added to each scheduled run."""
+    jitter = cadence_seconds(dataset, config) * config["SCHEDULE_JITTER_FRACTION"]
+    return min(jitter, config["SCHEDULE_MAX_JITTER_SECONDS"])
+
+
+def beat_schedule(config: Mapping[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Celery beat entries, one per dataset at its own cadence."""
+    schedule = {}
+    for name, dataset in DATASETS.items():
+        cadence = cadence_seconds(dataset, config)
+        if cadence <= 0:
+            continue  # disabled
+        schedule[f"refresh-{name}"] = {
+            "task": "scheduling.dispatch",
+            "schedule": cadence,
+            "args": (name,),
+            # A dispatch that waited a whole period in the queue is superseded by the next one.
+            "options": {"expires": cadence},
+        }
+    return schedule
+
+
+def random_delay(name: str) -> float:
+    return random.uniform(0, jitter_seconds(get_dataset(name), current_app.config))
+
+
+def run_dataset(name: str) -> Dict[str, Any]:
+    """
+    Refresh one dataset unless another run holds its lease, recording the
+    outcome in ``dataset_refresh``. Failures are recorded and re-raised.
+    """
+    dataset = get_dataset(name)
+    token = uuid.uuid4().hex
+    started_at = datetime.utcnow()
+
+    with db_session:
+        _dataset_repo.ensure(name)
+    with db_session:
+        acquired = _dataset_repo.acquire_lease(
+            name, token, started_at, started_at + timedelta(seconds=dataset.lock_ttl_seconds)
+        )
+    if not acquired:
+        logger.info("Dataset %s is already being refreshed; skipping this run", name)
+        return {"dataset": name, "status": "locked"}
+
+    started = time.perf_counter()
+    status = "success"
+    watermark = None
+    result: Any = None
+    try:
+        if dataset.watermark is not None:
+            with db_session:
+                watermark = dataset.watermark()
+                if watermark == _dataset_repo.get_watermark(name):
+                    status = "skipped"
+        if status == "success":
+            result = dataset.refresh()
+    except Exception as exc:
+        duration_ms = (time.perf_counter() - started) * 1000
+        DATASET_REFRESH_DURATION.labels(dataset=name, status="failed").observe(duration_ms / 1000)
+        with db_session:
+            _dataset_repo.record_failure(name, datetime.utcnow(), duration_ms, f"{type(exc).__name__}: {exc}"[:2000])
+            _dataset_repo.release_lease(name, token)
+        logger.exception("Refresh of dataset %s failed", name)
+        raise
+
+    duration_ms = (time.perf_counter() - started) * 1000
+    DATASET_REFRESH_DURATION.labels(dataset=name, status=status).observe(duration_ms / 1000)
+    with db_session:
+        _dataset_repo.record_success(name, status, started_at, datetime.utcnow(), duration_ms, watermark)
+        _dataset_repo.release_lease(name, token)
+    logger.info("Dataset %s refresh %s in %.0f ms", name, status, duration_ms)
+    return {"dataset": name, "status": status, "duration_ms": round(duration_ms, 1), "result": result}
+
+
+@db_session
+def dataset_statuses(name: str | None = None) -> List[Dict[str, Any]]:
+    """Status of every dataset (or one), including lag behind the source."""
+    config = current_app.config
+    datasets = [get_dataset(name)] if name is not None else list(DATASETS.values())
+    rows = _dataset_repo.all_by_name()
+    now = datetime.utcnow()
+
+    statuses = []
+    for dataset in datasets:
+        row = rows.get(dataset.name)
+        cadence = cadence_seconds(dataset, config)
+        jitter = jitter_seconds(dataset, config)
+        last_success = row.last_success_at if row is not None else None
+        lag = (now - last_success).total_seconds() if last_success is not None else None
+        statuses.append(
+            {
+                "name": dataset.name,
+                "cadence_seconds": cadence,
+                "max_jitter_seconds": jitter,
+                "status": row.status if row is not None else "never",
+                "running": bool(row is not None and row.locked_until is not None and row.locked_until > now),
+                "last_started_at": row.last_started_at if row is not None else None,
+                "last_finished_at": row.last_finished_at if row is not None else None,
+                "last_success_at": last_success,
+                "last_duration_ms": row.last_duration_ms if row is not None else None,
+                "lag_seconds": round(lag, 1) if lag is not None else None,
+                # Two missed cadences (plus jitter) without a success
+                "overdue": cadence > 0 and (lag is None or lag > 2 * cadence + jitter),
+                "consecutive_failures": row.consecutive_failures if row is not None else 0,
+                "last_error": row.last_error if row is not None else None,
+            }
+        )
+    return statuses
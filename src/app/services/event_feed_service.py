@@ -0,0 +1,78 @@
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+from flask import current_app
+from pony.orm import db_session
+from ..db_routing import read_only
+from ..repositories.project_repo import ProjectRepository
+from ..repositories.task_repo import TaskRepository
+from ..analytics.event_archive import archived_until
+from ..exceptions import GoneError, NotFoundError
+from ..query_tracking import mark_poll
+
+
+class EventFeedService:
+    """Change feed over task_events: cursor pagination with optional long polling."""
+
+    def __init__(self, task_repo: TaskRepository, project_repo: ProjectRepository) -> None:
+        self.task_repo = task_repo
+        self.project_repo = project_repo
+
+    def read(self, after: int, limit: int, project_id: int | None, wait_seconds: float) -> Dict[str, Any]:
+        """
+        Events with id > ``after``, oldest first. When there are none and
+        ``wait_seconds`` > 0, poll until one appears or the wait is over.
+        Each poll is its own short read, so no transaction stays open while waiting.
+
+        Events moved to the Parquet archive are not served here: a cursor
+        below the highest archived id gets a GoneError (410) carrying
+        ``archived_until``, instead of silently skipping to the oldest event
+        still in the database.
+        """
+        cfg = current_app.config
+        if project_id is not None:
+            self._ensure_project(project_id)
+        archived_id = archived_until()
+        if archived_id is not None and after < archived_id:
+            raise GoneError(
+                f"Events up to id {archived_id} have been archived; "
+                f"read them from the archive and resume with after={archived_id}",
+                extra={"archived_until": archived_id},
+            )
+
+        started = time.monotonic()
+        deadline = started + wait_seconds
+        while True:
+            items, has_more = self._read_once(after, limit, project_id, cfg["EVENT_FEED_SETTLE_SECONDS"])
+            remaining = deadline - time.monotonic()
+            if items or remaining <= 0:
+                break
+            time.sleep(min(cfg["EVENT_FEED_POLL_INTERVAL_SECONDS"], remaining))
+            mark_poll()
+
+        return {
+            "items": items,
+            "count": len(items),
+            "next_cursor": str(items[-1]["id"] if items else after),
+            "has_more": has_more,
+            "waited_seconds": round(time.monotonic() - started, 3),
+        }
+
+    @read_only
+    @db_session
+    def _ensure_project(self, project_id: int) -> None:
+        if self.project_repo.get(project_id) is None:
+            raise NotFoundError("Project not found")
+
+    @read_only
+    @db_session
+    def _read_once(self, after: int, limit: int, project_id: int | None, settle_seconds: float):
+        rows = self.task_repo.list_events_after(after, limit, project_id)
+        horizon = datetime.utcnow() - timedelta(seconds=settle_seconds)
+        items: List[dict] = []
+        for event, event_project_id in rows:
+            if settle_seconds and event.created_at >= horizon:
+                # Stop at the first unsettled event; later ids must wait for it.
+                return items, True
+            items.append({**event.to_dict(), "project": event_project_id})
+        return items, len(rows) == limit
@@ -1,16 +1,32 @@
-from typing import List
+import json
+import logging
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List
+from flask import current_app
 from pony.orm import db_session
-from ..repositories.project_repo import ProjectRepository
+from ..cache import LRUCache
+from ..db_routing import read_only
+from ..metrics import PROJECT_DASHBOARD_DURATION
+from ..repositories.project_repo import DashboardRow, ProjectRepository
 from ..repositories.user_repo import UserRepository
 from ..exceptions import ValidationError, NotFoundError
 
+logger = logging.getLogger(__name__)
+
 
 class ProjectService:
     """Business logic for working with projects."""
 
-    def __init__(self, project_repo: ProjectRepository, user_repo: UserRepository) -> None:
+    def __init__(
+        self,
+        project_repo: ProjectRepository,
+        user_repo: UserRepository,
+        dashboard_cache: LRUCache | None = None,
+    ) -> None:
         self.project_repo = project_repo
         self.user_repo = user_repo
+        self.dashboard_cache = dashboard_cache or LRUCache(max_entries=1024)
 
     @db_session
     def create_project(self, owner_id: int, name: str) -> dict:
@@ -24,6 +40,7 @@ class ProjectService:
         project = self.project_repo.create(owner=owner, name=name)
         return project.to_dict()
 
+    @read_only
     @db_session
     def list_projects_for_owner(self, owner_id: int, limit: int, offset: int) -> List[dict]:
         owner = self.user_repo.get(owner_id)
@@ -32,3 +49,113 @@ class ProjectService:
 
         projects = self.project_repo.list_for_owner(owner, limit=limit, offset=offset)
         return [p.to_dict() for p in projects]
+
+    @read_only
+    @db_session
+    def get_dashboard(self, project_id: int) -> dict:
+        """
+        Everything the project page needs, in two queries: the project row
+        (whose version keys the cache) and, on a miss, one CTE statement.
+        """
+        started = time.perf_counter()
+        project = self.project_repo.get(project_id)
+        if project is None:
+            raise NotFoundError("Project not found")
+
+        cache_key = (project_id, project.version)
+        dashboard = self.dashboard_cache.get(cache_key)
+        outcome = "hit"
+        if dashboard is None:
+            outcome = "miss"
+            dashboard = self._build_dashboard(project.to_dict())
+            self.dashboard_cache.set(cache_key, dashboard, ttl_seconds=current_app.config["DASHBOARD_CACHE_TTL_SECONDS"])
+
+        elapsed = time.perf_counter() - started
+        PROJECT_DASHBOARD_DURATION.labels(cache=outcome).observe(elapsed)
+        target_ms = current_app.config["DASHBOARD_LATENCY_TARGET_MS"]
+        if elapsed * 1000 > target_ms:
+            logger.warning(
+                "Dashboard for project %s took %.1f ms (target %.0f ms, cache %s)",
+                project_id,
+                elapsed * 1000,
+                target_ms,
+                outcome,
+            )
+        return dashboard
+
+    def _build_dashboard(self, project: dict) -> dict:
+        cfg = current_app.config
+        now = datetime.utcnow()
+        throughput_days = cfg["DASHBOARD_THROUGHPUT_DAYS"]
+        lead_time_days = cfg["DASHBOARD_LEAD_TIME_DAYS"]
+        throughput_since = datetime.combine(now.date() - timedelta(days=throughput_days - 1), datetime.min.time())
+        rows = self.project_repo.dashboard_rows(
+            project["id"],
+            throughput_since=throughput_since,
+            lead_time_since=now - timedelta(days=lead_time_days),
+        )
+        return _assemble_dashboard(project, rows, now, throughput_since.date(), throughput_days, lead_time_days)
+
+
+def _days(seconds: float | None) -> float | None:
+    return round(seconds / 86400.0, 3) if seconds is not None else None
+
+
+def _timestamp(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _assemble_dashboard(
+    project: dict,
+    rows: List[DashboardRow],
+    now: datetime,
+    throughput_start: date,
+    throughput_days: int,
+    lead_time_days: int,
+) -> Dict[str, Any]:
+    status_counts = {status: 0 for status in ("todo", "in_progress", "done")}
+    wip: List[Dict[str, Any]] = []
+    done_per_day = {(throughput_start + timedelta(days=i)).isoformat(): 0 for i in range(throughput_days)}
+    lead_time: Dict[str, Any] = {"window_days": lead_time_days, "count": 0}
+    latest_report = None
+
+    for section, key, label, detail, n, x, y, z, t1, t2, body in rows:
+        if section == "status":
+            status_counts[key] = n
+        elif section == "wip":
+            wip.append(
+                {
+                    "assignee_id": int(key) if key is not None else None,
+                    "name": label,
+                    "in_progress": n,
+                    "open": int(x),
+                }
+            )
+        elif section == "throughput":
+            done_per_day[key[:10]] = n
+        elif section == "lead_time":
+            lead_time.update(count=n, avg_days=_days(x), min_days=_days(y), max_days=_days(z))
+        elif section == "report":
+            latest_report = {
+                "id": int(key),
+                "type": label,
+                "status": detail,
+                "created_at": _timestamp(t1),
+                "finished_at": _timestamp(t2),
+                "result": json.loads(body) if body else None,
+            }
+
+    wip.sort(key=lambda item: (-item["in_progress"], -item["open"], item["assignee_id"] or 0))
+    return {
+        "project": project,
+        "generated_at": now,
+        "status_counts": status_counts,
+        "wip_by_assignee": wip,
+        "throughput": {
+            "window_days": throughput_days,
+            "total": sum(done_per_day.values()),
+            "done_per_day": [{"date": day, "done": done} for day, done in done_per_day.items()],
+        },
+        "lead_time": lead_time,
+        "latest_report": latest_report,
+    }
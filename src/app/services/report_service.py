@@ -1,8 +1,8 @@
 from typing import Any, Dict
 from pony.orm import db_session
+from ..db_routing import read_only
 from ..repositories.report_repo import ReportRepository
 from ..repositories.project_repo import ProjectRepository
-from ..tasks.report_tasks import generate_project_summary
 from ..exceptions import NotFoundError
 
 
@@ -25,9 +25,14 @@ class ReportService:
 
         report = self.report_repo.create(project=project, report_type="daily_summary", params=params or {})
         report_id = report.id
+        self.project_repo.bump_version(project_id)
+        # Imported here so web workers only load Celery once a report is requested.
+        from ..tasks.report_tasks import generate_project_summary
+
         generate_project_summary.delay(report_id)
         return report.to_dict()
 
+    @read_only
     @db_session
     def get_report(self, report_id: int) -> dict:
         report = self.report_repo.get(report_id)
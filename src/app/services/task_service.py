@@ -1,5 +1,7 @@
 from typing import List
 from pony.orm import db_session
+from ..analytics.event_archive import archived_events_for_task
+from ..db_routing import read_only
 from ..repositories.task_repo import TaskRepository
 from ..repositories.project_repo import ProjectRepository
 from ..repositories.user_repo import UserRepository
@@ -38,8 +40,10 @@ class TaskService:
 
         assignee = self.user_repo.get(assignee_id) if assignee_id else None
         task = self.task_repo.create(project=project, title=title, description=description, assignee=assignee)
+        self.project_repo.bump_version(project_id)
         return task.to_dict()
 
+    @read_only
     @db_session
     def list_tasks_for_project(self, project_id: int, limit: int, offset: int) -> List[dict]:
         project = self.project_repo.get(project_id)
@@ -49,6 +53,20 @@ class TaskService:
         tasks = self.task_repo.list_by_project(project, limit=limit, offset=offset)
         return [t.to_dict() for t in tasks]
 
+    @read_only
+    @db_session
+    def list_events(self, task_id: int) -> List[dict]:
+        """Full event history of a task: archived months first, then the database."""
+        task = self.task_repo.get(task_id)
+        if task is None:
+            raise NotFoundError("Task not found")
+
+        events = archived_events_for_task(task_id, task.created_at)
+        # An event can be in both while a month is being archived.
+        archived_ids = {e["id"] for e in events}
+        events.extend(e.to_dict() for e in self.task_repo.list_events(task) if e.id not in archived_ids)
+        return events
+
     @db_session
     def update_status(self, task_id: int, new_status: str) -> dict:
         if new_status not in self.VALID_STATUSES:
@@ -72,5 +90,6 @@ class TaskService:
             event_type="status_change",
             payload={"from": old_status, "to": new_status},
         )
+        self.project_repo.bump_version(task.project.id)
 
         return task.to_dict()
@@ -1,22 +1,23 @@
 from typing import Optional
 from pony.orm import db_session
-from werkzeug.security import generate_password_hash, check_password_hash
 from ..repositories.user_repo import UserRepository
+from ..password_hashing import PasswordHasher, password_hasher
 from ..exceptions import ValidationError, NotFoundError
 
 
 class UserService:
     """Business logic for working with users."""
 
-    def __init__(self, repo: UserRepository) -> None:
+    def __init__(self, repo: UserRepository, hasher: PasswordHasher | None = None) -> None:
         self.repo = repo
+        self.hasher = hasher or password_hasher
 
     @db_session
     def register(self, email: str, name: str, password: str) -> dict:
         if not email or not name or not password:
             raise ValidationError("email, name and password are required")
 
-        password_hash = generate_password_hash(password)
+        password_hash = self.hasher.hash(password)
         user = self.repo.create(email=email, name=name, password_hash=password_hash)
         return user.to_dict()
 
@@ -26,9 +27,13 @@ class UserService:
         if user is None:
             return None
 
-        if not check_password_hash(user.password_hash, password):
+        if not self.hasher.verify(user.password_hash, password):
             return None
 
+        # Transparently upgrade hashes created with outdated parameters.
+        if self.hasher.needs_rehash(user.password_hash):
+            user.password_hash = self.hasher.hash(password)
+
         return user.to_dict()
 
     @db_session
@@ -0,0 +1,118 @@
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+from flask import current_app
+from pony.orm import db_session
+from ..db_routing import read_only
+from ..models import db
+from ..repositories.project_repo import ProjectRepository
+from ..repositories.user_repo import UserRepository
+from ..repositories.workload_repo import WORKLOAD_THROUGHPUT_DAYS, WorkloadRepository
+from ..exceptions import NotFoundError
+
+logger = logging.getLogger(__name__)
+
+
+class WorkloadService:
+    """Per-assignee workload: refreshing the summary and serving it with freshness metadata."""
+
+    def __init__(
+        self,
+        workload_repo: WorkloadRepository,
+        user_repo: UserRepository,
+        project_repo: ProjectRepository,
+    ) -> None:
+        self.workload_repo = workload_repo
+        self.user_repo = user_repo
+        self.project_repo = project_repo
+
+    @db_session
+    def refresh(self, now: datetime | None = None, force_full: bool = False) -> Dict[str, Any]:
+        """
+        Bring the workload summary up to date.
+
+        PostgreSQL refreshes the materialized view concurrently, and skips it
+        when no task event was written since the last refresh. Elsewhere only
+        the rows touched since the last refresh are recomputed. Either way a
+        full recompute runs every WORKLOAD_FULL_REFRESH_SECONDS, which also
+        picks up changes that leave no task event (e.g. deleted tasks).
+        """
+        started = time.perf_counter()
+        now = now or datetime.utcnow()
+        since = now - timedelta(days=WORKLOAD_THROUGHPUT_DAYS)
+        state = self.workload_repo.get_state()
+        head = self.workload_repo.max_event_id()
+        full = (
+            force_full
+            or state is None
+            or (now - state.full_refreshed_at).total_seconds() >= current_app.config["WORKLOAD_FULL_REFRESH_SECONDS"]
+        )
+
+        rows = None
+        if db.provider_name == "postgres":
+            # The view is always recomputed as a whole; event ids are only a change signal
+            # here, since concurrent transactions can commit ids below the watermark.
+            if full or head != state.last_event_id:
+                self.workload_repo.refresh_materialized_view()
+                mode = "full"
+            else:
+                mode = "skipped"
+        elif full:
+            self.workload_repo.rebuild_summary(since)
+            mode = "full"
+        else:
+            previous_since = state.refreshed_at - timedelta(days=WORKLOAD_THROUGHPUT_DAYS)
+            rows = self.workload_repo.refresh_summary_pairs(state.last_event_id, previous_since, since)
+            mode = "incremental"
+
+        duration_ms = (time.perf_counter() - started) * 1000
+        self.workload_repo.save_state(
+            refreshed_at=now,
+            full=mode == "full",
+            last_event_id=head,
+            mode=mode,
+            duration_ms=duration_ms,
+        )
+        result = {"mode": mode, "rows_recomputed": rows, "last_event_id": head, "duration_ms": round(duration_ms, 1)}
+        logger.info("Workload refresh finished", extra={"workload_refresh": result})
+        return result
+
+    @read_only
+    @db_session
+    def list_assignees(self, limit: int, offset: int) -> Dict[str, Any]:
+        items = self.workload_repo.list_by_assignee(limit=limit, offset=offset)
+        return self._with_freshness(items, limit, offset)
+
+    @read_only
+    @db_session
+    def get_assignee(self, assignee_id: int, limit: int, offset: int) -> Dict[str, Any]:
+        if self.user_repo.get(assignee_id) is None:
+            raise NotFoundError("User not found")
+        items = self.workload_repo.list_for_assignee(assignee_id, limit=limit, offset=offset)
+        return self._with_freshness(items, limit, offset)
+
+    @read_only
+    @db_session
+    def get_project(self, project_id: int, limit: int, offset: int) -> Dict[str, Any]:
+        if self.project_repo.get(project_id) is None:
+            raise NotFoundError("Project not found")
+        items = self.workload_repo.list_for_project(project_id, limit=limit, offset=offset)
+        return self._with_freshness(items, limit, offset)
+
+    def _with_freshness(self, items: List[Dict[str, Any]], limit: int, offset: int) -> Dict[str, Any]:
+        now = datetime.utcnow()
+        for item in items:
+            started_at = item["oldest_wip_started_at"]
+            item["oldest_wip_age_days"] = round((now - started_at).total_seconds() / 86400, 2) if started_at else None
+
+        state = self.workload_repo.get_state()
+        age = (now - state.refreshed_at).total_seconds() if state is not None else None
+        freshness = {
+            "refreshed_at": state.refreshed_at if state is not None else None,
+            "age_seconds": round(age, 1) if age is not None else None,
+            "stale": age is None or age > current_app.config["WORKLOAD_STALE_SECONDS"],
+            "mode": state.mode if state is not None else None,
+            "throughput_window_days": WORKLOAD_THROUGHPUT_DAYS,
+        }
+        return {"items": items, "limit": limit, "offset": offset, "count": len(items), "freshness": freshness}
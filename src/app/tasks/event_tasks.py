@@ -0,0 +1,8 @@
+from ..extensions import celery
+from ..scheduling import run_dataset
+
+
+@celery.task(name="events.archive_old_events")
+def archive_old_task_events() -> dict:
+    """Retention job: move task_events past EVENT_RETENTION_MONTHS to Parquet."""
+    return run_dataset("event_archive")
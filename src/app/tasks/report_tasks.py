@@ -2,6 +2,7 @@ from datetime import datetime, timedelta
 from pony.orm import db_session, select
 from ..extensions import celery
 from ..models import Report, Task, db
+from ..repositories.project_repo import ProjectRepository
 
 
 def _calculate_avg_lead_time_days(project_id: int, since: datetime) -> float | None:
@@ -55,3 +56,4 @@ def generate_project_summary(report_id: int) -> None:
     }
     report.status = "ready"
     report.finished_at = now
+    ProjectRepository().bump_version(project.id)
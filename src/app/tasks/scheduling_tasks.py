@@ -0,0 +1,17 @@
+from ..extensions import celery
+from ..scheduling import get_dataset, random_delay, run_dataset
+
+
+@celery.task(name="scheduling.dispatch")
+def dispatch_dataset_refresh(name: str) -> float:
+    """Fired by beat: enqueue the refresh after a random delay to spread load."""
+    get_dataset(name)
+    delay = random_delay(name)
+    refresh_dataset.apply_async((name,), countdown=delay)
+    return delay
+
+
+@celery.task(name="scheduling.refresh_dataset")
+def refresh_dataset(name: str) -> dict:
+    """Refresh one derived dataset under its lease (see app.scheduling)."""
+    return run_dataset(name)
@@ -0,0 +1,8 @@
+from ..extensions import celery
+from ..scheduling import run_dataset
+
+
+@celery.task(name="workload.refresh")
+def refresh_workload() -> dict:
+    """Bring the assignee workload summary up to date (incremental where possible)."""
+    return run_dataset("workload")
@@ -0,0 +1,47 @@
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Sequence
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float | None:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return None
+    rank = max(int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def run_metadata() -> Dict[str, Any]:
+    """Context recorded with every benchmark result so runs can be compared."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=False,
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "timestamp_utc": datetime.utcnow().isoformat(),
+        "git_commit": commit or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def write_result(result: Dict[str, Any], output: str | None, prefix: str) -> Path:
+    """Write a result as pretty JSON, defaulting to bench_results/<prefix>_<timestamp>.json."""
+    if output:
+        path = Path(output)
+    else:
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        path = Path("bench_results") / f"{prefix}_{stamp}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(result, indent=2, default=str), encoding="utf-8")
+    return path
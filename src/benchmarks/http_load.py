@@ -0,0 +1,355 @@
+# src/benchmarks/http_load.py
+
+"""
+HTTP load test for the REST API.
+
+Seeds a dataset, starts the app under gunicorn and drives a weighted mix of
+realistic requests from concurrent clients. Writes RPS and p50/p95/p99
+latency per endpoint to a JSON file so runs can be compared.
+
+Usage (from src/):
+
+    python -m benchmarks.http_load --duration 30 --concurrency 16
+    python -m benchmarks.http_load --db postgres   # uses DB_* env, migrated schema
+
+With ``--db postgres`` the users, projects, tasks, events and reports tables
+are emptied before seeding, so every run starts from the same dataset; point
+``DB_*`` at a dedicated database.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.common import percentile, run_metadata, write_result
+
+PASSWORD = "bench-password"
+
+# name -> weight; the mix approximates dashboard-heavy read traffic.
+DEFAULT_MIX = {
+    "list_tasks": 40,
+    "list_projects": 20,
+    "get_report": 15,
+    "create_task": 10,
+    "update_status": 10,
+    "login": 5,
+}
+
+
+def seed_dataset(
+    users: int,
+    projects: int,
+    tasks_per_project: int,
+    events_per_task: int,
+    seed: int,
+) -> Dict[str, List[Any]]:
+    """
+    Create users, projects, tasks, events and ready reports through Pony,
+    after emptying those tables (left over from an earlier run otherwise).
+    """
+    from pony.orm import commit, db_session
+    from werkzeug.security import generate_password_hash
+
+    from app.models import Project, Report, Task, TaskEvent, User, db
+    from scripts.generate_synthetic_data import reset_tables
+
+    rng = random.Random(seed)
+    password_hash = generate_password_hash(PASSWORD)
+    now = datetime.utcnow()
+    ids: Dict[str, List[Any]] = {"users": [], "emails": [], "projects": [], "tasks": [], "reports": []}
+
+    with db_session:
+        connection = db.get_connection()
+        reset_tables(connection.cursor(), db.provider_name)
+        connection.commit()
+
+    with db_session:
+        owners = [User(email=f"bench{i}@example.com", name=f"Bench {i}", password_hash=password_hash) for i in range(users)]
+        commit()
+        ids["users"] = [u.id for u in owners]
+        ids["emails"] = [u.email for u in owners]
+
+    for p in range(projects):
+        with db_session:
+            owner = User[rng.choice(ids["users"])]
+            project = Project(owner=owner, name=f"Bench project {p}")
+            for t in range(tasks_per_project):
+                created_at = now - timedelta(days=rng.uniform(0, 90))
+                status = rng.choices(["todo", "in_progress", "done"], weights=[3, 2, 5])[0]
+                done_at = created_at + timedelta(days=rng.expovariate(1 / 5)) if status == "done" else None
+                task = Task(
+                    project=project,
+                    title=f"Task {t}",
+                    description="",
+                    status=status,
+                    priority=rng.choice([1, 2, 2, 3]),
+                    assignee=owner,
+                    created_at=created_at,
+                    done_at=done_at,
+                )
+                TaskEvent(task=task, type="created", payload={}, created_at=created_at)
+                for _ in range(max(events_per_task - 1, 0)):
+                    TaskEvent(task=task, type="comment", payload={"text": "bench"}, created_at=created_at)
+            Report(
+                project=project,
+                type="daily_summary",
+                params={},
+                status="ready",
+                result={"project_id": project.id},
+                finished_at=now,
+            )
+            commit()
+            ids["projects"].append(project.id)
+            ids["tasks"].extend(t.id for t in project.tasks)
+            ids["reports"].extend(r.id for r in project.reports)
+
+    return ids
+
+
+def build_request(name: str, ids: Dict[str, List[Any]], rng: random.Random) -> Tuple[str, str, Dict | None]:
+    if name == "list_tasks":
+        return "GET", f"/tasks/project/{rng.choice(ids['projects'])}?limit=50", None
+    if name == "list_projects":
+        return "GET", f"/projects?owner_id={rng.choice(ids['users'])}&limit=20", None
+    if name == "get_report":
+        return "GET", f"/reports/{rng.choice(ids['reports'])}", None
+    if name == "create_task":
+        body = {"title": "load test task", "description": "", "assignee_id": rng.choice(ids["users"])}
+        return "POST", f"/tasks/project/{rng.choice(ids['projects'])}", body
+    if name == "update_status":
+        body = {"status": rng.choice(["todo", "in_progress", "done"])}
+        return "PATCH", f"/tasks/{rng.choice(ids['tasks'])}/status", body
+    if name == "login":
+        return "POST", "/auth/login", {"email": rng.choice(ids["emails"]), "password": PASSWORD}
+    raise ValueError(f"unknown request type {name}")
+
+
+def drive_load(
+    host: str,
+    port: int,
+    ids: Dict[str, List[Any]],
+    mix: Dict[str, int],
+    duration: float,
+    concurrency: int,
+    seed: int,
+) -> Dict[str, Any]:
+    """Run ``concurrency`` closed-loop clients for ``duration`` seconds."""
+    names, weights = zip(*mix.items())
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(worker_id: int) -> None:
+        rng = random.Random(seed + worker_id)
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        local_latencies: Dict[str, List[float]] = defaultdict(list)
+        local_statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        headers = {"Content-Type": "application/json"}
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights=weights)[0]
+            method, path, body = build_request(name, ids, rng)
+            started = time.perf_counter()
+            try:
+                conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+                resp = conn.getresponse()
+                resp.read()
+                status = resp.status
+                if resp.getheader("Connection", "").lower() == "close":
+                    conn.close()
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                status = 0
+            local_latencies[name].append(time.perf_counter() - started)
+            local_statuses[name][status] += 1
+        conn.close()
+        with lock:
+            for name, values in local_latencies.items():
+                latencies[name].extend(values)
+            for name, counts in local_statuses.items():
+                for status, count in counts.items():
+                    statuses[name][status] += count
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    def summarize(values: List[float], status_counts: Dict[int, int]) -> Dict[str, Any]:
+        values = sorted(values)
+        errors = sum(count for status, count in status_counts.items() if status == 0 or status >= 500)
+        return {
+            "requests": len(values),
+            "errors": errors,
+            "statuses": {str(k): v for k, v in sorted(status_counts.items())},
+            "rps": len(values) / elapsed if elapsed else 0.0,
+            "p50_ms": _ms(percentile(values, 50)),
+            "p95_ms": _ms(percentile(values, 95)),
+            "p99_ms": _ms(percentile(values, 99)),
+            "max_ms": _ms(values[-1] if values else None),
+        }
+
+    endpoints = {name: summarize(latencies[name], statuses[name]) for name in sorted(latencies)}
+    all_statuses: Dict[int, int] = defaultdict(int)
+    for counts in statuses.values():
+        for status, count in counts.items():
+            all_statuses[status] += count
+    overall = summarize([v for values in latencies.values() for v in values], all_statuses)
+    return {"elapsed_seconds": elapsed, "overall": overall, "endpoints": endpoints}
+
+
+def _ms(value: float | None) -> float | None:
+    return round(value * 1000, 3) if value is not None else None
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_live(host: str, port: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=1)
+            conn.request("GET", "/livez")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("gunicorn did not become live in time")
+
+
+def start_gunicorn(env: Dict[str, str], port: int, workers: int, worker_class: str, threads: int) -> subprocess.Popen:
+    cmd = [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        "-c",
+        "python:scripts.gunicorn_conf",
+        "-w",
+        str(workers),
+        "-k",
+        worker_class,
+        "--threads",
+        str(threads),
+        "-b",
+        f"127.0.0.1:{port}",
+        "--log-level",
+        "warning",
+        "app:create_app()",
+    ]
+    return subprocess.Popen(cmd, env=env, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", choices=["sqlite", "postgres"], default="sqlite")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--tasks-per-project", type=int, default=200)
+    parser.add_argument("--events-per-task", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load")
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds of unrecorded load first")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--worker-class", default="sync")
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--mix", type=json.loads, default=DEFAULT_MIX, help="JSON {request_type: weight}")
+    parser.add_argument("--keep-admission", action="store_true", help="leave rate limiting enabled (all clients share one address, hence one bucket)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="result file (default bench_results/http_<timestamp>.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> None:
+    args = parse_args(argv)
+
+    env = dict(os.environ)
+    env.update(
+        {
+            "APP_ENV": "production",
+            "LOG_LEVEL": "WARNING",
+            "DB_PROVIDER": args.db,
+            "ADMISSION_ENABLED": "true" if args.keep_admission else "false",
+        }
+    )
+    workdir = tempfile.mkdtemp(prefix="radar-bench-")
+    if args.db == "sqlite":
+        env["DB_NAME"] = os.path.join(workdir, "bench.sqlite")
+    env["PROFILE_DIR"] = os.path.join(workdir, "profiles")
+    os.environ.update(env)
+
+    # Seed in this process with the same configuration the server will use
+    # (Config reads the environment updated above).
+    from app import create_app
+    from app.config import Config
+
+    app = create_app(Config)
+    seed_started = time.perf_counter()
+    with app.app_context():
+        ids = seed_dataset(args.users, args.projects, args.tasks_per_project, args.events_per_task, args.seed)
+    seed_seconds = time.perf_counter() - seed_started
+    print(f"Seeded {len(ids['tasks'])} tasks in {seed_seconds:.1f}s")
+
+    port = _free_port()
+    server = start_gunicorn(env, port, args.workers, args.worker_class, args.threads)
+    try:
+        _wait_until_live("127.0.0.1", port, timeout=60)
+        if args.warmup > 0:
+            drive_load("127.0.0.1", port, ids, args.mix, args.warmup, args.concurrency, args.seed + 1000)
+        load = drive_load("127.0.0.1", port, ids, args.mix, args.duration, args.concurrency, args.seed)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+
+    result = {
+        "benchmark": "http_load",
+        "metadata": run_metadata(),
+        "config": {
+            "db": args.db,
+            "workers": args.workers,
+            "worker_class": args.worker_class,
+            "threads": args.threads,
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "mix": args.mix,
+            "admission_enabled": args.keep_admission,
+        },
+        "dataset": {
+            "users": args.users,
+            "projects": args.projects,
+            "tasks": len(ids["tasks"]),
+            "events_per_task": args.events_per_task,
+            "seed": args.seed,
+            "seed_seconds": seed_seconds,
+        },
+        **load,
+    }
+    path = write_result(result, args.output, "http")
+
+    overall = result["overall"]
+    print(f"{overall['requests']} requests, {overall['rps']:.1f} rps, p50={overall['p50_ms']}ms p95={overall['p95_ms']}ms p99={overall['p99_ms']}ms")
+    for name, stats in result["endpoints"].items():
+        print(f"  {name:15s} {stats['rps']:8.1f} rps  p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms p99={stats['p99_ms']}ms errors={stats['errors']}")
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+# src/benchmarks/pipeline_scale.py
+
+"""
+Scale benchmark for the offline analytics pipeline.
+
+For each requested scale, generates synthetic tasks and events with
+``scripts.generate_synthetic_data`` (skewed so a few projects are huge and
+most are tiny), loads them into a database and runs
+every pipeline stage in its own subprocess, recording wall time, peak RSS and
+output size per stage.
+
+SQLite scales each get a fresh database file. With ``--db postgres`` the
+users, projects, tasks and events tables of the configured database are
+emptied before every scale, so point ``DB_*`` at a dedicated database.
+
+Usage (from src/):
+
+    python -m benchmarks.pipeline_scale --scales 100k,1M
+    python -m benchmarks.pipeline_scale --scales 1M,10M,50M --db postgres
+    python -m benchmarks.pipeline_scale --compare before.json after.json
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from benchmarks.common import run_metadata, write_result
+
+STAGES = ("export_tasks", "export_task_events", "duckdb_summary", "flow_series")
+
+_SUFFIXES = {"k": 1_000, "m": 1_000_000, "b": 1_000_000_000}
+
+
+def parse_scale(value: str) -> int:
+    value = value.strip().lower().replace("_", "")
+    if value and value[-1] in _SUFFIXES:
+        return int(float(value[:-1]) * _SUFFIXES[value[-1]])
+    return int(value)
+
+
+def run_stage(stage: str, data_dir: str) -> Dict[str, Any]:
+    """Run one pipeline stage in this process and report its cost."""
+    from app import create_app
+    from app.analytics import pipeline
+    from app.config import Config
+    from app.db_routing import db_router
+    from scripts.generate_synthetic_data import DEFAULT_NOW
+
+    app = create_app(Config)
+    base_dir = Path(data_dir)
+    baseline_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    started = time.perf_counter()
+    with app.app_context(), db_router.reading():
+        if stage == "export_tasks":
+            path, rows = pipeline._export_tasks_to_parquet(base_dir)
+        elif stage == "export_task_events":
+            path, rows = pipeline._export_task_events_to_parquet(base_dir)
+        elif stage == "duckdb_summary":
+            path, rows = pipeline._compute_analytics_with_duckdb(base_dir, base_dir / "tasks.parquet")
+        elif stage == "flow_series":
+            path, rows = pipeline._compute_flow_series(
+                base_dir, base_dir / "tasks.parquet", base_dir / "task_events.parquet", DEFAULT_NOW.date()
+            )
+        else:
+            raise ValueError(f"unknown stage {stage}")
+    wall = time.perf_counter() - started
+
+    return {
+        "wall_seconds": wall,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "baseline_rss_mb": baseline_rss_kb / 1024,
+        "rows": rows,
+        "output_bytes": Path(path).stat().st_size,
+    }
+
+
+def _run_stage_subprocess(stage: str, data_dir: str, env: Dict[str, str], timeout: float) -> Dict[str, Any]:
+    cmd = [sys.executable, "-m", "benchmarks.pipeline_scale", "--run-stage", stage, "--data-dir", data_dir]
+    try:
+        proc = subprocess.run(cmd, env=env, capture_output=True, text=True, timeout=timeout, check=False)
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {timeout}s"}
+    if proc.returncode != 0:
+        return {"error": f"exit code {proc.returncode}", "stderr_tail": proc.stderr[-2000:]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for scale_label in args.scales.split(","):
+        task_count = parse_scale(scale_label)
+        workdir = tempfile.mkdtemp(prefix=f"radar-pipeline-{scale_label}-")
+        env = dict(
+            os.environ,
+            APP_ENV="production",
+            LOG_LEVEL="WARNING",
+            DB_PROVIDER=args.db,
+            # The export stages also read archived events; keep other runs' out.
+            EVENT_ARCHIVE_DIR=os.path.join(workdir, "task_events_archive"),
+        )
+        if args.db == "sqlite":
+            env["DB_NAME"] = os.path.join(workdir, "pipeline.sqlite")
+
+        print(f"Scale {scale_label}: generating {task_count:,} tasks", flush=True)
+        load_started = time.perf_counter()
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.pipeline_scale",
+                "--generate",
+                str(task_count),
+                "--projects",
+                str(args.projects),
+                "--users",
+                str(args.users),
+                "--skew",
+                str(args.skew),
+                "--seed",
+                str(args.seed),
+                "--reset",
+            ],
+            env=env,
+            check=True,
+        )
+        load_seconds = time.perf_counter() - load_started
+
+        stages: Dict[str, Any] = {}
+        for stage in STAGES:
+            stats = _run_stage_subprocess(stage, workdir, env, args.stage_timeout)
+            stages[stage] = stats
+            print(f"  {stage:20s} {json.dumps(stats)}", flush=True)
+            if "error" in stats:
+                break
+            if stage == "export_tasks" and stats["rows"] != task_count:
+                raise RuntimeError(
+                    f"scale {scale_label}: pipeline read {stats['rows']:,} tasks, expected {task_count:,}"
+                )
+
+        results[scale_label] = {"tasks": task_count, "load_seconds": load_seconds, "stages": stages}
+        if args.keep_data:
+            print(f"  data kept in {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def compare(before_path: str, after_path: str) -> Dict[str, Any]:
+    """Diff two result files stage by stage (after relative to before)."""
+    before = json.loads(Path(before_path).read_text())["scales"]
+    after = json.loads(Path(after_path).read_text())["scales"]
+    diff: Dict[str, Any] = {}
+    for scale in sorted(set(before) & set(after), key=parse_scale):
+        diff[scale] = {}
+        for stage in STAGES:
+            b = before[scale]["stages"].get(stage, {})
+            a = after[scale]["stages"].get(stage, {})
+            entry = {}
+            for metric in ("wall_seconds", "peak_rss_mb", "output_bytes"):
+                if metric in a and metric in b and b[metric]:
+                    entry[metric] = {
+                        "before": b[metric],
+                        "after": a[metric],
+                        "change_pct": round((a[metric] - b[metric]) / b[metric] * 100, 1),
+                    }
+            if "error" in a or "error" in b:
+                entry["errors"] = {"before": b.get("error"), "after": a.get("error")}
+            diff[scale][stage] = entry
+    return diff
+
+
+def print_comparison(diff: Dict[str, Any]) -> None:
+    for scale, stages in diff.items():
+        print(f"Scale {scale}")
+        for stage, metrics in stages.items():
+            parts = [
+                f"{metric}: {values['before']:.4g} -> {values['after']:.4g} ({values['change_pct']:+.1f}%)"
+                for metric, values in metrics.items()
+                if metric != "errors"
+            ]
+            if "errors" in metrics:
+                parts.append(f"errors: {metrics['errors']}")
+            print(f"  {stage:20s} " + "; ".join(parts))
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="100k,1M", help="comma-separated task counts, e.g. 1M,10M,50M")
+    parser.add_argument("--db", choices=["sqlite", "postgres"], default="sqlite")
+    parser.add_argument("--projects", type=int, default=5_000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--skew", type=float, default=3.0, help=">1 concentrates tasks in few projects")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--stage-timeout", type=float, default=6 * 3600)
+    parser.add_argument("--keep-data", action="store_true", help="keep generated databases and Parquet files")
+    parser.add_argument("--output", help="result file (default bench_results/pipeline_<timestamp>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="diff two result files")
+    # Internal: used when re-invoking this module in a child process.
+    parser.add_argument("--run-stage", choices=STAGES, help=argparse.SUPPRESS)
+    parser.add_argument("--data-dir", help=argparse.SUPPRESS)
+    parser.add_argument("--generate", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--reset", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> None:
+    args = parse_args(argv)
+
+    if args.run_stage:
+        print(json.dumps(run_stage(args.run_stage, args.data_dir)))
+        return
+
+    if args.generate is not None:
+        from app import create_app
+        from app.config import Config
+        from scripts.generate_synthetic_data import generate
+
+        create_app(Config)
+        generate(
+            users=args.users,
+            projects=args.projects,
+            tasks=args.generate,
+            seed=args.seed,
+            skew=args.skew,
+            reset=args.reset,
+        )
+        return
+
+    if args.compare:
+        diff = compare(*args.compare)
+        print_comparison(diff)
+        path = write_result({"benchmark": "pipeline_scale_compare", "before": args.compare[0], "after": args.compare[1], "diff": diff}, args.output, "pipeline_compare")
+        print(f"Comparison written to {path}")
+        return
+
+    scales = run_benchmark(args)
+    result = {
+        "benchmark": "pipeline_scale",
+        "metadata": run_metadata(),
+        "config": {
+            "db": args.db,
+            "projects": args.projects,
+            "users": args.users,
+            "skew": args.skew,
+            "seed": args.seed,
+        },
+        "scales": scales,
+    }
+    path = write_result(result, args.output, "pipeline")
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
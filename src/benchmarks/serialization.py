@@ -0,0 +1,166 @@
+# src/benchmarks/serialization.py
+
+"""
+Serialization benchmark for the largest JSON endpoints.
+
+Seeds a dataset, then serves each endpoint in-process once per JSON provider
+(Flask's stdlib ``default`` and ``orjson``). For every endpoint it records:
+
+- CPU time (``time.process_time``) of a whole request and of encoding the
+  payload alone, median per call;
+- bytes on the wire uncompressed, gzip'ed and zstd'ed (when ``zstandard`` is
+  installed) at the configured levels, and the CPU cost of compressing.
+
+Usage (from src/):
+
+    python -m benchmarks.serialization --iterations 50
+    python -m benchmarks.serialization --projects 5 --tasks-per-project 2000
+"""
+
+import argparse
+import gzip
+import os
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from benchmarks.common import run_metadata, write_result
+from benchmarks.http_load import seed_dataset
+
+PROVIDERS = ("default", "orjson")
+
+
+def endpoints(ids: Dict[str, List[Any]]) -> Dict[str, str]:
+    project_id = ids["projects"][0]
+    return {
+        "list_tasks": f"/tasks/project/{project_id}?limit=100",
+        "task_events": f"/tasks/{ids['tasks'][0]}/events",
+        "change_feed": "/events?limit=1000",
+        "project_dashboard": f"/projects/{project_id}/dashboard",
+        "workload_assignees": "/workload/assignees?limit=100",
+    }
+
+
+def cpu_ms(fn: Callable[[], Any], iterations: int) -> float:
+    """Median CPU milliseconds of one call."""
+    samples = []
+    for _ in range(iterations):
+        started = time.process_time()
+        fn()
+        samples.append((time.process_time() - started) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def compressors(config: Any) -> Dict[str, Callable[[bytes], bytes]]:
+    codecs = {"gzip": lambda data: gzip.compress(data, compresslevel=config.COMPRESSION_GZIP_LEVEL, mtime=0)}
+    try:
+        import zstandard
+    except ImportError:
+        return codecs
+    codecs["zstd"] = zstandard.ZstdCompressor(level=config.COMPRESSION_ZSTD_LEVEL).compress
+    return codecs
+
+
+def measure_endpoint(app: Any, path: str, codecs: Dict[str, Callable[[bytes], bytes]], iterations: int) -> Dict[str, Any]:
+    client = app.test_client()
+    response = client.get(path)
+    if response.status_code != 200:
+        raise RuntimeError(f"GET {path} returned {response.status_code}")
+    body = response.get_data()
+
+    with app.app_context():
+        payload = app.json.loads(body)
+        encode_ms = cpu_ms(lambda: app.json.response(payload).get_data(), iterations)
+    request_ms = cpu_ms(lambda: client.get(path).get_data(), iterations)
+
+    wire = {"raw": len(body)}
+    compress_ms = {}
+    for name, compress in codecs.items():
+        wire[name] = len(compress(body))
+        compress_ms[name] = cpu_ms(lambda: compress(body), iterations)
+    return {"request_cpu_ms": request_ms, "encode_cpu_ms": encode_ms, "bytes": wire, "compress_cpu_ms": compress_ms}
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--projects", type=int, default=10)
+    parser.add_argument("--tasks-per-project", type=int, default=500)
+    parser.add_argument("--events-per-task", type=int, default=3)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="result file (default bench_results/serialization_<timestamp>.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> None:
+    args = parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix="radar-serialization-")
+    os.environ.update(
+        {
+            "APP_ENV": "production",
+            "LOG_LEVEL": "WARNING",
+            "DB_PROVIDER": "sqlite",
+            "DB_NAME": os.path.join(workdir, "bench.sqlite"),
+            "PROFILE_DIR": os.path.join(workdir, "profiles"),
+            "ADMISSION_ENABLED": "false",
+            # Bodies are measured before compression; codecs are timed separately.
+            "COMPRESSION_ENABLED": "false",
+        }
+    )
+
+    from app import create_app
+    from app.config import Config
+
+    # All apps share the same database binding; only the JSON provider differs.
+    apps = {
+        provider: create_app(type(f"{provider.title()}JsonConfig", (Config,), {"JSON_PROVIDER": provider}))
+        for provider in PROVIDERS
+    }
+    seed_app = apps[PROVIDERS[0]]
+    with seed_app.app_context():
+        ids = seed_dataset(args.users, args.projects, args.tasks_per_project, args.events_per_task, args.seed)
+        from app.scheduling import run_dataset
+
+        run_dataset("workload")
+
+    codecs = compressors(Config)
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, path in endpoints(ids).items():
+        results[name] = {
+            provider: measure_endpoint(app, path, codecs, args.iterations) for provider, app in apps.items()
+        }
+
+    result = {
+        "benchmark": "serialization",
+        "metadata": run_metadata(),
+        "config": {
+            "iterations": args.iterations,
+            "gzip_level": Config.COMPRESSION_GZIP_LEVEL,
+            "zstd_level": Config.COMPRESSION_ZSTD_LEVEL if "zstd" in codecs else None,
+        },
+        "dataset": {
+            "users": args.users,
+            "projects": args.projects,
+            "tasks": len(ids["tasks"]),
+            "events_per_task": args.events_per_task,
+            "seed": args.seed,
+        },
+        "endpoints": results,
+    }
+    path = write_result(result, args.output, "serialization")
+
+    for name, by_provider in results.items():
+        print(name)
+        for provider, stats in by_provider.items():
+            sizes = "  ".join(f"{codec}={size}" for codec, size in stats["bytes"].items())
+            print(
+                f"  {provider:8s} request={stats['request_cpu_ms']:7.2f} ms cpu  "
+                f"encode={stats['encode_cpu_ms']:7.2f} ms cpu  bytes: {sizes}"
+            )
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
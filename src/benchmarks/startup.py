@@ -0,0 +1,142 @@
+# src/benchmarks/startup.py
+
+"""
+Cold-start benchmark: create_app() time and per-module import cost.
+
+Each run is a fresh interpreter started with ``-X importtime``, so nothing is
+cached in sys.modules. Reports the median create_app() wall time, the
+heaviest imports by cumulative time, totals per top-level package, and which
+optional heavy packages (Celery, Polars, DuckDB, ...) got loaded at all.
+
+Usage (from src/):
+
+    python -m benchmarks.startup --runs 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from benchmarks.common import run_metadata, write_result
+
+# Packages web workers should only load when a feature actually needs them.
+HEAVY_MODULES = ("celery", "kombu", "polars", "duckdb", "pyarrow", "redis", "psycopg2")
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from app import create_app
+create_app()
+elapsed = time.perf_counter() - started
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"create_app_seconds": elapsed, "heavy_modules": heavy, "module_count": len(sys.modules)}}))
+"""
+
+
+def startup_env(workdir: str) -> Dict[str, str]:
+    """Environment for a production-like app on a throwaway SQLite file."""
+    return dict(
+        os.environ,
+        APP_ENV="production",
+        LOG_LEVEL="WARNING",
+        DB_PROVIDER="sqlite",
+        DB_NAME=os.path.join(workdir, "startup.sqlite"),
+    )
+
+
+def measure_once(env: Dict[str, str]) -> Dict[str, Any]:
+    """Start a fresh interpreter, build the app and collect timings."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(heavy=HEAVY_MODULES)],
+        env=env,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["imports"] = parse_importtime(proc.stderr)
+    return result
+
+
+def parse_importtime(stderr: str) -> Dict[str, Dict[str, int]]:
+    """Parse ``-X importtime`` output into {module: {"self_us", "cumulative_us"}}."""
+    imports: Dict[str, Dict[str, int]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|")
+            imports[name.strip()] = {"self_us": int(self_us), "cumulative_us": int(cumulative_us)}
+        except ValueError:
+            continue  # header line
+    return imports
+
+
+def summarize(runs: List[Dict[str, Any]], top: int) -> Dict[str, Any]:
+    per_module: Dict[str, List[int]] = defaultdict(list)
+    per_package: Dict[str, List[int]] = defaultdict(list)
+    for run in runs:
+        package_totals: Dict[str, int] = defaultdict(int)
+        for name, timing in run["imports"].items():
+            per_module[name].append(timing["cumulative_us"])
+            package_totals[name.split(".")[0]] += timing["self_us"]
+        for package, total in package_totals.items():
+            per_package[package].append(total)
+
+    def median_ms(values: List[int]) -> float:
+        return round(statistics.median(values) / 1000, 2)
+
+    modules = sorted(((name, median_ms(v)) for name, v in per_module.items()), key=lambda kv: -kv[1])
+    packages = sorted(((name, median_ms(v)) for name, v in per_package.items()), key=lambda kv: -kv[1])
+    times = [run["create_app_seconds"] for run in runs]
+    return {
+        "create_app_seconds": {
+            "median": statistics.median(times),
+            "min": min(times),
+            "max": max(times),
+        },
+        "module_count": runs[-1]["module_count"],
+        "heavy_modules_loaded": runs[-1]["heavy_modules"],
+        "top_modules_cumulative_ms": dict(modules[:top]),
+        "packages_self_ms": dict(packages[:top]),
+    }
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=25, help="how many modules/packages to list")
+    parser.add_argument("--output", help="result file (default bench_results/startup_<timestamp>.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> None:
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory(prefix="radar-startup-") as workdir:
+        env = startup_env(workdir)
+        runs = [measure_once(env) for _ in range(args.runs)]
+
+    summary = summarize(runs, args.top)
+    timing = summary["create_app_seconds"]
+    print(f"create_app(): median {timing['median'] * 1000:.0f} ms over {args.runs} runs")
+    print(f"Heavy modules loaded: {', '.join(summary['heavy_modules_loaded']) or 'none'}")
+    for name, ms in list(summary["top_modules_cumulative_ms"].items())[:10]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    path = write_result(
+        {"benchmark": "startup", "metadata": run_metadata(), "runs": args.runs, "summary": summary},
+        args.output,
+        "startup",
+    )
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
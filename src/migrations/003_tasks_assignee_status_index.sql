@@ -0,0 +1,6 @@
+-- Per-assignee workload lookups; also keeps ON DELETE SET NULL from users cheap.
+-- Built CONCURRENTLY so writes to tasks are not blocked, hence no transaction.
+-- migrate: no-transaction statement_timeout=0
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_assignee_status
+    ON tasks (assignee, status);
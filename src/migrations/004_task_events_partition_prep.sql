@@ -0,0 +1,27 @@
+-- Partitioning task_events by month, step 1 of 2 (see 005).
+-- Prepares the existing table so 005 can attach it as a partition without
+-- rescanning it under an exclusive lock:
+--   * a unique key on (id, created_at), the key of the partitioned table;
+--   * a validated CHECK keeping created_at below the first monthly partition.
+-- Every step is idempotent. VALIDATE scans the table but does not block writes.
+-- migrate: no-transaction statement_timeout=0
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS task_events_id_created_at_key
+    ON task_events (id, created_at);
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'task_events_id_created_at_key') THEN
+        ALTER TABLE task_events
+            ADD CONSTRAINT task_events_id_created_at_key UNIQUE USING INDEX task_events_id_created_at_key;
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'task_events_legacy_range') THEN
+        EXECUTE format(
+            'ALTER TABLE task_events ADD CONSTRAINT task_events_legacy_range CHECK (created_at < %L) NOT VALID',
+            date_trunc('month', now() AT TIME ZONE 'UTC') + interval '2 months'
+        );
+    END IF;
+END
+$$;
+
+ALTER TABLE task_events VALIDATE CONSTRAINT task_events_legacy_range;
@@ -0,0 +1,66 @@
+-- Partitioning task_events by month, step 2 of 2.
+-- The existing table becomes partition task_events_legacy, covering everything
+-- before the first monthly partition. The constraint validated in 004 lets the
+-- attach skip the scan, so this only touches catalogs.
+-- New months are created ahead of time by ensure_task_event_partitions(), which
+-- the event retention job calls on every run.
+
+ALTER TABLE task_events RENAME TO task_events_legacy;
+ALTER TABLE task_events_legacy RENAME CONSTRAINT task_events_pkey TO task_events_legacy_pkey;
+ALTER TABLE task_events_legacy
+    RENAME CONSTRAINT task_events_id_created_at_key TO task_events_legacy_id_created_at_key;
+ALTER INDEX idx_task_events_task_created_at RENAME TO task_events_legacy_task_created_at_idx;
+
+CREATE TABLE task_events (
+    id INTEGER NOT NULL DEFAULT nextval('task_events_id_seq'),
+    task INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+    type VARCHAR(64) NOT NULL,
+    payload JSONB,
+    created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    CONSTRAINT task_events_id_created_at_key UNIQUE (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE INDEX idx_task_events_task_created_at ON ONLY task_events (task, created_at);
+
+DO $$
+BEGIN
+    EXECUTE format(
+        'ALTER TABLE task_events ATTACH PARTITION task_events_legacy FOR VALUES FROM (MINVALUE) TO (%L)',
+        date_trunc('month', now() AT TIME ZONE 'UTC') + interval '2 months'
+    );
+END
+$$;
+
+ALTER INDEX idx_task_events_task_created_at ATTACH PARTITION task_events_legacy_task_created_at_idx;
+ALTER TABLE task_events_legacy DROP CONSTRAINT task_events_legacy_range;
+ALTER SEQUENCE task_events_id_seq OWNED BY task_events.id;
+
+CREATE OR REPLACE FUNCTION ensure_task_event_partitions(months_ahead integer)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    month_start timestamp;
+    created integer := 0;
+BEGIN
+    FOR i IN 0..months_ahead LOOP
+        month_start := date_trunc('month', now() AT TIME ZONE 'UTC') + make_interval(months => i);
+        BEGIN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF task_events FOR VALUES FROM (%L) TO (%L)',
+                'task_events_p' || to_char(month_start, 'YYYYMM'),
+                month_start,
+                month_start + interval '1 month'
+            );
+            created := created + 1;
+        EXCEPTION
+            -- Already there, or still covered by task_events_legacy.
+            WHEN duplicate_table OR invalid_object_definition THEN
+                NULL;
+        END;
+    END LOOP;
+    RETURN created;
+END
+$$;
+
+SELECT ensure_task_event_partitions(3);
@@ -0,0 +1,4 @@
+-- Per-project change counter keying cached dashboards.
+-- A constant default is stored in the catalog (PostgreSQL 11+), so no table rewrite.
+
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 0;
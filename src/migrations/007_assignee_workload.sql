@@ -0,0 +1,45 @@
+-- Per-assignee, per-project workload, refreshed by the workload.refresh task.
+-- The unique index allows REFRESH MATERIALIZED VIEW CONCURRENTLY, so readers
+-- are never blocked by a refresh.
+-- Keep the select in step with WORKLOAD_SELECT_SQL in app/repositories/workload_repo.py
+-- (the SQLite summary table) and the 28-day window with WORKLOAD_THROUGHPUT_DAYS.
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS assignee_workload AS
+WITH wip_started AS (
+    SELECT e.task, MAX(e.created_at) AS started_at
+    FROM task_events e
+    JOIN tasks t ON t.id = e.task AND t.status = 'in_progress'
+    WHERE e.type = 'status_change' AND e.payload ->> 'to' = 'in_progress'
+    GROUP BY e.task
+)
+SELECT
+    t.assignee,
+    t.project,
+    SUM(CASE WHEN t.status = 'todo' THEN 1 ELSE 0 END)::int AS todo,
+    SUM(CASE WHEN t.status = 'in_progress' THEN 1 ELSE 0 END)::int AS in_progress,
+    SUM(CASE WHEN t.status <> 'done' AND t.priority = 1 THEN 1 ELSE 0 END)::int AS open_p1,
+    SUM(CASE WHEN t.status <> 'done' AND t.priority = 2 THEN 1 ELSE 0 END)::int AS open_p2,
+    SUM(CASE WHEN t.status <> 'done' AND t.priority = 3 THEN 1 ELSE 0 END)::int AS open_p3,
+    MIN(CASE WHEN t.status = 'in_progress' THEN COALESCE(s.started_at, t.created_at) END) AS oldest_wip_started_at,
+    SUM(CASE WHEN t.status = 'done' THEN 1 ELSE 0 END)::int AS done_recent
+FROM tasks t
+LEFT JOIN wip_started s ON s.task = t.id
+WHERE t.assignee IS NOT NULL
+  AND (t.status <> 'done' OR t.done_at >= (now() AT TIME ZONE 'UTC') - interval '28 days')
+GROUP BY t.assignee, t.project
+WITH DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS assignee_workload_assignee_project_key
+    ON assignee_workload (assignee, project);
+
+CREATE INDEX IF NOT EXISTS assignee_workload_project_idx
+    ON assignee_workload (project);
+
+CREATE TABLE IF NOT EXISTS workload_refresh (
+    name VARCHAR(64) PRIMARY KEY,
+    refreshed_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    full_refreshed_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    last_event_id INTEGER NOT NULL,
+    mode VARCHAR(16) NOT NULL,
+    duration_ms DOUBLE PRECISION NOT NULL
+);
@@ -0,0 +1,18 @@
+-- Status of scheduled derived datasets (app/scheduling.py). locked_by/locked_until
+-- form a lease: a run claims the row with a conditional UPDATE and a crashed
+-- worker's lease simply expires.
+
+CREATE TABLE IF NOT EXISTS dataset_refresh (
+    name VARCHAR(64) PRIMARY KEY,
+    status VARCHAR(16) NOT NULL DEFAULT 'never',
+    last_started_at TIMESTAMP WITHOUT TIME ZONE,
+    last_finished_at TIMESTAMP WITHOUT TIME ZONE,
+    last_success_at TIMESTAMP WITHOUT TIME ZONE,
+    last_duration_ms DOUBLE PRECISION,
+    last_error TEXT,
+    source_watermark BIGINT,
+    runs INTEGER NOT NULL DEFAULT 0,
+    consecutive_failures INTEGER NOT NULL DEFAULT 0,
+    locked_by VARCHAR(64),
+    locked_until TIMESTAMP WITHOUT TIME ZONE
+);
@@ -0,0 +1,59 @@
+-- A DEFAULT partition for task_events, so inserts keep working when no monthly
+-- partition exists yet (e.g. Celery beat has been down for a couple of months
+-- and the retention job never created them).
+-- ensure_task_event_partitions() now also moves any rows that landed in the
+-- default partition into proper monthly partitions, creating those months.
+
+CREATE TABLE IF NOT EXISTS task_events_default PARTITION OF task_events DEFAULT;
+
+CREATE OR REPLACE FUNCTION ensure_task_event_partitions(months_ahead integer)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    month_start timestamp;
+    partition_name text;
+    created integer := 0;
+BEGIN
+    FOR month_start IN
+        SELECT DISTINCT date_trunc('month', created_at) FROM task_events_default
+        UNION
+        SELECT date_trunc('month', now() AT TIME ZONE 'UTC') + make_interval(months => i)
+        FROM generate_series(0, months_ahead) AS i
+        ORDER BY 1
+    LOOP
+        partition_name := 'task_events_p' || to_char(month_start, 'YYYYMM');
+        CONTINUE WHEN to_regclass(partition_name) IS NOT NULL;
+        BEGIN
+            -- Attaching scans the default partition for rows of the new range,
+            -- so move them first; the lock keeps new ones from arriving meanwhile.
+            LOCK TABLE task_events_default IN ACCESS EXCLUSIVE MODE;
+            EXECUTE format(
+                'CREATE TABLE %I (LIKE task_events INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                partition_name
+            );
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM task_events_default WHERE created_at >= %L AND created_at < %L RETURNING *)
+                 INSERT INTO %I SELECT * FROM moved',
+                month_start,
+                month_start + interval '1 month',
+                partition_name
+            );
+            EXECUTE format(
+                'ALTER TABLE task_events ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name,
+                month_start,
+                month_start + interval '1 month'
+            );
+            created := created + 1;
+        EXCEPTION
+            -- Still covered by task_events_legacy.
+            WHEN invalid_object_definition THEN
+                NULL;
+        END;
+    END LOOP;
+    RETURN created;
+END
+$$;
+
+SELECT ensure_task_event_partitions(3);
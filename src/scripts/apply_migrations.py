@@ -1,11 +1,25 @@
-import os
 import pathlib
+import re
+import time
 from datetime import datetime
+from typing import Dict, List
 
 import psycopg2
+import psycopg2.errors
 
 from app.config import Config
 
+# Arbitrary constant shared by every deploy: only one migration run at a time.
+MIGRATION_ADVISORY_LOCK_KEY = 72_710_039
+
+_DIRECTIVE_PREFIX = "-- migrate:"
+_CONCURRENTLY_RE = re.compile(r"\bCONCURRENTLY\b", re.IGNORECASE)
+_CREATE_INDEX_CONCURRENTLY_RE = re.compile(
+    r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+(?:IF\s+NOT\s+EXISTS\s+)?\"?(\w+)\"?",
+    re.IGNORECASE,
+)
+_DOLLAR_TAG_RE = re.compile(r"\$\w*\$")
+
 
 def get_connection():
     """Create a raw psycopg2 connection using Config."""
@@ -25,7 +39,7 @@ def get_connection():
 
 
 def ensure_schema_migrations_table(cur) -> None:
-    """Ensure schema_migrations table exists."""
+    """Ensure schema_migrations (with durations) and backfill progress tables exist."""
     cur.execute(
         """
         CREATE TABLE IF NOT EXISTS schema_migrations (
@@ -34,6 +48,17 @@ def ensure_schema_migrations_table(cur) -> None:
         );
         """
     )
+    cur.execute("ALTER TABLE schema_migrations ADD COLUMN IF NOT EXISTS duration_ms INTEGER;")
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migration_progress (
+            version VARCHAR(255) PRIMARY KEY,
+            last_id BIGINT NOT NULL,
+            rows_done BIGINT NOT NULL,
+            updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+        );
+        """
+    )
 
 
 def get_applied_versions(cur) -> set[str]:
@@ -43,16 +68,252 @@ def get_applied_versions(cur) -> set[str]:
     return {row[0] for row in rows}
 
 
-def apply_migration(cur, version: str, sql_path: pathlib.Path) -> None:
-    """Apply a single migration script and record it in schema_migrations."""
-    with sql_path.open("r", encoding="utf-8") as f:
-        sql = f.read()
+def parse_directives(sql: str) -> Dict[str, str]:
+    """
+    Read ``-- migrate:`` header lines at the top of a migration, e.g.::
+
+        -- migrate: no-transaction statement_timeout=0
+        -- migrate: backfill table=tasks batch_size=5000 pause=0.1
+
+    Flags map to ``"true"``. Migrations containing CONCURRENTLY are always
+    run without a transaction.
+    """
+    directives: Dict[str, str] = {}
+    for line in sql.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if not stripped.startswith("--"):
+            break
+        if stripped.lower().startswith(_DIRECTIVE_PREFIX):
+            for token in stripped[len(_DIRECTIVE_PREFIX) :].split():
+                key, _, value = token.partition("=")
+                directives[key.strip().lower()] = value.strip() or "true"
+    if _CONCURRENTLY_RE.search(sql):
+        directives["no-transaction"] = "true"
+    return directives
+
 
-    cur.execute(sql)
+def split_statements(sql: str) -> List[str]:
+    """
+    Split a script on top-level semicolons, ignoring those inside quotes,
+    comments and dollar-quoted bodies.
+    """
+    statements: List[str] = []
+    current: List[str] = []
+    i, length = 0, len(sql)
+    while i < length:
+        ch = sql[i]
+        if ch == "-" and sql.startswith("--", i):
+            end = sql.find("\n", i)
+            end = length if end == -1 else end + 1
+        elif ch == "/" and sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            end = length if end == -1 else end + 2
+        elif ch in ("'", '"'):
+            end = i + 1
+            while end < length:
+                if sql[end] == ch:
+                    if end + 1 < length and sql[end + 1] == ch:  # doubled quote escape
+                        end += 2
+                        continue
+                    break
+                end += 1
+            end = min(end + 1, length)
+        elif ch == "$" and _DOLLAR_TAG_RE.match(sql, i):
+            tag = _DOLLAR_TAG_RE.match(sql, i).group(0)
+            end = sql.find(tag, i + len(tag))
+            end = length if end == -1 else end + len(tag)
+        elif ch == ";":
+            _append_statement(statements, current)
+            current = []
+            i += 1
+            continue
+        else:
+            end = i + 1
+        current.append(sql[i:end])
+        i = end
+
+    _append_statement(statements, current)
+    return statements
+
+
+def _append_statement(statements: List[str], parts: List[str]) -> None:
+    statement = "".join(parts).strip()
+    # Skip chunks that are only comments (e.g. a trailing note after the last ';').
+    if any(line.strip() and not line.strip().startswith("--") for line in statement.splitlines()):
+        statements.append(statement)
+
+
+def acquire_advisory_lock(cur, wait_seconds: float) -> None:
+    """Serialize concurrent deploys; the lock is released when the session ends."""
+    deadline = time.monotonic() + wait_seconds
+    while True:
+        cur.execute("SELECT pg_try_advisory_lock(%s);", (MIGRATION_ADVISORY_LOCK_KEY,))
+        if cur.fetchone()[0]:
+            return
+        if time.monotonic() >= deadline:
+            raise RuntimeError(f"Another migration run has held the advisory lock for over {wait_seconds:.0f}s")
+        print("Waiting for another migration run to finish...")
+        time.sleep(2)
+
+
+def _set_timeouts(cur, directives: Dict[str, str], cfg: Config, local: bool) -> None:
+    scope = "LOCAL " if local else ""
+    cur.execute(f"SET {scope}lock_timeout = %s;", (directives.get("lock_timeout", cfg.MIGRATION_LOCK_TIMEOUT),))
     cur.execute(
-        "INSERT INTO schema_migrations (version, applied_at) VALUES (%s, %s);",
-        (version, datetime.utcnow()),
+        f"SET {scope}statement_timeout = %s;",
+        (directives.get("statement_timeout", cfg.MIGRATION_STATEMENT_TIMEOUT),),
+    )
+
+
+def _drop_invalid_index(cur, statement: str) -> None:
+    """
+    A failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind that
+    IF NOT EXISTS would silently keep; drop it so the build is retried.
+    """
+    match = _CREATE_INDEX_CONCURRENTLY_RE.search(statement)
+    if not match:
+        return
+    cur.execute(
+        """
+        SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = %s AND NOT i.indisvalid;
+        """,
+        (match.group(1),),
     )
+    if cur.fetchone():
+        print(f"  dropping invalid index {match.group(1)} left by an earlier attempt")
+        cur.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{match.group(1)}";')
+
+
+def _record_migration(cur, version: str, started: float) -> None:
+    cur.execute(
+        "INSERT INTO schema_migrations (version, applied_at, duration_ms) VALUES (%s, %s, %s);",
+        (version, datetime.utcnow(), int((time.perf_counter() - started) * 1000)),
+    )
+
+
+def _apply_in_transaction(conn, version: str, sql: str, directives: Dict[str, str], cfg: Config) -> None:
+    started = time.perf_counter()
+    conn.autocommit = False
+    try:
+        with conn.cursor() as cur:
+            _set_timeouts(cur, directives, cfg, local=True)
+            cur.execute(sql)
+            _record_migration(cur, version, started)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.autocommit = True
+
+
+def _apply_without_transaction(conn, version: str, sql: str, directives: Dict[str, str], cfg: Config) -> None:
+    """
+    Run each statement on its own in autocommit (needed for CONCURRENTLY).
+    Statements must be idempotent: a failed run is retried from the top.
+    """
+    started = time.perf_counter()
+    with conn.cursor() as cur:
+        _set_timeouts(cur, directives, cfg, local=False)
+        try:
+            for statement in split_statements(sql):
+                _drop_invalid_index(cur, statement)
+                cur.execute(statement)
+            _record_migration(cur, version, started)
+        finally:
+            cur.execute("RESET lock_timeout; RESET statement_timeout;")
+
+
+def _apply_backfill(conn, version: str, sql: str, directives: Dict[str, str], cfg: Config) -> None:
+    """
+    Run one batch statement over consecutive id ranges of ``table``.
+
+    The statement receives ``%(last_id)s`` and ``%(batch_size)s`` and must
+    only touch rows with ``last_id < id <= last_id + batch_size`` (escape
+    literal percent signs as ``%%``). Each batch commits together with its
+    progress, so an interrupted backfill resumes where it stopped.
+    """
+    table = directives.get("table")
+    if not table:
+        raise ValueError(f"Backfill migration {version} needs a table=<name> directive")
+    batch_size = int(directives.get("batch_size", "10000"))
+    pause = float(directives.get("pause", "0"))
+
+    started = time.perf_counter()
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table};")
+        max_id = cur.fetchone()[0]
+        cur.execute("SELECT last_id, rows_done FROM schema_migration_progress WHERE version = %s;", (version,))
+        row = cur.fetchone()
+        last_id, rows_done = (row[0], row[1]) if row else (0, 0)
+        if row:
+            print(f"  resuming backfill after id {last_id}")
+
+    while last_id < max_id:
+        conn.autocommit = False
+        try:
+            with conn.cursor() as cur:
+                _set_timeouts(cur, directives, cfg, local=True)
+                cur.execute(sql, {"last_id": last_id, "batch_size": batch_size})
+                rows_done += max(cur.rowcount, 0)
+                last_id += batch_size
+                cur.execute(
+                    """
+                    INSERT INTO schema_migration_progress (version, last_id, rows_done, updated_at)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (version) DO UPDATE
+                    SET last_id = EXCLUDED.last_id, rows_done = EXCLUDED.rows_done, updated_at = EXCLUDED.updated_at;
+                    """,
+                    (version, last_id, rows_done, datetime.utcnow()),
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.autocommit = True
+        print(f"  {version}: {min(last_id, max_id)}/{max_id} ids, {rows_done} rows")
+        if pause:
+            time.sleep(pause)
+
+    with conn.cursor() as cur:
+        _record_migration(cur, version, started)
+        cur.execute("DELETE FROM schema_migration_progress WHERE version = %s;", (version,))
+
+
+def apply_migration(conn, version: str, sql_path: pathlib.Path, cfg: Config | None = None) -> None:
+    """
+    Apply a single migration script and record it in schema_migrations.
+
+    Runs in one transaction unless the header says ``no-transaction`` or
+    ``backfill``. A lock_timeout hit is retried with backoff instead of
+    queueing DDL behind long transactions (which would block all writes).
+    """
+    cfg = cfg or Config()
+    with sql_path.open("r", encoding="utf-8") as f:
+        sql = f.read()
+
+    directives = parse_directives(sql)
+    if "backfill" in directives:
+        apply = _apply_backfill
+    elif "no-transaction" in directives:
+        apply = _apply_without_transaction
+    else:
+        apply = _apply_in_transaction
+
+    for attempt in range(cfg.MIGRATION_LOCK_RETRIES + 1):
+        try:
+            apply(conn, version, sql, directives, cfg)
+            return
+        except psycopg2.errors.LockNotAvailable:
+            if attempt == cfg.MIGRATION_LOCK_RETRIES:
+                raise
+            delay = min(2**attempt, 30)
+            print(f"  lock_timeout while applying {version}; retrying in {delay}s")
+            time.sleep(delay)
 
 
 def main() -> None:
@@ -67,22 +328,27 @@ def main() -> None:
         print("No migration files found.")
         return
 
+    cfg = Config()
     conn = get_connection()
     try:
         with conn.cursor() as cur:
+            acquire_advisory_lock(cur, cfg.MIGRATION_ADVISORY_LOCK_WAIT_SECONDS)
             ensure_schema_migrations_table(cur)
+            # Read after taking the lock: a concurrent deploy may just have applied some.
             applied = get_applied_versions(cur)
 
-            for path in migration_files:
-                version = path.stem  # e.g. "001_init"
-                if version in applied:
-                    print(f"Skipping already applied migration: {version}")
-                    continue
+        for path in migration_files:
+            version = path.stem  # e.g. "001_init"
+            if version in applied:
+                print(f"Skipping already applied migration: {version}")
+                continue
 
-                print(f"Applying migration: {version}")
-                apply_migration(cur, version, path)
+            print(f"Applying migration: {version}")
+            started = time.perf_counter()
+            apply_migration(conn, version, path, cfg)
+            print(f"Applied {version} in {time.perf_counter() - started:.2f}s")
 
-            print("Migrations applied successfully.")
+        print("Migrations applied successfully.")
     finally:
         conn.close()
 
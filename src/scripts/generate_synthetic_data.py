@@ -0,0 +1,381 @@
+# src/scripts/generate_synthetic_data.py
+
+"""
+Bulk-generate synthetic users, projects, tasks and task events.
+
+Rows are produced column-at-a-time with Polars expressions and loaded with
+``COPY`` on PostgreSQL or batched ``executemany`` on SQLite, bypassing the ORM,
+so millions of tasks load in minutes instead of hours through
+``TaskRepository.create``.
+
+Distributions:
+- project sizes are skewed (``--skew`` > 1 piles tasks onto a few projects);
+- status is roughly 55% done, 20% in progress, 25% todo;
+- time-to-start is exponential, lead time is log-normal and shorter for
+  high-priority tasks;
+- every task has a ``created`` event, and ``status_change`` events that match
+  its status and timestamps (todo -> in_progress -> done).
+
+Randomness is derived by hashing each row's offset within the run (not its
+database id) with the seed, and timestamps are relative to ``--now`` (a fixed
+date by default), so the same seed and Polars version always produce the same
+rows. New rows get ids above the current maximum, so the script can be run
+repeatedly against one database; only the ids and the names derived from
+them differ.
+
+Usage (from src/):
+
+    python -m scripts.generate_synthetic_data --tasks 1000000 --seed 42
+"""
+
+import argparse
+import io
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict
+
+import polars as pl
+from pony.orm import db_session
+from werkzeug.security import generate_password_hash
+
+from app import create_app
+from app.config import Config
+from app.models import db
+
+logger = logging.getLogger(__name__)
+
+# Password of every generated user, handy for load tests.
+SYNTHETIC_PASSWORD = "synthetic-password"
+
+_HASH_MODULUS = 1_000_003
+
+# Reference "now" for generated timestamps unless --now is given; fixed so two
+# runs with the same seed produce the same rows.
+DEFAULT_NOW = datetime(2025, 1, 1)
+
+# Per-priority multiplier on lead time (1-high, 2-normal, 3-low).
+_PRIORITY_LEAD_FACTOR = {1: 0.6, 2: 1.0, 3: 1.6}
+
+
+def _uniform(seed: int, salt: int, column: str = "row") -> pl.Expr:
+    """Deterministic pseudo-random value in [0, 1) derived from ``column``."""
+    return (pl.col(column).hash(seed * 1_000 + salt) % _HASH_MODULUS).cast(pl.Float64) / _HASH_MODULUS
+
+
+def _normal(seed: int, salt: int) -> pl.Expr:
+    """Standard normal value via Box-Muller on two hashed uniforms."""
+    u1 = 1.0 - _uniform(seed, salt)  # (0, 1], safe for log
+    u2 = _uniform(seed, salt + 1)
+    return (-2.0 * u1.log()).sqrt() * (2.0 * 3.141592653589793 * u2).cos()
+
+
+def _id_frame(start_id: int, stop_id: int, row_offset: int = 0) -> pl.DataFrame:
+    """Ids in ``[start_id, stop_id)`` plus the ``row`` offset (from ``row_offset``) that randomness is hashed on."""
+    return pl.DataFrame(
+        {
+            "id": pl.int_range(start_id, stop_id, eager=True, dtype=pl.Int64),
+            "row": pl.int_range(row_offset, row_offset + stop_id - start_id, eager=True, dtype=pl.Int64),
+        }
+    )
+
+
+def generate_users(start_id: int, count: int, seed: int, password_hash: str, now: datetime) -> pl.DataFrame:
+    return (
+        _id_frame(start_id, start_id + count)
+        .with_columns(
+            pl.format("synthetic{}@example.com", pl.col("id")).alias("email"),
+            pl.format("Synthetic User {}", pl.col("id")).alias("name"),
+            pl.lit(password_hash).alias("password_hash"),
+            (pl.lit(now) - pl.duration(days=(_uniform(seed, 1) * 730).cast(pl.Int64))).alias("created_at"),
+        )
+        .drop("row")
+    )
+
+
+def generate_projects(
+    start_id: int, count: int, user_ids: range, seed: int, now: datetime
+) -> pl.DataFrame:
+    return (
+        _id_frame(start_id, start_id + count)
+        .with_columns(
+            pl.format("Synthetic Project {}", pl.col("id")).alias("name"),
+            ((_uniform(seed, 11) * len(user_ids)).cast(pl.Int64) + user_ids.start).alias("owner"),
+            (pl.lit(now) - pl.duration(days=(_uniform(seed, 12) * 730).cast(pl.Int64))).alias("created_at"),
+            pl.lit(0, dtype=pl.Int64).alias("version"),
+        )
+        .drop("row")
+    )
+
+
+def generate_tasks(
+    start_id: int,
+    stop_id: int,
+    project_ids: range,
+    user_ids: range,
+    seed: int,
+    skew: float,
+    days: int,
+    now: datetime,
+    row_offset: int = 0,
+) -> pl.DataFrame:
+    """
+    Tasks with ids in ``[start_id, stop_id)``; ``row_offset`` is the first
+    task's position in the run, so chunking does not change the data.
+
+    The returned frame carries a helper ``started_at`` column (when the task
+    entered in_progress) used to build its events; it is not a table column.
+    """
+    lead_factor = pl.col("priority").replace_strict(_PRIORITY_LEAD_FACTOR, return_dtype=pl.Float64)
+    frame = (
+        _id_frame(start_id, stop_id, row_offset)
+        .with_columns(
+            ((_uniform(seed, 21) ** skew) * len(project_ids)).cast(pl.Int64).add(project_ids.start).alias("project"),
+            pl.when(_uniform(seed, 22) < 0.55)
+            .then(pl.lit("done"))
+            .when(_uniform(seed, 22) < 0.75)
+            .then(pl.lit("in_progress"))
+            .otherwise(pl.lit("todo"))
+            .alias("status"),
+            pl.when(_uniform(seed, 23) < 0.2)
+            .then(1)
+            .when(_uniform(seed, 23) < 0.8)
+            .then(2)
+            .otherwise(3)
+            .cast(pl.Int64)
+            .alias("priority"),
+            pl.when(_uniform(seed, 24) < 0.1)
+            .then(None)
+            .otherwise((_uniform(seed, 25) * len(user_ids)).cast(pl.Int64) + user_ids.start)
+            .alias("assignee"),
+            (pl.lit(now) - pl.duration(seconds=(_uniform(seed, 26) * days * 86400).cast(pl.Int64))).alias(
+                "created_at"
+            ),
+            # Exponential wait before work starts (mean one day).
+            (-(1.0 - _uniform(seed, 27)).log() * 86400).alias("_wait_seconds"),
+            # Log-normal lead time, median two days.
+            (pl.lit(2.0).log() + _normal(seed, 28)).exp().alias("_lead_days"),
+        )
+        .with_columns(
+            pl.format("Synthetic task {}", pl.col("id")).alias("title"),
+            pl.lit("").alias("description"),
+            pl.min_horizontal(
+                pl.col("created_at") + pl.duration(seconds=pl.col("_wait_seconds").cast(pl.Int64)),
+                pl.lit(now),
+            ).alias("started_at"),
+        )
+        .with_columns(
+            pl.when(pl.col("status") == "done")
+            .then(
+                pl.min_horizontal(
+                    pl.col("started_at")
+                    + pl.duration(seconds=(pl.col("_lead_days") * lead_factor * 86400).cast(pl.Int64)),
+                    pl.lit(now),
+                )
+            )
+            .otherwise(None)
+            .alias("done_at"),
+        )
+    )
+    return frame.select(
+        "id", "project", "title", "description", "status", "priority", "assignee", "created_at", "done_at", "started_at"
+    )
+
+
+def generate_events(tasks: pl.DataFrame, start_id: int) -> pl.DataFrame:
+    """
+    Event history consistent with each task's final status, ordered by task
+    and time, with ids from ``start_id``.
+    """
+    created = tasks.select(
+        pl.col("id").alias("task"),
+        pl.lit("created").alias("type"),
+        pl.lit("{}").alias("payload"),
+        pl.col("created_at"),
+    )
+    started = tasks.filter(pl.col("status") != "todo").select(
+        pl.col("id").alias("task"),
+        pl.lit("status_change").alias("type"),
+        pl.lit('{"from": "todo", "to": "in_progress"}').alias("payload"),
+        pl.col("started_at").alias("created_at"),
+    )
+    finished = tasks.filter(pl.col("status") == "done").select(
+        pl.col("id").alias("task"),
+        pl.lit("status_change").alias("type"),
+        pl.lit('{"from": "in_progress", "to": "done"}').alias("payload"),
+        pl.col("done_at").alias("created_at"),
+    )
+    events = pl.concat([created, started, finished]).sort(["task", "created_at"], maintain_order=True)
+    return events.with_row_index("id", offset=start_id).with_columns(pl.col("id").cast(pl.Int64))
+
+
+def _next_id(cursor, table: str) -> int:
+    cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+    return int(cursor.fetchone()[0]) + 1
+
+
+def load_frame(cursor, provider: str, table: str, frame: pl.DataFrame) -> None:
+    """Bulk-insert ``frame`` into ``table`` (COPY on PostgreSQL, executemany otherwise)."""
+    columns = ", ".join(frame.columns)
+    if provider == "postgres":
+        buffer = io.BytesIO()
+        frame.write_csv(buffer, datetime_format="%Y-%m-%d %H:%M:%S")
+        buffer.seek(0)
+        cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv, HEADER true)", buffer)
+        return
+
+    # SQLite stores Pony datetimes as ISO text.
+    frame = frame.with_columns(
+        pl.col(name).dt.strftime("%Y-%m-%d %H:%M:%S")
+        for name, dtype in frame.schema.items()
+        if dtype.is_temporal()
+    )
+    # Pony keeps SQLite connections in autocommit mode; without an explicit
+    # transaction every row would be committed (and synced) on its own.
+    if not cursor.connection.in_transaction:
+        cursor.execute("BEGIN")
+    placeholders = ", ".join("?" for _ in frame.columns)
+    cursor.executemany(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", frame.iter_rows())
+
+
+# Child tables first, so the SQLite DELETEs never trip a foreign key.
+_DATASET_TABLES = ("task_events", "reports", "tasks", "projects", "users")
+
+
+def reset_tables(cursor, provider: str) -> None:
+    """
+    Empty the tables this script fills (and the reports hanging off them).
+
+    Used by benchmarks so every run starts from the same, known dataset.
+    """
+    if provider == "postgres":
+        # Also restarts the id sequences; CASCADE reaches the partitions and
+        # anything else referencing users.
+        cursor.execute(f"TRUNCATE {', '.join(_DATASET_TABLES)} RESTART IDENTITY CASCADE")
+        # The workload view would otherwise keep serving the old rows.
+        cursor.execute("TRUNCATE workload_refresh")
+        cursor.execute("REFRESH MATERIALIZED VIEW assignee_workload")
+        return
+    for table in _DATASET_TABLES:
+        cursor.execute(f"DELETE FROM {table}")
+
+
+def _reset_sequences(cursor) -> None:
+    for table in ("users", "projects", "tasks", "task_events"):
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT MAX(id) FROM {table}), 1))"
+        )
+
+
+@db_session
+def generate(
+    users: int,
+    projects: int,
+    tasks: int,
+    seed: int = 42,
+    skew: float = 3.0,
+    days: int = 365,
+    chunk_size: int = 250_000,
+    now: datetime | None = None,
+    reset: bool = False,
+) -> Dict[str, int]:
+    """
+    Generate and load a dataset into the bound ``db``; returns row counts.
+
+    Tasks and their events are produced and committed in chunks of
+    ``chunk_size`` tasks to keep memory flat at any scale. Timestamps end at
+    ``now`` (``DEFAULT_NOW`` if not given). With ``reset`` the dataset
+    tables are emptied first (see ``reset_tables``).
+    """
+    now = (now or DEFAULT_NOW).replace(microsecond=0)
+    provider = db.provider_name
+    connection = db.get_connection()
+    cursor = connection.cursor()
+
+    if reset:
+        reset_tables(cursor, provider)
+        connection.commit()
+
+    user_start = _next_id(cursor, "users")
+    project_start = _next_id(cursor, "projects")
+    task_start = _next_id(cursor, "tasks")
+    event_id = _next_id(cursor, "task_events")
+    user_ids = range(user_start, user_start + users)
+    project_ids = range(project_start, project_start + projects)
+
+    password_hash = generate_password_hash(SYNTHETIC_PASSWORD)
+    load_frame(cursor, provider, "users", generate_users(user_start, users, seed, password_hash, now))
+    load_frame(cursor, provider, "projects", generate_projects(project_start, projects, user_ids, seed, now))
+    connection.commit()
+
+    event_count = 0
+    started = time.perf_counter()
+    for chunk_start in range(task_start, task_start + tasks, chunk_size):
+        chunk_stop = min(chunk_start + chunk_size, task_start + tasks)
+        task_frame = generate_tasks(
+            chunk_start, chunk_stop, project_ids, user_ids, seed, skew, days, now, row_offset=chunk_start - task_start
+        )
+        event_frame = generate_events(task_frame, event_id)
+        load_frame(cursor, provider, "tasks", task_frame.drop("started_at"))
+        load_frame(cursor, provider, "task_events", event_frame)
+        connection.commit()
+
+        event_id += len(event_frame)
+        event_count += len(event_frame)
+        elapsed = time.perf_counter() - started
+        logger.info(
+            "Loaded %d/%d tasks (%.0f tasks/s)", chunk_stop - task_start, tasks, (chunk_stop - task_start) / elapsed
+        )
+
+    if provider == "postgres":
+        _reset_sequences(cursor)
+        connection.commit()
+
+    return {"users": users, "projects": projects, "tasks": tasks, "task_events": event_count}
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--projects", type=int, default=5_000)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skew", type=float, default=3.0, help=">1 concentrates tasks in few projects")
+    parser.add_argument("--days", type=int, default=365, help="spread task creation over this many days")
+    parser.add_argument("--chunk-size", type=int, default=250_000)
+    parser.add_argument(
+        "--now",
+        type=datetime.fromisoformat,
+        default=DEFAULT_NOW,
+        help=f"timestamps end at this ISO date/time (default {DEFAULT_NOW.date()})",
+    )
+    parser.add_argument("--reset", action="store_true", help="delete existing users, projects, tasks and events first")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    create_app(Config)
+
+    started = time.perf_counter()
+    counts = generate(
+        users=args.users,
+        projects=args.projects,
+        tasks=args.tasks,
+        seed=args.seed,
+        skew=args.skew,
+        days=args.days,
+        chunk_size=args.chunk_size,
+        now=args.now,
+        reset=args.reset,
+    )
+    elapsed = time.perf_counter() - started
+
+    total_rows = sum(counts.values())
+    print(f"Generated in {elapsed:.1f}s ({total_rows / elapsed * 60:,.0f} rows/min):")
+    for table, count in counts.items():
+        print(f"  {table}: {count:,}")
+
+
+if __name__ == "__main__":
+    main()
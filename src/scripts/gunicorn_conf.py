@@ -0,0 +1,95 @@
+# src/scripts/gunicorn_conf.py
+
+"""
+Gunicorn configuration for production (``gunicorn -c python:scripts.gunicorn_conf``).
+
+The app is preloaded in the master so Flask, Pony, the app itself and its
+config are imported once and shared copy-on-write with every worker. The
+analytics libraries (Celery, Polars, DuckDB, PyArrow) are not part of that:
+create_app does not import them, so each worker loads them lazily the first
+time it needs them. Database connections are closed in the master before
+each fork; workers open their own on first use.
+
+Environment:
+- GUNICORN_WORKERS (default 4)
+- GUNICORN_WORKER_CLASS: ``sync`` (default), ``gthread`` for I/O-bound
+  traffic, or ``gevent`` (needs gevent; psycogreen for non-blocking Postgres)
+- GUNICORN_THREADS: threads per gthread worker (default 8 for gthread, else 1).
+  Pony connections are per thread, so DB connections = workers x threads.
+- GUNICORN_WORKER_CONNECTIONS: concurrent greenlets per gevent worker (default 1000)
+- GUNICORN_PRELOAD (default true), GUNICORN_TIMEOUT (30), GUNICORN_KEEPALIVE (5)
+- GUNICORN_MAX_REQUESTS: recycle workers after N requests (default 0, never)
+- GUNICORN_MEMORY_SAMPLE_REQUESTS: refresh worker memory gauges every N requests (default 500)
+"""
+
+import os
+
+if os.getenv("GUNICORN_WORKER_CLASS") == "gevent":
+    # Patch before anything else is imported (the app package included), otherwise
+    # already-imported modules keep references to the blocking socket/threading primitives.
+    from gevent import monkey
+
+    monkey.patch_all()
+    try:
+        from psycogreen.gevent import patch_psycopg
+
+        patch_psycopg()
+    except ImportError:
+        pass
+
+import time  # noqa: E402
+
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
+
+# Read straight from the environment (same defaults as app.config.Config) so this
+# file never imports the app package; gunicorn loads it after the patch above.
+bind = f"{os.getenv('APP_HOST', '0.0.0.0')}:{os.getenv('APP_PORT', '8000')}"
+workers = int(os.getenv("GUNICORN_WORKERS", "4"))
+threads = int(os.getenv("GUNICORN_THREADS", "8" if worker_class == "gthread" else "1"))
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+
+_memory_sample_requests = int(os.getenv("GUNICORN_MEMORY_SAMPLE_REQUESTS", "500"))
+
+
+def pre_fork(server, worker):
+    from app.extensions import disconnect_databases
+
+    disconnect_databases()
+    # time.monotonic() is system-wide on Linux, so the child can diff it.
+    worker.fork_started_at = time.monotonic()
+
+
+def post_worker_init(worker):
+    from app.metrics import WORKER_STARTUP_SECONDS, record_process_memory
+
+    startup = time.monotonic() - getattr(worker, "fork_started_at", time.monotonic())
+    WORKER_STARTUP_SECONDS.observe(startup)
+    memory = record_process_memory()
+    worker.requests_served = 0
+    worker.log.info(
+        "Worker %s ready in %.1f ms (%s)",
+        worker.pid,
+        startup * 1000,
+        ", ".join(f"{kind}={value / 1024 / 1024:.1f}MiB" for kind, value in memory.items()),
+    )
+
+
+def post_request(worker, req, environ, resp):
+    # Copy-on-write pages get unshared as the worker runs; resample now and then.
+    worker.requests_served = getattr(worker, "requests_served", 0) + 1
+    if _memory_sample_requests and worker.requests_served % _memory_sample_requests == 0:
+        from app.metrics import record_process_memory
+
+        record_process_memory()
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,20 +1,23 @@
 import os
+import shutil
 import subprocess
-from app.config import Config
 
 
 def main() -> None:
-    """Run application using gunicorn WSGI server."""
-    cfg = Config()
-    workers = int(os.getenv("GUNICORN_WORKERS", "4"))
-    bind = f"{cfg.APP_HOST}:{cfg.APP_PORT}"
+    """
+    Run application using gunicorn WSGI server.
+
+    Bind address, worker model and preloading come from scripts/gunicorn_conf.py.
+    """
+    # Workers share Prometheus metrics through mmap files; start from a clean directory.
+    metrics_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus-multiproc")
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
 
     cmd = [
         "gunicorn",
-        "-w",
-        str(workers),
-        "-b",
-        bind,
+        "-c",
+        "python:scripts.gunicorn_conf",
         "app:create_app()",
     ]
 
@@ -1,8 +1,14 @@
+import itertools
+import json
 import os
+from contextlib import contextmanager
+from typing import List
+
 import pytest
 
 from app import create_app
 from app.config import Config
+from app.query_tracking import track_queries
 
 
 class TestConfig(Config):
@@ -17,6 +23,12 @@ class TestConfig(Config):
     CELERY_BROKER_URL = "memory://"
     CELERY_RESULT_BACKEND = "rpc://"
 
+    # Hash inline; the pool itself is covered by test_password_hashing.py
+    PASSWORD_HASH_WORKERS = 0
+
+    # Tests drive health_checker.refresh() explicitly
+    HEALTH_CHECK_INTERVAL_SECONDS = 60.0
+
 
 @pytest.fixture(scope="session")
 def app():
@@ -30,3 +42,70 @@ def app():
 def client(app):
     """Flask test client fixture."""
     return app.test_client()
+
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    Fail when the block runs more SQL statements than allowed.
+
+    Usage: ``with assert_max_queries(3): client.get(...)``
+    """
+
+    @contextmanager
+    def _assert_max_queries(max_queries: int):
+        with track_queries("test") as log:
+            yield log
+        assert log.count <= max_queries, log.describe()
+
+    return _assert_max_queries
+
+
+class ApiFactory:
+    """
+    Create users, projects and tasks through the HTTP API, the way clients do.
+
+    The app (and its database) is shared by the whole session, so every user
+    gets a fresh email address.
+    """
+
+    _emails = itertools.count(1)
+
+    def __init__(self, client) -> None:
+        self.client = client
+
+    def post(self, url: str, payload: dict) -> dict:
+        return self.client.post(url, data=json.dumps(payload), content_type="application/json").get_json()
+
+    def email(self) -> str:
+        return f"user{next(self._emails)}-{os.getpid()}@example.com"
+
+    def user(self, name: str = "Tester", email: str | None = None) -> int:
+        email = self.email() if email is None else email
+        return self.post("/auth/register", {"email": email, "name": name, "password": "secret123"})["id"]
+
+    def login(self, email: str, password: str = "secret123") -> str:
+        return self.post("/auth/login", {"email": email, "password": password})["token"]
+
+    def project(self, owner_id: int | None = None, name: str = "Project") -> int:
+        owner_id = self.user() if owner_id is None else owner_id
+        return self.post("/projects", {"name": name, "owner_id": owner_id})["id"]
+
+    def task(self, project_id: int, title: str = "Task", assignee_id: int | None = None) -> int:
+        payload = {"title": title, "description": "", "assignee_id": assignee_id}
+        return self.post(f"/tasks/project/{project_id}", payload)["id"]
+
+    def tasks(self, project_id: int, count: int, title: str = "T", assignee_id: int | None = None) -> List[int]:
+        return [self.task(project_id, f"{title}{i}", assignee_id) for i in range(count)]
+
+    def set_status(self, task_id: int, status: str) -> None:
+        resp = self.client.patch(
+            f"/tasks/{task_id}/status", data=json.dumps({"status": status}), content_type="application/json"
+        )
+        assert resp.status_code == 200, resp.get_json()
+
+
+@pytest.fixture
+def api(client):
+    """ApiFactory bound to the test client."""
+    return ApiFactory(client)
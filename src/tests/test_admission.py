@@ -0,0 +1,101 @@
+import threading
+import time
+
+from app.admission import InProcessBucketStore, SQLiteBucketStore, admission
+
+URL = "/tasks/project/999999"
+
+
+def _get(client, remote_addr: str, **headers):
+    return client.get(URL, headers=headers, environ_base={"REMOTE_ADDR": remote_addr})
+
+
+def test_client_rate_limit_returns_429_per_client(client, monkeypatch):
+    monkeypatch.setitem(admission.client_limits, "list", (0.01, 2))
+
+    statuses = [_get(client, "10.0.1.1").status_code for _ in range(3)]
+    assert statuses[:2] == [404, 404]
+    assert statuses[2] == 429
+
+    resp = _get(client, "10.0.1.1")
+    assert int(resp.headers["Retry-After"]) >= 1
+
+    # Other clients keep their own budget.
+    assert _get(client, "10.0.1.2").status_code == 404
+
+
+def test_client_supplied_identity_headers_are_ignored(app, client, monkeypatch):
+    monkeypatch.setitem(admission.client_limits, "list", (0.01, 1))
+
+    assert _get(client, "10.0.2.1", **{"X-Client-Id": "a", "X-Real-IP": "1.1.1.1"}).status_code == 404
+    assert _get(client, "10.0.2.1", **{"X-Client-Id": "b", "X-Real-IP": "2.2.2.2"}).status_code == 429
+
+    # Only a configured proxy may say who the client is.
+    monkeypatch.setitem(app.config, "TRUSTED_PROXIES", ["10.0.2.0/24"])
+    assert _get(client, "10.0.2.1", **{"X-Real-IP": "3.3.3.3"}).status_code == 404
+    assert _get(client, "10.0.2.1", **{"X-Real-IP": "3.3.3.3"}).status_code == 429
+
+
+def test_concurrency_limit_returns_503(client, monkeypatch):
+    exhausted = threading.BoundedSemaphore(1)
+    exhausted.acquire()
+    monkeypatch.setitem(admission._semaphores, "list", exhausted)
+
+    resp = _get(client, "10.0.3.1")
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
+
+
+def test_flooding_client_does_not_drain_the_class_budget(client, monkeypatch):
+    monkeypatch.setitem(admission.client_limits, "list", (0.01, 1))
+    monkeypatch.setitem(admission.class_limits, "list", (0.01, 3))
+
+    assert [_get(client, "10.0.4.1").status_code for _ in range(5)] == [404] + [429] * 4
+    assert _get(client, "10.0.4.2").status_code == 404
+
+    # Refused by the concurrency limit: both tokens are given back.
+    exhausted = threading.BoundedSemaphore(1)
+    exhausted.acquire()
+    monkeypatch.setitem(admission._semaphores, "list", exhausted)
+    assert _get(client, "10.0.4.3").status_code == 503
+    exhausted.release()
+    assert _get(client, "10.0.4.3").status_code == 404
+
+
+def test_high_latency_sheds_only_sheddable_classes(client, monkeypatch):
+    monkeypatch.setattr(admission, "_latency_ewma", admission.shed_latency_seconds * 10)
+    monkeypatch.setattr(admission, "_latency_updated_at", time.monotonic())
+
+    assert _get(client, "10.0.5.1").status_code == 503
+    assert client.get("/livez").status_code == 200
+    assert client.get("/auth/me").status_code == 401
+
+    # No admitted requests means no new samples: shedding still ends once the average decays.
+    monkeypatch.setattr(admission, "_latency_updated_at", time.monotonic() - admission.shed_decay_seconds * 5)
+    assert _get(client, "10.0.5.1").status_code == 404
+
+
+def test_sqlite_bucket_store_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "buckets.sqlite")
+    first, second = SQLiteBucketStore(path), SQLiteBucketStore(path)
+
+    assert first.take("k", rate=0.01, capacity=1, now=1000.0) == 0
+    assert second.take("k", rate=0.01, capacity=1, now=1000.0) > 0
+    first.refund("k", capacity=1)
+    assert second.take("k", rate=0.01, capacity=1, now=1000.0) == 0
+
+
+def test_idle_buckets_are_evicted(tmp_path):
+    store = InProcessBucketStore(max_buckets=2)
+    for i in range(5):
+        store.take(f"k{i}", rate=0.01, capacity=2, now=1000.0)
+    assert len(store) == 2
+    # A bucket that has refilled is dropped; a fresh one behaves the same.
+    store.take("full", rate=1000.0, capacity=2, now=1000.0)
+    time.sleep(0.01)
+    assert store._buckets.get("full") is None
+
+    sqlite_store = SQLiteBucketStore(str(tmp_path / "buckets.sqlite"), purge_every=10**6)
+    sqlite_store.take("short", rate=1.0, capacity=1, now=1000.0)
+    sqlite_store.take("long", rate=0.001, capacity=1, now=1000.0)
+    assert sqlite_store.purge(now=1002.0) == 1
@@ -0,0 +1,79 @@
+import io
+from datetime import datetime, timedelta
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from pony.orm import db_session
+
+from app.admission import admission
+from app.analytics.pipeline import run_offline_analytics
+from app.models import Task
+
+
+@pytest.fixture
+def data_dir(app, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, "ANALYTICS_DATA_DIR", str(tmp_path))
+    # Downloads are in the rate-limited "expensive" class
+    monkeypatch.setattr(admission, "enabled", False)
+    return tmp_path
+
+
+@pytest.fixture
+def published(app, api, data_dir, monkeypatch):
+    """Two projects with done tasks, run through the pipeline into data_dir."""
+    monkeypatch.setitem(app.config, "ANALYTICS_DOWNLOAD_BATCH_ROWS", 2)
+
+    user_id = api.user()
+    projects = [api.project(user_id, f"D{i}") for i in range(2)]
+    now = datetime.utcnow()
+    for project_id, tasks in zip(projects, (5, 2)):
+        for i in range(tasks):
+            task_id = api.task(project_id, f"T{i}")
+            with db_session:
+                task = Task[task_id]
+                task.created_at = now - timedelta(days=10 + i)
+                task.status = "done"
+                task.done_at = now - timedelta(days=i)
+
+    with app.app_context():
+        run_offline_analytics()
+    return projects
+
+
+def test_arrow_stream_filters_by_project_and_date(client, published):
+    project_id = published[0]
+    resp = client.get(f"/analytics/tasks?project_id={project_id}")
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/vnd.apache.arrow.stream"
+    assert resp.is_streamed
+    table = pa.ipc.open_stream(resp.data).read_all()
+    assert table.num_rows == 5
+    assert set(table.column("project_id").to_pylist()) == {project_id}
+
+    since = (datetime.utcnow() - timedelta(days=11)).date().isoformat()
+    resp = client.get(f"/analytics/tasks?project_id={project_id}&from={since}&columns=id,created_at")
+    table = pa.ipc.open_stream(resp.data).read_all()
+    assert table.column_names == ["id", "created_at"]
+    assert table.num_rows == 2
+
+
+def test_parquet_download_of_summary(client, published, data_dir):
+    resp = client.get(f"/analytics/analytics_summary?format=parquet&project_id={published[1]}")
+    assert resp.status_code == 200
+    summary = pq.read_table(io.BytesIO(resp.data))
+    assert summary.num_rows == 2
+    assert sum(summary.column("tasks_done").to_pylist()) == 2
+
+    # Unfiltered: the published file itself
+    whole = client.get("/analytics/analytics_summary?format=parquet")
+    assert whole.headers["Accept-Ranges"] == "bytes"
+    assert whole.get_data() == (data_dir / "analytics_summary.parquet").read_bytes()
+    assert pq.read_table(io.BytesIO(whole.get_data())).num_rows >= 7
+
+
+def test_download_errors(client, data_dir):
+    assert client.get("/analytics/tasks").status_code == 404
+    assert client.get("/analytics/users").status_code == 404
+    assert client.get("/analytics/tasks?format=csv").status_code == 400
+    assert client.get("/analytics/tasks?from=yesterday").status_code == 400
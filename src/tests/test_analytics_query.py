@@ -0,0 +1,110 @@
+import json
+import os
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from app.admission import admission
+from app.analytics.query_service import analytics_queries, build_query
+from app.exceptions import QueryTimeoutError, ValidationError
+
+
+def _write_tasks(path, rows) -> None:
+    table = pa.table(
+        {
+            "id": pa.array([r[0] for r in rows], pa.int64()),
+            "project_id": pa.array([r[1] for r in rows], pa.int64()),
+            "assignee_id": pa.array([None] * len(rows), pa.int64()),
+            "status": pa.array([r[2] for r in rows], pa.string()),
+            "priority": pa.array([2] * len(rows), pa.int64()),
+            "created_at": pa.array([r[3] for r in rows], pa.timestamp("us")),
+            "done_at": pa.array([r[4] for r in rows], pa.timestamp("us")),
+        }
+    )
+    tmp_path = str(path) + ".tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+
+
+@pytest.fixture
+def query_service(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(admission, "enabled", False)
+    _write_tasks(
+        tmp_path / "tasks.parquet",
+        [
+            (1, 1, "done", datetime(2025, 1, 1), datetime(2025, 1, 3)),
+            (2, 1, "done", datetime(2025, 1, 2), datetime(2025, 2, 2)),
+            (3, 1, "todo", datetime(2025, 2, 1), None),
+            (4, 2, "done", datetime(2025, 2, 1), datetime(2025, 2, 11)),
+        ],
+    )
+    analytics_queries.configure(
+        data_dir=str(tmp_path),
+        connections=1,
+        threads=1,
+        memory_limit="256MB",
+        timeout=5.0,
+        queue_timeout=1.0,
+        max_rows=100,
+        cache_entries=16,
+    )
+    yield analytics_queries
+    analytics_queries.shutdown()
+
+
+def _query(client, spec: dict):
+    return client.post("/analytics/query", data=json.dumps(spec), content_type="application/json")
+
+
+def test_query_groups_filters_and_caches_per_dataset_version(client, query_service, tmp_path):
+    spec = {
+        "dataset": "tasks",
+        "group_by": ["project_id"],
+        "metrics": ["tasks", "done", "avg_lead_time_days"],
+        "filters": {"created_at": {"from": "2025-01-01", "to": "2025-01-31"}},
+    }
+    first = _query(client, spec).get_json()
+    assert first["cached"] is False
+    assert first["rows"] == [{"project_id": 1, "tasks": 2, "done": 2, "avg_lead_time_days": 16.5}]
+    assert _query(client, spec).get_json()["cached"] is True
+
+    # A new pipeline run replaces the file: the cached result is dropped.
+    _write_tasks(tmp_path / "tasks.parquet", [(9, 1, "todo", datetime(2025, 1, 5), None)])
+    os.utime(tmp_path / "tasks.parquet", ns=(0, first["dataset_version"] + 1_000_000))
+    fresh = _query(client, spec).get_json()
+    assert fresh["cached"] is False
+    assert fresh["rows"] == [{"project_id": 1, "tasks": 1, "done": 0, "avg_lead_time_days": None}]
+
+
+def test_query_order_limit_and_truncation(client, query_service):
+    page = _query(
+        client,
+        {"dataset": "tasks", "group_by": ["project_id", "status"], "metrics": ["tasks"], "order_by": "-tasks", "limit": 1},
+    ).get_json()
+    assert page["rows"] == [{"project_id": 1, "status": "done", "tasks": 2}]
+    assert page["truncated"] is True
+
+
+def test_query_rejects_anything_outside_the_whitelist(client, query_service):
+    assert _query(client, {"dataset": "users", "metrics": ["tasks"]}).status_code == 400
+    assert _query(client, {"dataset": "tasks", "metrics": ["tasks; DROP TABLE x"]}).status_code == 400
+    assert _query(client, {"dataset": "tasks", "metrics": ["tasks"], "filters": {"title": "x"}}).status_code == 400
+    assert _query(client, {"dataset": "tasks", "metrics": ["tasks"], "order_by": "id"}).status_code == 400
+    with pytest.raises(ValidationError):
+        build_query({"dataset": "tasks", "metrics": ["tasks"], "filters": {"project_id": ["one"]}}, 10)
+    # Well-formed JSON of the wrong shape is a 400 too, not a TypeError
+    assert _query(client, {"dataset": [], "metrics": ["tasks"]}).status_code == 400
+    assert _query(client, {"dataset": "tasks", "group_by": [["x"]], "metrics": ["tasks"]}).status_code == 400
+    assert _query(client, {"dataset": "tasks", "metrics": [{"m": 1}]}).status_code == 400
+    assert _query(client, {"dataset": "tasks", "metrics": ["tasks"], "filters": {"status": [["done"]]}}).status_code == 400
+    assert "tasks" in {d["name"] for d in client.get("/analytics/query").get_json()["datasets"]}
+
+
+def test_query_is_interrupted_after_timeout(query_service, monkeypatch):
+    monkeypatch.setattr(query_service, "timeout", 0.2)
+    with pytest.raises(QueryTimeoutError):
+        query_service._execute("SELECT COUNT(*) FROM range(100000000000) a", [])
+    # The connection went back to the pool and still works
+    assert query_service._execute("SELECT 1 AS one", []) == (["one"], [(1,)])
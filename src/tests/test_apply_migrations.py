@@ -0,0 +1,41 @@
+from scripts.apply_migrations import parse_directives, split_statements
+
+
+def test_directives_are_read_from_header_comments():
+    sql = """
+-- Backfill a new column in batches.
+-- migrate: backfill table=tasks batch_size=500
+-- migrate: lock_timeout=2s
+UPDATE tasks SET priority = 2 WHERE id > %(last_id)s AND id <= %(last_id)s + %(batch_size)s;
+-- migrate: ignored after the first statement
+"""
+    assert parse_directives(sql) == {
+        "backfill": "true",
+        "table": "tasks",
+        "batch_size": "500",
+        "lock_timeout": "2s",
+    }
+
+
+def test_concurrent_index_builds_never_run_in_a_transaction():
+    sql = "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_x ON tasks (status);"
+
+    assert parse_directives(sql)["no-transaction"] == "true"
+
+
+def test_split_statements_ignores_semicolons_in_quotes_comments_and_bodies():
+    sql = """
+-- leading comment; not a statement
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_a ON tasks (status);
+INSERT INTO notes (body) VALUES ('a; b ''quoted;''');
+CREATE FUNCTION f() RETURNS int AS $fn$ BEGIN RETURN 1; END; $fn$ LANGUAGE plpgsql;
+/* block; comment */ SELECT 1
+-- trailing comment;
+"""
+    statements = split_statements(sql)
+
+    assert len(statements) == 4
+    assert statements[0].endswith("ON tasks (status)")
+    assert statements[1] == "INSERT INTO notes (body) VALUES ('a; b ''quoted;''')"
+    assert "RETURN 1; END;" in statements[2]
+    assert statements[3].startswith("/* block; comment */ SELECT 1")
@@ -0,0 +1,37 @@
+import json
+
+
+def test_signed_token_authenticates_and_can_be_revoked(client, api):
+    email = api.email()
+    api.user("Token User", email)
+    token = api.login(email)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    resp = client.get("/auth/me", headers=headers)
+    assert resp.status_code == 200
+    assert isinstance(resp.get_json()["user_id"], int)
+
+    resp_logout = client.post("/auth/logout", headers=headers)
+    assert resp_logout.status_code == 204
+
+    resp_after = client.get("/auth/me", headers=headers)
+    assert resp_after.status_code == 401
+
+
+def test_tampered_or_missing_token_is_rejected(client, api):
+    email = api.email()
+    api.user("Token User", email)
+    token = api.login(email)
+
+    assert client.get("/auth/me").status_code == 401
+    resp = client.get("/auth/me", headers={"Authorization": f"Bearer {token[:-2]}xx"})
+    assert resp.status_code == 401
+    assert resp.get_json()["error"]["type"] == "AuthenticationError"
+
+
+def test_invalid_credentials_return_401(client, api):
+    email = api.email()
+    api.user("Token User", email)
+    login_payload = {"email": email, "password": "nope"}
+    resp = client.post("/auth/login", data=json.dumps(login_payload), content_type="application/json")
+    assert resp.status_code == 401
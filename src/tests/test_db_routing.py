@@ -0,0 +1,96 @@
+import json
+import threading
+
+import pytest
+from pony.orm import Database, db_session
+
+from app.db_routing import READ_YOUR_WRITES_COOKIE, db_router
+from app.models import db, define_entities
+
+
+@pytest.fixture
+def replica(tmp_path):
+    """A second SQLite database registered as a read replica."""
+    database = Database()
+    define_entities(database)
+    database.bind(provider="sqlite", filename=str(tmp_path / "replica.sqlite"), create_db=True)
+    database.generate_mapping(create_tables=True)
+
+    db_router.add_replica("test-replica", database)
+    db_router.refresh()
+    yield database
+    db_router.remove_replica("test-replica")
+    database.disconnect()
+
+
+def seed_replica(database: Database) -> int:
+    """Create an owner with a project that only exists on the replica."""
+    with db_session:
+        owner = database.User(email="replica@example.com", name="Replica", password_hash="x")
+        database.Project(owner=owner, name="Replica Project")
+        database.commit()
+        return owner.id
+
+
+@pytest.fixture
+def routed(monkeypatch):
+    """Databases chosen by the router, in order."""
+    chosen = []
+    choose = db_router.choose
+
+    def recording_choose(*args, **kwargs):
+        database = choose(*args, **kwargs)
+        chosen.append(database)
+        return database
+
+    monkeypatch.setattr(db_router, "choose", recording_choose)
+    return chosen
+
+
+def test_list_reads_go_to_replica(client, replica):
+    owner_id = seed_replica(replica)
+
+    resp = client.get(f"/projects?owner_id={owner_id}")
+    assert resp.status_code == 200
+    assert [p["name"] for p in resp.get_json()["items"]] == ["Replica Project"]
+
+
+def test_client_reads_own_writes_from_primary(client, app, replica, routed):
+    seed_replica(replica)
+
+    payload = {"email": "rw@example.com", "name": "RW", "password": "secret123"}
+    resp = client.post("/auth/register", data=json.dumps(payload), content_type="application/json")
+    owner_id = resp.get_json()["id"]
+    project_payload = {"owner_id": owner_id, "name": "Primary Project"}
+    resp = client.post("/projects", data=json.dumps(project_payload), content_type="application/json")
+    assert resp.status_code == 201
+    assert READ_YOUR_WRITES_COOKIE in resp.headers["Set-Cookie"]
+
+    # The marker travels with the client, so any worker serving the read honours it.
+    other_worker = app.test_client()
+    other_worker.set_cookie(READ_YOUR_WRITES_COOKIE, client.get_cookie(READ_YOUR_WRITES_COOKIE).value)
+    resp_list = other_worker.get(f"/projects?owner_id={owner_id}")
+    assert resp_list.status_code == 200
+    assert any(p["name"] == "Primary Project" for p in resp_list.get_json()["items"])
+    assert routed[-1] is db
+
+
+def test_lagging_replica_falls_back_to_primary(client, replica, routed, monkeypatch):
+    owner_id = seed_replica(replica)
+    monkeypatch.setattr(db_router, "_measure_lag", lambda r: db_router.max_lag_seconds + 1)
+    db_router.refresh()
+
+    client.get(f"/projects?owner_id={owner_id}")
+    assert routed and all(database is db for database in routed)
+    assert db_router.status()[0]["usable"] is False
+
+
+def test_hung_replica_probe_times_out_in_the_background(replica, monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(db_router, "lag_check_interval", 0.1)
+    monkeypatch.setattr(db_router, "_measure_lag", lambda r: release.wait(5) and 0.0)
+
+    db_router.refresh()
+    release.set()
+    assert db_router.status()[0]["error"] == "timeout"
+    assert db_router.choose() is db
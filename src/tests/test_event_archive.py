@@ -0,0 +1,49 @@
+import json
+from datetime import datetime, timedelta
+
+import polars as pl
+from pony.orm import db_session
+
+from app.analytics.event_archive import _archive_files, _write_month, archive_old_events
+from app.analytics.pipeline import _export_task_events_to_parquet
+from app.models import Task, TaskEvent
+
+
+def test_old_events_move_to_parquet_and_reads_span_both(app, client, api, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, "EVENT_ARCHIVE_DIR", str(tmp_path / "archive"))
+    task_id = api.task(api.project(), "Old task")
+    now = datetime.utcnow()
+    with db_session:
+        task = Task[task_id]
+        task.created_at = now - timedelta(days=401)
+        TaskEvent(task=task, type="comment", payload={"text": "ancient"}, created_at=now - timedelta(days=400))
+        TaskEvent(task=task, type="comment", payload={"text": "old"}, created_at=now - timedelta(days=300))
+
+    with app.app_context():
+        result = archive_old_events(now=now)
+
+    assert sum(result["archived"].values()) == 2
+    assert len(list((tmp_path / "archive").glob("month=*/*.parquet"))) == 2
+    with db_session:
+        assert TaskEvent.select(lambda e: e.task.id == task_id).count() == 1  # only the "created" event
+
+    resp = client.get(f"/tasks/{task_id}/events")
+    assert resp.status_code == 200
+    items = resp.get_json()["items"]
+    assert [e["type"] for e in items] == ["comment", "comment", "created"]
+    assert items[0]["payload"] == {"text": "ancient"}
+    with app.app_context():
+        # Per-task reads only open months from the task's creation on.
+        assert _archive_files(since=now - timedelta(days=350)) == sorted((tmp_path / "archive").glob("month=*/*.parquet"))[1:]
+
+    # A month still being archived: the live "created" event is also in a file.
+    with db_session:
+        created = TaskEvent.get(lambda e: e.task.id == task_id and e.type == "created")
+        row = (created.id, task_id, created.type, json.dumps(created.payload), created.created_at)
+    with app.app_context():
+        _write_month(created.created_at, "in_progress", [row])
+        events_path, rows = _export_task_events_to_parquet(tmp_path)
+    assert rows == pl.read_parquet(events_path).height
+    exported = pl.read_parquet(events_path).filter(pl.col("task_id") == task_id)
+    assert exported.height == 3
+    assert exported["id"].n_unique() == 3
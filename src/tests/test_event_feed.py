@@ -0,0 +1,101 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from pony.orm import db_session
+
+from app.analytics.event_archive import archive_old_events
+from app.models import TaskEvent
+from app.query_tracking import track_queries
+
+
+@pytest.fixture
+def feed_config(app, monkeypatch):
+    monkeypatch.setitem(app.config, "EVENT_FEED_SETTLE_SECONDS", 0)
+    monkeypatch.setitem(app.config, "EVENT_FEED_POLL_INTERVAL_SECONDS", 0.05)
+
+
+def _drain(client, query: str) -> list:
+    items, cursor = [], "0"
+    while True:
+        page = client.get(f"/events?after={cursor}&limit=2&{query}").get_json()
+        items.extend(page["items"])
+        cursor = page["next_cursor"]
+        if not page["has_more"]:
+            return items
+
+
+def test_feed_pages_by_cursor_and_filters_by_project(client, api, feed_config):
+    first, second = api.project(), api.project()
+    api.tasks(first, 3)
+    api.tasks(second, 2)
+
+    items = _drain(client, f"project_id={first}")
+    assert len(items) == 3
+    assert all(e["project"] == first and e["type"] == "created" for e in items)
+    assert [e["id"] for e in items] == sorted(e["id"] for e in items)
+
+    everything = _drain(client, "")
+    assert {first, second} <= {e["project"] for e in everything}
+
+    # Caught up: an empty page keeps the cursor where it was
+    last = everything[-1]["id"]
+    page = client.get(f"/events?after={last}").get_json()
+    assert page["items"] == [] and page["next_cursor"] == str(last)
+
+
+def test_feed_long_polls_until_timeout(client, api, feed_config):
+    api.task(api.project())
+    last = _drain(client, "")[-1]["id"]
+
+    started = time.monotonic()
+    with track_queries() as log:
+        page = client.get(f"/events?after={last}&wait=0.3").get_json()
+    assert page["items"] == []
+    assert time.monotonic() - started >= 0.3
+    # One read per poll is not an N+1
+    assert log.count >= 5 and log.repeated_shapes(threshold=2) == []
+
+    # Events already waiting are returned without delay
+    page = client.get(f"/events?after={last - 1}&wait=5").get_json()
+    assert page["count"] == 1 and page["waited_seconds"] < 1
+
+
+def test_feed_holds_back_unsettled_events(app, client, api, monkeypatch):
+    monkeypatch.setitem(app.config, "EVENT_FEED_SETTLE_SECONDS", 60)
+    project_id = api.project()
+    api.task(project_id)
+    page = client.get(f"/events?project_id={project_id}").get_json()
+    assert page["items"] == [] and page["has_more"] is True
+
+
+def test_feed_rejects_bad_parameters(client):
+    assert client.get("/events?after=abc").status_code == 400
+    assert client.get("/events?limit=-1").status_code == 400
+    assert client.get("/events?wait=nan").status_code == 400
+    assert client.get("/events?wait=inf").status_code == 400
+    assert client.get("/events?project_id=999999").status_code == 404
+
+
+
+def test_feed_refuses_cursors_into_archived_events(app, client, api, feed_config, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, "EVENT_ARCHIVE_DIR", str(tmp_path / "archive"))
+    old_task = api.task(api.project())
+    now = datetime.utcnow()
+    with db_session:
+        old_event = TaskEvent.get(lambda e: e.task.id == old_task)
+        old_event.created_at = now - timedelta(days=400)
+        old_event_id = old_event.id
+    with app.app_context():
+        archive_old_events(now=now)
+    project_id = api.project()
+    api.task(project_id)
+
+    # Reading on from before the archived event would silently skip it.
+    resp = client.get(f"/events?after={old_event_id - 1}")
+    assert resp.status_code == 410
+    archived_until = resp.get_json()["error"]["details"]["archived_until"]
+    assert archived_until >= old_event_id
+
+    page = client.get(f"/events?after={archived_until}&project_id={project_id}").get_json()
+    assert [e["type"] for e in page["items"]] == ["created"]
@@ -0,0 +1,69 @@
+import json
+from datetime import date, datetime
+
+import polars as pl
+
+from app.analytics.flow import flow_series
+
+
+def _write_inputs(tmp_path):
+    tasks = pl.DataFrame(
+        {
+            "id": [1, 2, 3, 4],
+            "project_id": [10, 10, 10, 20],
+            "assignee_id": [None, None, None, None],
+            "status": ["done", "in_progress", "done", "todo"],
+            "priority": [2, 2, 2, 2],
+            "created_at": [datetime(2025, 1, 1, 9), datetime(2025, 1, 1, 10), datetime(2025, 1, 2), datetime(2025, 1, 3)],
+            "done_at": [datetime(2025, 1, 3, 12), None, datetime(2025, 1, 4), None],
+        },
+        schema_overrides={"assignee_id": pl.Int64},
+    )
+    change = lambda old, new: json.dumps({"from": old, "to": new})  # noqa: E731
+    events = pl.DataFrame(
+        {
+            "id": [1, 2, 3, 4, 5, 6],
+            "task_id": [1, 2, 3, 4, 1, 1],
+            "type": ["created"] * 4 + ["status_change"] * 2,
+            "payload": ["{}"] * 4 + [change("todo", "in_progress"), change("in_progress", "done")],
+            "created_at": [
+                datetime(2025, 1, 1, 9),
+                datetime(2025, 1, 1, 10),
+                datetime(2025, 1, 2),
+                datetime(2025, 1, 3),
+                datetime(2025, 1, 2, 12),
+                datetime(2025, 1, 3, 12),
+            ],
+        }
+    )
+    tasks.write_parquet(tmp_path / "tasks.parquet")
+    events.write_parquet(tmp_path / "task_events.parquet")
+
+
+def test_flow_series_reconstructs_daily_status_counts(tmp_path):
+    _write_inputs(tmp_path)
+
+    series = flow_series(tmp_path / "tasks.parquet", tmp_path / "task_events.parquet", date(2025, 1, 6)).collect(
+        engine="streaming"
+    )
+
+    project = series.filter(pl.col("project_id") == 10)
+    assert project["day"].to_list() == [date(2025, 1, d) for d in range(1, 7)]
+    # Task 1: todo -> in_progress (Jan 2) -> done (Jan 3). Task 2 has no changes: in progress
+    # throughout. Task 3 has no changes but a done_at: todo until Jan 4.
+    assert project.select("todo", "in_progress", "done").rows() == [
+        (1, 1, 0),
+        (1, 2, 0),
+        (1, 1, 1),
+        (0, 1, 2),
+        (0, 1, 2),
+        (0, 1, 2),
+    ]
+    assert project["throughput"].to_list() == [0, 0, 1, 1, 0, 0]
+    assert project["throughput_7d"].to_list() == [0, 0, 1, 2, 2, 2]
+    assert project["wip"].to_list() == project["in_progress"].to_list()
+    assert project["wip_avg_7d"][1] == 1.5
+
+    # Days without activity up to as_of are filled in
+    other = series.filter(pl.col("project_id") == 20)
+    assert other.select("day", "todo").rows() == [(date(2025, 1, d), 1) for d in range(3, 7)]
@@ -0,0 +1,63 @@
+import threading
+
+from app.health_checker import health_checker
+
+
+def test_liveness_is_always_ok(client):
+    resp = client.get("/livez")
+    assert resp.status_code == 200
+    assert resp.get_json() == {"status": "ok"}
+
+
+def test_readiness_serves_cached_checks(client, monkeypatch):
+    health_checker.refresh()
+
+    # Probes must not hit the database: fail loudly if they try.
+    def no_db():
+        raise AssertionError("probe touched the database")
+
+    monkeypatch.setattr(health_checker, "_check_database", no_db)
+
+    resp = client.get("/readyz")
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data["checks"] == {"database": "ok", "broker": "ok"}
+    assert "requests" in data["pools"]
+    assert client.get("/healthz").status_code == 200
+
+
+def test_readiness_fails_when_required_check_fails(client, monkeypatch):
+    def broken():
+        raise RuntimeError("database down")
+
+    monkeypatch.setattr(health_checker, "_check_database", broken)
+    health_checker.refresh()
+    monkeypatch.undo()
+
+    resp = client.get("/readyz")
+    assert resp.status_code == 503
+    assert resp.get_json()["checks"]["database"] == "failed"
+    health_checker.refresh()
+
+
+def test_hung_check_is_reported_apart_and_recovers(monkeypatch):
+    release = threading.Event()
+
+    def hangs():
+        release.wait(5)
+
+    monkeypatch.setattr(health_checker, "timeout", 0.2)
+    monkeypatch.setattr(health_checker, "_check_broker", hangs)
+    health_checker.refresh()
+    checks = health_checker.snapshot()["checks"]
+    # The stuck broker does not hold up the database check.
+    assert checks == {"database": "ok", "broker": "timeout"}
+
+    health_checker.refresh()
+    assert health_checker.snapshot()["checks"]["broker"] == "hung"
+
+    release.set()
+    health_checker._stuck["broker"].join(1)
+    monkeypatch.undo()
+    health_checker.refresh()
+    assert health_checker.snapshot()["checks"] == {"database": "ok", "broker": "ok"}
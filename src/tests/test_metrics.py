@@ -0,0 +1,33 @@
+from app.analytics.pipeline import run_offline_analytics
+from app.metrics import read_process_memory
+
+
+def test_metrics_endpoint_exposes_http_and_db_metrics(client, api):
+    api.user("Metrics")
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    body = resp.get_data(as_text=True)
+    assert 'http_request_duration_seconds_count{endpoint="auth.register",method="POST",status="201"}' in body
+    assert 'db_query_duration_seconds_count{source="UserRepository.create"}' in body
+    assert "password_hash_duration_seconds_count" in body
+
+
+def test_analytics_run_reports_stage_metrics(app, client, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, "ANALYTICS_DATA_DIR", str(tmp_path))
+
+    with app.app_context():
+        result = run_offline_analytics()
+
+    assert set(result["stages"]) == {"export_tasks", "export_task_events", "duckdb_summary", "flow_series"}
+    body = client.get("/metrics").get_data(as_text=True)
+    assert 'analytics_stage_duration_seconds_count{stage="export_tasks"}' in body
+    assert 'analytics_stage_rows{stage="duckdb_summary"}' in body
+
+
+def test_read_process_memory_reports_rss_and_private_bytes():
+    memory = read_process_memory()
+
+    assert memory["rss"] > 0
+    if "private" in memory:
+        assert 0 < memory["private"] <= memory["rss"]
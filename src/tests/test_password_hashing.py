@@ -0,0 +1,91 @@
+import json
+import threading
+import time
+
+import pytest
+
+from pony.orm import db_session
+from werkzeug.security import generate_password_hash
+
+from app.models import User
+from app.exceptions import ServiceUnavailableError
+from app.password_hashing import PasswordHasher, password_hasher
+
+
+def test_pool_hashes_and_verifies():
+    hasher = PasswordHasher()
+    hasher.configure(workers=1, max_queue=1, timeout=30, method="pbkdf2:sha256:1000")
+    try:
+        password_hash = hasher.hash("secret123")
+        assert password_hash.startswith("pbkdf2:sha256:1000$")
+        assert hasher.verify(password_hash, "secret123")
+        assert not hasher.verify(password_hash, "wrong")
+        assert hasher.stats()["hash_count"] == 3
+    finally:
+        hasher.shutdown()
+
+
+def test_timed_out_job_keeps_its_slot_until_it_finishes():
+    hasher = PasswordHasher()
+    hasher.configure(workers=1, max_queue=0, timeout=30, method="pbkdf2:sha256:1000")
+    try:
+        hasher.hash("warm-up")
+        hasher.timeout = 0.2
+        with pytest.raises(ServiceUnavailableError):
+            hasher._run(time.sleep, 1.0)
+        # Still running in the pool: a new job must not get past the bound.
+        assert hasher.stats()["in_flight"] == 1
+        with pytest.raises(ServiceUnavailableError, match="busy"):
+            hasher.hash("secret123")
+
+        deadline = time.monotonic() + 5
+        while hasher.stats()["in_flight"] and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert hasher.stats()["in_flight"] == 0
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.parametrize(
+    "method", ["scrypt", "scrypt:16384:8:1", "pbkdf2", "pbkdf2:sha512", "pbkdf2:sha256:1000", "pbkdf2:sha256:01000"]
+)
+def test_hash_made_under_configured_method_needs_no_rehash(method):
+    hasher = PasswordHasher()
+    hasher.configure(workers=0, max_queue=0, timeout=30, method=method)
+    # As stored by a previous process configured the same way.
+    assert not hasher.needs_rehash(generate_password_hash("secret123", method))
+    assert not hasher.needs_rehash(hasher.hash("secret123"))
+
+
+def test_invalid_method_is_rejected_at_configure():
+    with pytest.raises(ValueError):
+        PasswordHasher().configure(workers=0, max_queue=0, timeout=30, method="scrypt:16384")
+
+
+def test_full_queue_returns_503_with_retry_after(client, monkeypatch):
+    monkeypatch.setattr(password_hasher, "workers", 1)
+    exhausted = threading.BoundedSemaphore(1)
+    exhausted.acquire()
+    monkeypatch.setattr(password_hasher, "_slots", exhausted)
+
+    payload = {"email": "busy@example.com", "name": "Busy", "password": "secret123"}
+    resp = client.post("/auth/register", data=json.dumps(payload), content_type="application/json")
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
+    assert password_hasher.stats()["rejected_total"] >= 1
+
+
+def test_login_rehashes_outdated_hash(client, monkeypatch):
+    monkeypatch.setattr(password_hasher, "method", "pbkdf2:sha256:1000")
+    payload = {"email": "rehash@example.com", "name": "Rehash", "password": "secret123"}
+    resp = client.post("/auth/register", data=json.dumps(payload), content_type="application/json")
+    assert resp.status_code == 201
+    monkeypatch.undo()
+
+    login_payload = {"email": payload["email"], "password": payload["password"]}
+    resp_login = client.post("/auth/login", data=json.dumps(login_payload), content_type="application/json")
+    assert resp_login.status_code == 200
+
+    with db_session:
+        stored = User.get(email=payload["email"]).password_hash
+    assert stored.startswith(password_hasher.method + "$")
@@ -0,0 +1,28 @@
+import io
+from datetime import datetime
+
+from app.analytics.pg_copy import TASK_EVENT_COLUMNS, TASK_COLUMNS, read_copy_csv
+
+
+def test_read_copy_csv_keeps_nulls_empty_strings_and_raw_payloads():
+    # As written by COPY ... TO STDOUT WITH (FORMAT csv): NULL is an unquoted empty field.
+    data = (
+        b'1,7,created,"{""title"": ""a,b""}",2025-03-01 10:00:00.5\n'
+        b'2,7,comment,"{""text"": ""line1\nline2""}",2025-03-02 11:30:00\n'
+        b'3,8,"",,2025-03-03 00:00:00\n'
+    )
+    table = read_copy_csv(io.BytesIO(data), TASK_EVENT_COLUMNS)
+
+    assert table.column_names == [name for name, _ in TASK_EVENT_COLUMNS]
+    rows = table.to_pylist()
+    assert rows[0]["payload"] == '{"title": "a,b"}'
+    assert rows[0]["created_at"] == datetime(2025, 3, 1, 10, 0, 0, 500000)
+    assert rows[1]["payload"] == '{"text": "line1\nline2"}'
+    assert rows[2]["type"] == ""
+    assert rows[2]["payload"] is None
+
+
+def test_read_copy_csv_empty_result_has_schema():
+    table = read_copy_csv(io.BytesIO(b""), TASK_COLUMNS)
+    assert table.num_rows == 0
+    assert str(table.schema.field("done_at").type) == "timestamp[us]"
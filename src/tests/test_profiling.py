@@ -0,0 +1,37 @@
+import pstats
+
+from app.profiling import _start_profiler, _stop_profiler
+
+
+def test_header_enables_profiling(app, client, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, "PROFILE_HEADER_TOKEN", "let-me-profile")
+    monkeypatch.setitem(app.config, "PROFILE_DIR", str(tmp_path))
+
+    assert client.get("/livez", headers={"X-Profile": "wrong"}).status_code == 200
+    assert list(tmp_path.iterdir()) == []
+
+    assert client.get("/livez", headers={"X-Profile": "let-me-profile"}).status_code == 200
+    [profile] = list(tmp_path.iterdir())
+    assert "GET_health.liveness_" in profile.name
+    assert profile.name.endswith(".prof")
+    assert pstats.Stats(str(profile)).total_calls > 0
+
+
+def test_sampling_profiles_requests(app, client, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, "PROFILE_SAMPLE_RATE", 1.0)
+    monkeypatch.setitem(app.config, "PROFILE_DIR", str(tmp_path))
+
+    client.get("/livez")
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_overlapping_profiles_are_skipped(app, client, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, "PROFILE_SAMPLE_RATE", 1.0)
+    monkeypatch.setitem(app.config, "PROFILE_DIR", str(tmp_path))
+
+    busy = _start_profiler()
+    try:
+        assert client.get("/livez").status_code == 200
+    finally:
+        _stop_profiler(busy)
+    assert list(tmp_path.iterdir()) == []
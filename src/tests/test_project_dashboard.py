@@ -0,0 +1,40 @@
+from app.models import Project
+from pony.orm import db_session
+
+
+def test_dashboard_sections_and_version_cache(client, api, assert_max_queries):
+    user_id = api.user("Dash Owner")
+    project_id = api.project(user_id, "Dash")
+    done_id = api.task(project_id, assignee_id=user_id)
+    wip_id = api.task(project_id, assignee_id=user_id)
+    api.task(project_id)
+    api.set_status(done_id, "done")
+    api.set_status(wip_id, "in_progress")
+
+    with assert_max_queries(2):
+        resp = client.get(f"/projects/{project_id}/dashboard")
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data["status_counts"] == {"todo": 1, "in_progress": 1, "done": 1}
+    assert data["wip_by_assignee"][0] == {"assignee_id": user_id, "name": "Dash Owner", "in_progress": 1, "open": 1}
+    assert data["throughput"]["total"] == 1
+    assert data["throughput"]["done_per_day"][-1]["done"] == 1
+    assert data["lead_time"]["count"] == 1
+    assert data["latest_report"] is None
+
+    # Same version: served from the cache with only the project lookup
+    with assert_max_queries(1):
+        assert client.get(f"/projects/{project_id}/dashboard").get_json() == data
+
+    # Any task write bumps the version and invalidates it
+    with db_session:
+        version = Project[project_id].version
+    api.set_status(wip_id, "done")
+    with db_session:
+        assert Project[project_id].version == version + 1
+    data = client.get(f"/projects/{project_id}/dashboard").get_json()
+    assert data["status_counts"]["done"] == 2
+
+
+def test_dashboard_unknown_project(client):
+    assert client.get("/projects/999999/dashboard").status_code == 404
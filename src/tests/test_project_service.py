@@ -1,20 +1,8 @@
 import json
 
 
-def create_user(client) -> int:
-    payload = {
-        "email": "owner@example.com",
-        "name": "Owner",
-        "password": "secret123",
-    }
-    resp = client.post("/auth/register", data=json.dumps(payload), content_type="application/json")
-    assert resp.status_code == 201
-    data = resp.get_json()
-    return data["id"]
-
-
-def test_create_and_list_projects(client):
-    owner_id = create_user(client)
+def test_create_and_list_projects(client, api):
+    owner_id = api.user("Owner")
 
     # Create project
     project_payload = {
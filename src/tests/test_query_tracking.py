@@ -0,0 +1,54 @@
+from pony.orm import db_session, select
+
+from app.models import Task
+from app.query_tracking import track_queries
+
+
+def create_project_with_tasks(api, task_count: int) -> int:
+    owner_id = api.user("Queries")
+    project_id = api.project(owner_id, "Query Project")
+    api.tasks(project_id, task_count, title="Task ", assignee_id=owner_id)
+    return project_id
+
+
+def test_task_list_query_budget(client, api, assert_max_queries):
+    project_id = create_project_with_tasks(api, task_count=5)
+
+    with assert_max_queries(2):
+        resp = client.get(f"/tasks/project/{project_id}?limit=10")
+    assert resp.status_code == 200
+    assert resp.get_json()["count"] == 5
+
+
+def test_tracked_requests_report_query_headers(app, client, api, monkeypatch):
+    monkeypatch.setitem(app.config, "SQL_TRACKING_ENABLED", True)
+    project_id = create_project_with_tasks(api, task_count=1)
+
+    resp = client.get(f"/tasks/project/{project_id}")
+    assert resp.headers["X-DB-Query-Count"] == "2"
+    assert float(resp.headers["X-DB-Query-Time-Ms"]) >= 0
+
+
+def test_repeated_query_shapes_are_flagged(api):
+    project_id = create_project_with_tasks(api, task_count=3)
+
+    with db_session:
+        ids = select(t.id for t in Task if t.project.id == project_id)[:]
+    with track_queries() as log:
+        for task_id in ids:
+            with db_session:
+                Task.get(id=task_id)
+
+    assert log.count == 3
+    [(shape, count)] = log.repeated_shapes(threshold=3)
+    assert count == 3
+    assert "FROM \"tasks\"" in shape
+
+
+def test_queries_are_attributed_to_app_call_sites(client, api):
+    project_id = create_project_with_tasks(api, task_count=1)
+
+    with track_queries() as log:
+        client.get(f"/tasks/project/{project_id}")
+
+    assert log.queries[-1]["call_site"].startswith("repositories/task_repo.py:")
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from pony.orm import commit, db_session
+
+from app.models import Project, Report
+
+
+def _report(project_id: int, status: str) -> int:
+    with db_session:
+        report = Report(project=Project[project_id], type="daily_summary", params={}, status=status)
+        if status == "ready":
+            report.result = {"total_tasks": 3}
+            report.finished_at = datetime.utcnow()
+        commit()
+        return report.id
+
+
+def test_ready_report_is_cacheable_and_revalidates_without_queries(client, api, assert_max_queries):
+    report_id = _report(api.project(), "ready")
+
+    resp = client.get(f"/reports/{report_id}")
+    assert resp.status_code == 200
+    assert resp.get_json()["result"] == {"total_tasks": 3}
+    assert resp.cache_control.public and resp.cache_control.immutable
+    assert resp.cache_control.max_age == 86400
+    etag = resp.headers["ETag"]
+
+    with assert_max_queries(0):
+        revalidated = client.get(f"/reports/{report_id}", headers={"If-None-Match": f"W/{etag}"})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+    assert revalidated.cache_control.immutable
+
+
+def test_pending_report_is_not_stored(client, api):
+    report_id = _report(api.project(), "pending")
+
+    resp = client.get(f"/reports/{report_id}")
+    assert resp.status_code == 200
+    assert resp.headers["Cache-Control"] == "no-store"
+    assert "ETag" not in resp.headers
@@ -0,0 +1,70 @@
+import decimal
+import gzip
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+from flask.json.provider import DefaultJSONProvider
+
+from app.compression import _zstd_encoder, choose_encoding
+from app.json_provider import OrjsonProvider
+
+
+def test_orjson_provider_matches_default_output(app):
+    assert isinstance(app.json, OrjsonProvider)
+    payload = {
+        "b": [1, 2.5, None, True],
+        "a": {"when": datetime(2024, 3, 1, 12, 30, 5), "amount": decimal.Decimal("1.50")},
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    }
+    expected = json.loads(DefaultJSONProvider(app).dumps(payload))
+    assert json.loads(app.json.dumps(payload)) == expected
+    assert expected["a"]["when"] == "Fri, 01 Mar 2024 12:30:05 GMT"
+    iso = OrjsonProvider(app, iso_datetimes=True)
+    assert iso.loads(iso.dumps({"when": datetime(2024, 3, 1, 12, 30, 5)})) == {"when": "2024-03-01T12:30:05"}
+
+
+def test_large_json_is_compressed_when_accepted(client, api):
+    project_id = api.project()
+    api.tasks(project_id, 15, title="Task number ")
+    url = f"/tasks/project/{project_id}?limit=100"
+
+    plain = client.get(url)
+    assert "Content-Encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["Vary"]
+    assert len(plain.data) >= 1024
+
+    compressed = client.get(url, headers={"Accept-Encoding": "br, gzip;q=0.8"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+    assert len(compressed.data) < len(plain.data)
+    assert json.loads(gzip.decompress(compressed.data)) == plain.get_json()
+
+    refused = client.get(url, headers={"Accept-Encoding": "gzip;q=0"})
+    assert "Content-Encoding" not in refused.headers
+
+
+def test_small_responses_are_not_compressed(client):
+    resp = client.get("/livez", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert "Content-Encoding" not in resp.headers
+
+
+def test_choose_encoding_respects_preference_and_quality():
+    assert choose_encoding("gzip, zstd", ["zstd", "gzip"]) == "zstd"
+    assert choose_encoding("gzip;q=1.0, zstd;q=0.5", ["zstd", "gzip"]) == "gzip"
+    assert choose_encoding("*;q=0.3, zstd;q=0", ["zstd", "gzip"]) == "gzip"
+    assert choose_encoding("identity", ["zstd", "gzip"]) is None
+    assert choose_encoding("", ["gzip"]) is None
+
+
+def test_zstd_encoder_is_safe_across_threads():
+    zstandard = pytest.importorskip("zstandard")
+    encode = _zstd_encoder(3)
+    bodies = [json.dumps({"thread": i, "items": list(range(2000))}).encode() for i in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        encoded = list(pool.map(encode, bodies * 20))
+    decompressor = zstandard.ZstdDecompressor()
+    assert [decompressor.decompress(data) for data in encoded] == bodies * 20
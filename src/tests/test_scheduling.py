@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+import pytest
+from pony.orm import db_session
+
+from app.models import DatasetRefresh
+from app.scheduling import DATASETS, Dataset, beat_schedule, run_dataset
+
+
+@pytest.fixture
+def fake_dataset(monkeypatch):
+    calls = []
+
+    def refresh():
+        calls.append(1)
+        if getattr(refresh, "fail", False):
+            raise RuntimeError("boom")
+        return {"ok": True}
+
+    monkeypatch.setitem(DATASETS, "fake", Dataset("fake", refresh, "WORKLOAD_REFRESH_SECONDS", lock_ttl_seconds=60))
+    refresh.calls = calls
+    return refresh
+
+
+def test_run_records_status_and_respects_lease(app, client, fake_dataset):
+    with app.app_context():
+        assert run_dataset("fake")["status"] == "success"
+
+    status = client.get("/datasets/fake").get_json()
+    assert status["status"] == "success"
+    assert status["lag_seconds"] is not None and status["overdue"] is False
+    assert status["running"] is False
+
+    # A live lease held by another run makes this one a no-op
+    with db_session:
+        DatasetRefresh["fake"].set(locked_by="other", locked_until=datetime.utcnow() + timedelta(minutes=5))
+    with app.app_context():
+        assert run_dataset("fake")["status"] == "locked"
+    assert len(fake_dataset.calls) == 1
+
+    # An expired lease is taken over; failures are recorded and re-raised
+    with db_session:
+        DatasetRefresh["fake"].locked_until = datetime.utcnow() - timedelta(seconds=1)
+    fake_dataset.fail = True
+    with app.app_context(), pytest.raises(RuntimeError):
+        run_dataset("fake")
+    status = client.get("/datasets/fake").get_json()
+    assert status["status"] == "failed"
+    assert status["consecutive_failures"] == 1
+    assert "boom" in status["last_error"]
+    with db_session:
+        assert DatasetRefresh["fake"].locked_by is None
+
+
+def test_unchanged_watermark_skips_refresh(app, fake_dataset, monkeypatch):
+    monkeypatch.setitem(
+        DATASETS,
+        "fake",
+        Dataset("fake", fake_dataset, "WORKLOAD_REFRESH_SECONDS", lock_ttl_seconds=60, watermark=lambda: 42),
+    )
+    with app.app_context():
+        run_dataset("fake")
+        assert run_dataset("fake")["status"] == "skipped"
+    assert len(fake_dataset.calls) == 1
+
+
+def test_beat_schedule_has_one_entry_per_enabled_dataset(app, client):
+    config = dict(app.config, EVENT_ARCHIVE_INTERVAL_SECONDS=0)
+    schedule = beat_schedule(config)
+    assert set(schedule) == {"refresh-workload", "refresh-analytics_summary"}
+    assert schedule["refresh-workload"]["args"] == ("workload",)
+    assert client.get("/datasets/unknown").status_code == 404
+    assert {item["name"] for item in client.get("/datasets").get_json()["items"]} >= {"workload", "event_archive"}
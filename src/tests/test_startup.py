@@ -0,0 +1,16 @@
+import os
+
+from benchmarks.startup import measure_once, startup_env
+
+# Generous headroom over a typical ~0.3 s cold start; override on slow CI runners.
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "1.0"))
+
+
+def test_create_app_stays_within_startup_budget(tmp_path):
+    result = measure_once(startup_env(str(tmp_path)))
+
+    assert result["heavy_modules"] == [], "web startup should not import analytics/Celery dependencies"
+    assert result["create_app_seconds"] < STARTUP_BUDGET_SECONDS, (
+        f"create_app() took {result['create_app_seconds']:.2f}s (budget {STARTUP_BUDGET_SECONDS}s); "
+        "run python -m benchmarks.startup to see which imports grew"
+    )
@@ -1,32 +1,9 @@
 import json
 
 
-def create_user(client) -> int:
-    payload = {
-        "email": "owner2@example.com",
-        "name": "Owner2",
-        "password": "secret123",
-    }
-    resp = client.post("/auth/register", data=json.dumps(payload), content_type="application/json")
-    assert resp.status_code == 201
-    data = resp.get_json()
-    return data["id"]
-
-
-def create_project(client, owner_id: int) -> int:
-    payload = {
-        "owner_id": owner_id,
-        "name": "Tasks Project",
-    }
-    resp = client.post("/projects", data=json.dumps(payload), content_type="application/json")
-    assert resp.status_code == 201
-    data = resp.get_json()
-    return data["id"]
-
-
-def test_create_and_update_task(client):
-    owner_id = create_user(client)
-    project_id = create_project(client, owner_id)
+def test_create_and_update_task(client, api):
+    owner_id = api.user("Owner2")
+    project_id = api.project(owner_id, "Tasks Project")
 
     task_payload = {
         "title": "First task",
@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+from app.blueprints.workload import _workload_service
+
+
+def test_workload_refreshes_incrementally_and_reports_freshness(app, client, api, monkeypatch):
+    monkeypatch.setitem(app.config, "WORKLOAD_FULL_REFRESH_SECONDS", 90 * 86400)
+    user_id = api.user("Loaded")
+    project_id = api.project(user_id)
+    task_ids = api.tasks(project_id, 3, assignee_id=user_id)
+    api.set_status(task_ids[0], "in_progress")
+    api.set_status(task_ids[1], "done")
+
+    now = datetime.utcnow()
+    with app.app_context():
+        assert _workload_service.refresh(now=now, force_full=True)["mode"] == "full"
+
+    data = client.get(f"/workload/assignees/{user_id}").get_json()
+    assert data["freshness"]["stale"] is False
+    assert data["freshness"]["mode"] == "full"
+    (row,) = data["items"]
+    assert row["project_id"] == project_id
+    assert (row["todo"], row["in_progress"], row["done_recent"]) == (1, 1, 1)
+    assert row["open_by_priority"]["2"] == 2
+    assert row["oldest_wip_age_days"] is not None
+
+    # Only the pair touched since the last refresh is recomputed
+    api.set_status(task_ids[2], "done")
+    with app.app_context():
+        result = _workload_service.refresh(now=now + timedelta(seconds=60))
+    assert result["mode"] == "incremental"
+    assert result["rows_recomputed"] == 1
+
+    (row,) = client.get(f"/workload/projects/{project_id}").get_json()["items"]
+    assert (row["assignee_id"], row["name"], row["todo"], row["done_recent"]) == (user_id, "Loaded", 0, 2)
+    assert any(item["assignee_id"] == user_id for item in client.get("/workload/assignees").get_json()["items"])
+
+    # Done tasks age out of the throughput window on a later incremental pass
+    with app.app_context():
+        assert _workload_service.refresh(now=now + timedelta(days=29))["mode"] == "incremental"
+    (row,) = client.get(f"/workload/assignees/{user_id}").get_json()["items"]
+    assert row["done_recent"] == 0
+
+    with app.app_context():
+        _workload_service.refresh(now=datetime.utcnow() - timedelta(hours=1), force_full=True)
+    assert client.get(f"/workload/assignees/{user_id}").get_json()["freshness"]["stale"] is True
+
+
+def test_workload_unknown_assignee(client):
+    assert client.get("/workload/assignees/999999").status_code == 404